@@ -0,0 +1,455 @@
+__all__ = ["AppView"]
+
+import os
+from PySide6.QtWidgets import QApplication, QListView, QStyledItemDelegate, QStyle, QMessageBox, QMenu
+from PySide6.QtWidgets import QStyleOptionViewItem
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QMimeData, QPersistentModelIndex, QRect, QSize, Signal
+from PySide6.QtGui import Qt, QIcon, QDrag, QPainter
+
+from declaration import CollapsiblePanel
+from appWidget import AppWidget, LaunchingOpacity, StaleTextAlpha, StaleToolTip
+from iconLoader import IconLoader
+from launcher import Launcher
+from pathHealth import PathHealth
+from itemStore import ItemRecord, ItemStore
+from pixmapCache import pixmapCache
+from themeManager import Theme
+
+
+# 应用列表模型
+class AppModel(QAbstractListModel):
+    PathRole = Qt.ItemDataRole.UserRole + 1
+    LaunchingRole = Qt.ItemDataRole.UserRole + 2
+    StaleRole = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, category: str, appIconSize: int, iconLoader: IconLoader, pathHealth: PathHealth, parent: "AppView"):
+        super().__init__(parent)
+        self.category = category
+        self.appIconSize = appIconSize
+        self.iconLoader = iconLoader
+        self.pathHealth = pathHealth
+        self.ids: list[int] = []
+        self.rows: dict[int, int] = {}  # ID -> 行，按ID查找行时不必线性搜索
+        self.names: list[str] = []
+        self.paths: list[str] = []
+        self.__icons: list[QIcon | None] = []  # None：尚未请求加载
+        self.__iconSizes: dict[int, int] = {}  # ID -> 已请求的图标尺寸，与appIconSize不同时重新加载
+        self.launching: set[int] = set()  # 后台启动中的ID
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int: return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole: return self.names[row]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{self.names[row]} ({self.paths[row]}){StaleToolTip if self.pathHealth.isStale(self.paths[row]) else ''}"
+        if role == self.PathRole: return self.paths[row]
+        if role == self.LaunchingRole: return self.ids[row] in self.launching
+        if role == self.StaleRole: return self.pathHealth.isStale(self.paths[row])
+        if role == Qt.ItemDataRole.DecorationRole:
+            if self.__iconSizes.get(self.ids[row]) != self.appIconSize: self.__requestIcon(row)  # 只为绘制到的行加载图标
+            return self.__icons[row]
+        return None
+
+    def setItems(self, records: list[ItemRecord]) -> None:
+        self.beginResetModel()
+        self.ids = [record.id for record in records]
+        self.rows = {itemId: row for row, itemId in enumerate(self.ids)}
+        self.names = [record.name for record in records]
+        self.paths = [record.path for record in records]
+        self.__icons = [None] * len(self.names)
+        self.__iconSizes.clear()
+        self.endResetModel()
+
+    def addItem(self, itemId: int, name: str, path: str) -> None:
+        row = len(self.names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows[itemId] = row
+        self.ids.append(itemId)
+        self.names.append(name)
+        self.paths.append(path)
+        self.__icons.append(None)
+        self.endInsertRows()
+
+    def addItems(self, items: list[tuple[int, str, str]]) -> None:
+        row = len(self.names)
+        self.beginInsertRows(QModelIndex(), row, row + len(items) - 1)
+        for itemId, name, path in items:
+            self.rows[itemId] = len(self.ids)
+            self.ids.append(itemId)
+            self.names.append(name)
+            self.paths.append(path)
+            self.__icons.append(None)
+        self.endInsertRows()
+
+    def delItem(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.__iconSizes.pop(self.ids[row], None)
+        del self.rows[self.ids[row]]
+        del self.ids[row], self.names[row], self.paths[row], self.__icons[row]
+        self.__updateRows(row, len(self.ids) - 1)
+        self.endRemoveRows()
+
+    def clearItems(self) -> None: self.setItems([])
+
+    def swapItems(self, row1: int, row2: int) -> None:
+        for items in (self.ids, self.names, self.paths, self.__icons):
+            items[row1], items[row2] = items[row2], items[row1]
+        self.rows[self.ids[row1]], self.rows[self.ids[row2]] = row1, row2
+        self.dataChanged.emit(self.index(row1), self.index(row1))
+        self.dataChanged.emit(self.index(row2), self.index(row2))
+
+    def moveItem(self, itemId: int, index: int) -> None:
+        row = self.rows.get(itemId, -1)
+        if row == -1: return
+        index = max(0, min(index, len(self.ids) - 1))
+        if row == index: return
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), index + 1 if index > row else index)
+        for items in (self.ids, self.names, self.paths, self.__icons): items.insert(index, items.pop(row))
+        self.__updateRows(min(row, index), max(row, index))
+        self.endMoveRows()
+
+    def setLaunching(self, itemId: int, flag: bool) -> None:
+        if flag == (itemId in self.launching): return
+        if flag: self.launching.add(itemId)
+        else: self.launching.discard(itemId)
+        row = self.rows.get(itemId, -1)
+        if row == -1: return  # 已被删除
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.LaunchingRole])
+
+    def renameItem(self, itemId: int, name: str, path: str) -> None:
+        row = self.rows.get(itemId, -1)
+        if row == -1: return
+        self.names[row], self.paths[row] = name, path
+        self.reloadIcon(itemId)
+
+    def reloadIcon(self, itemId: int) -> None:
+        """丢弃当前图标，下次绘制时重新加载"""
+        row = self.rows.get(itemId, -1)
+        if row == -1: return
+        self.__icons[row] = None
+        self.__iconSizes.pop(itemId, None)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def refreshItem(self, itemId: int) -> None:
+        row = self.rows.get(itemId, -1)
+        if row == -1: return  # 其他应用栏的项
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def __updateRows(self, first: int, last: int) -> None:
+        for row in range(first, last + 1): self.rows[self.ids[row]] = row
+
+    def __requestIcon(self, row: int) -> None:
+        """尺寸改变后新图标加载完成前仍显示原图标"""
+        itemId, size = self.ids[row], self.appIconSize
+        if self.__icons[row] is None: self.__icons[row] = self.iconLoader.placeholder(self.category, size)
+        self.__iconSizes[itemId] = size
+        self.iconLoader.load(self.paths[row], size, lambda icon: self.__setIcon(itemId, size, icon))
+
+    def __setIcon(self, itemId: int, size: int, icon: QIcon) -> None:
+        if self.__iconSizes.get(itemId) != size: return  # 已请求其他尺寸或已被删除
+        row = self.rows.get(itemId, -1)
+        if row == -1: return  # 已被删除
+        self.__icons[row] = icon
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+# 绘制单项：图标、省略后的名称与悬停边框
+class AppDelegate(QStyledItemDelegate):
+    def __init__(self, appIconSize: int, parent: "AppView"):
+        super().__init__(parent)
+        self.appIconSize = appIconSize
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        painter.save()
+        rect = option.rect
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            painter.setPen(option.palette.mid().color())
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        fm = option.fontMetrics
+        iconRect = QRect(rect.left(), rect.top() + 2, rect.width(), rect.height() - fm.height() - 4)
+        icon = index.data(Qt.ItemDataRole.DecorationRole)
+        stale = index.data(AppModel.StaleRole)
+        mode = QIcon.Mode.Disabled if stale else QIcon.Mode.Normal
+        pixmap = pixmapCache.pixmap(icon, self.appIconSize, painter.device().devicePixelRatioF(), mode)
+        size = pixmap.deviceIndependentSize().toSize()
+        if index.data(AppModel.LaunchingRole): painter.setOpacity(LaunchingOpacity)
+        painter.drawPixmap(
+            iconRect.left() + (iconRect.width() - size.width()) // 2,
+            iconRect.top() + (iconRect.height() - size.height()) // 2,
+            pixmap
+        )
+        painter.setOpacity(1.0)
+
+        textRect = QRect(rect.left() + 2, iconRect.bottom(), rect.width() - 4, fm.height())
+        name = fm.elidedText(index.data(Qt.ItemDataRole.DisplayRole), Qt.TextElideMode.ElideRight, textRect.width())
+        color = option.palette.text().color()
+        if stale: color.setAlpha(StaleTextAlpha)
+        painter.setPen(color)
+        painter.drawText(textRect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter, name)
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(int(self.appIconSize * 2.5), self.appIconSize * 2)
+
+
+# 虚拟化的应用栏，只绘制可见的单项，接口与AppWidget一致
+class AppView(QListView):
+    populated = Signal()  # 与AppWidget一致；模型一次性加载，视图按批布局，创建后即已完成
+
+    def __init__(
+            self,
+            category: str,
+            appIconSize: int,
+            itemStore: ItemStore,
+            collapseOnOpen: bool,
+            iconLoader: IconLoader,
+            launcher: Launcher,
+            pathHealth: PathHealth,
+            parent: "CollapsiblePanel"
+    ):
+        super().__init__(parent)
+        self.setObjectName("AppWidget")
+        self.category = category
+        self.appIconSize = appIconSize
+        self.itemStore = itemStore
+        self.collapseOnOpen = collapseOnOpen
+        self.iconLoader = iconLoader
+        self.launcher = launcher
+        self.pathHealth = pathHealth
+        self.parent = parent
+        self.popupStyleSheet = ""   # 菜单使用的QSS，由applyTheme设置
+        self.dialogStyleSheet = ""  # 对话框使用的QSS，由applyTheme设置
+
+        self.appModel = AppModel(category, appIconSize, iconLoader, pathHealth, self)
+        self.delegate = AppDelegate(appIconSize, self)
+
+        self.__pressedIndex: QPersistentModelIndex = None
+        self.__pressedPos = None
+        self.__launches: set[tuple[int, str]] = set()  # 本栏发起、尚未返回结果的(ID, 路径)
+        self.__missingBox: QMessageBox = None
+        self.__missingId: int = None
+        self.isPopulated = True
+
+        self.__init()
+
+    def dragEnterEvent(self, event) -> None:
+        if event.mimeData().text() == "appItem" and event.source() is self:
+            event.accept()
+        else: event.ignore()
+
+    def dragMoveEvent(self, event) -> None:
+        if event.mimeData().text() == "appItem" and event.source() is self:
+            event.accept()
+        else: event.ignore()
+
+    def dropEvent(self, event) -> bool:
+        """处理放下事件"""
+        index = self.indexAt(event.position().toPoint())
+        if event.mimeData().text() != "appItem" or event.source() is not self: return False
+        if self.__pressedIndex is None or not self.__pressedIndex.isValid() or not index.isValid():
+            event.ignore()
+            return False
+        if index.row() != self.__pressedIndex.row():
+            self.swapItems(self.__pressedIndex.row(), index.row())
+            event.accept()
+            return True
+        event.ignore()
+        return False
+
+    def mousePressEvent(self, event) -> None:
+        index = self.indexAt(event.position().toPoint())
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.__pressedIndex = QPersistentModelIndex(index) if index.isValid() else None
+            self.__pressedPos = event.position().toPoint()
+            if index.isValid() and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+                self.__delRow(index.row(), 1)
+        elif event.button() == Qt.MouseButton.RightButton:
+            self.setHasActivePopup(True)
+            menu = QMenu(self)
+            menu.setStyleSheet(self.popupStyleSheet)
+            if index.isValid():
+                row = QPersistentModelIndex(index)
+                path = self.appModel.paths[index.row()]
+                menu.addAction("启动", lambda: self.startFile(row.row()))
+                menu.addAction("移除", lambda: self.__delRow(row.row(), 0))
+                menu.addAction("打开文件所在位置", lambda: self.startFile(row.row(), os.path.dirname(path)))
+            else:
+                action = menu.addAction("按使用频率排序")
+                action.setCheckable(True)
+                action.setChecked(self.category in self.parent.autoOrder)
+                action.toggled.connect(lambda checked: self.parent.setAutoOrder(self.category, checked))
+                menu.addAction("移除所有", self.clearItems)
+            menu.exec(self.mapToGlobal(event.position().toPoint()))
+            self.setHasActivePopup(False)
+
+    def mouseMoveEvent(self, event) -> None:
+        if not event.buttons() & Qt.MouseButton.LeftButton or self.__pressedIndex is None:
+            super().mouseMoveEvent(event)  # 悬停
+            return
+        if (event.position().toPoint() - self.__pressedPos).manhattanLength() < QApplication.startDragDistance():
+            return
+        if not self.__pressedIndex.isValid(): return
+
+        self.setHasDraggingWidget(True)
+        drag = QDrag(self)
+        icon = self.appModel.data(QModelIndex(self.__pressedIndex), Qt.ItemDataRole.DecorationRole)
+        drag.setPixmap(pixmapCache.pixmap(icon, self.appIconSize, self.devicePixelRatioF()))
+        mimeData = QMimeData()
+        mimeData.setText("appItem")
+        drag.setMimeData(mimeData)
+        drag.exec()  # 执行拖动
+        self.__pressedIndex = None
+        self.setHasDraggingWidget(False)
+
+    def mouseReleaseEvent(self, event) -> None:
+        self.__pressedIndex = None
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event) -> None:
+        index = self.indexAt(event.position().toPoint())
+        if event.button() == Qt.MouseButton.LeftButton and index.isValid():
+            self.startFile(index.row())
+            event.accept()
+
+    def __init(self) -> None:
+        self.setAcceptDrops(True)
+        self.viewport().setAcceptDrops(True)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+
+        self.appModel.setItems(self.itemStore.items(self.category))
+        self.setModel(self.appModel)
+        self.setItemDelegate(self.delegate)
+        self.setNAppIconSize(self.appIconSize)
+        self.launcher.launchFinished.connect(self.__launchFinished)
+        self.pathHealth.healthChanged.connect(self.__healthChanged)
+
+    def addItem(self, itemId: int, name: str, path: str) -> None: self.appModel.addItem(itemId, name, path)
+    def addItems(self, items: list[tuple[int, str, str]]) -> None: self.appModel.addItems(items)
+
+    def delItem(self, row: int) -> bool:
+        if not 0 <= row < self.appModel.rowCount(): return False
+        itemId = self.appModel.ids[row]
+        self.appModel.delItem(row)
+        self.parent.delItem(itemId)
+        return True
+
+    def clearItems(self) -> None:
+        self.appModel.clearItems()
+        self.parent.clearItems(self.category)
+
+    def swapItems(self, row1: int, row2: int) -> bool:
+        self.parent.swapItems(self.appModel.ids[row1], self.appModel.ids[row2])
+        self.appModel.swapItems(row1, row2)
+        return True
+
+    def moveItems(self, moves: list[tuple[int, int]]) -> None:
+        for itemId, index in moves: self.appModel.moveItem(itemId, index)
+
+    def renameItem(self, itemId: int, name: str, path: str) -> None: self.appModel.renameItem(itemId, name, path)
+    def reloadIcon(self, itemId: int) -> None: self.appModel.reloadIcon(itemId)
+
+    def startFile(self, row: int, path: str = None) -> None:
+        """在后台启动，结果由__launchFinished处理"""
+        itemId = self.appModel.ids[row]
+        if path is None: path = self.appModel.paths[row]
+        if not self.launcher.launch(itemId, path): return  # 仍在启动中
+        self.__launches.add((itemId, path))
+        self.appModel.setLaunching(itemId, True)
+
+    getAppName = staticmethod(AppWidget.getAppName)
+    def collapseWindowsFromUser(self) -> None: self.parent.collapseWindowsFromUser()
+
+    def setHasDraggingWidget(self, flag: bool) -> None:
+        if self.parent is None: return
+        self.parent.setHasDraggingWidget(flag)
+
+    def setHasActivePopup(self, flag: bool) -> None:
+        if self.parent is None: return
+        self.parent.setHasActivePopup(flag)
+
+    def applyTheme(self, theme: Theme) -> None:
+        """与AppWidget相同：背景与文字使用调色板，菜单与对话框单独设置QSS"""
+        self.popupStyleSheet = theme.popupStyleSheet
+        self.dialogStyleSheet = theme.dialogStyleSheet
+        theme.applyToPanel(self)
+
+    def setNAppIconSize(self, appIconSize: int) -> None:
+        """只更新单项尺寸，由视图延迟重新布局"""
+        self.appIconSize = appIconSize
+        self.appModel.appIconSize = appIconSize
+        self.delegate.appIconSize = appIconSize
+        font = self.font()
+        font.setPointSize(AppWidget._calcFontSize(appIconSize))
+        self.setFont(font)
+        self.setGridSize(QSize(int(appIconSize * 2.5) + 3, appIconSize * 2 + 3))
+
+    def __launchFinished(self, itemId: int, path: str, status: str, message: str) -> None:
+        if (itemId, path) not in self.__launches: return  # 其他应用栏发起的启动
+        self.__launches.discard((itemId, path))
+        self.appModel.setLaunching(itemId, self.launcher.isLaunching(itemId))
+        if status == "ok":
+            if self.collapseOnOpen: self.collapseWindowsFromUser()  # 打开时折叠窗口
+        elif status == "missing": self.__askRemoveMissing(itemId)
+        else: QApplication.beep()
+
+    def __healthChanged(self, path: str, stale: bool) -> None:
+        record = self.itemStore.findByPath(path)
+        if record is not None: self.appModel.refreshItem(record.id)
+
+    def __askRemoveMissing(self, itemId: int) -> None:
+        """目标不存在时以非模态对话框询问是否移除，同时只询问一项"""
+        if self.__missingBox is not None or itemId not in self.appModel.rows: return
+        self.__missingId = itemId
+        self.setHasActivePopup(True)
+        QApplication.beep()
+        self.__missingBox = QMessageBox(
+            QMessageBox.Icon.Question, "错误", "文件夹或应用不存在，是否从列表中移除？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self.parent
+        )
+        self.__missingBox.setStyleSheet(self.dialogStyleSheet)
+        self.__missingBox.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.__missingBox.finished.connect(self.__missingAnswered)
+        self.__missingBox.open()
+
+    def __missingAnswered(self, result: int) -> None:
+        self.__missingBox = None
+        self.setHasActivePopup(False)
+        if result == QMessageBox.StandardButton.Yes and self.__missingId in self.appModel.rows:
+            self.delItem(self.appModel.rows[self.__missingId])
+
+    def __delRow(self, row: int, code: int) -> None:
+        """:param code: 删除方式，0：直接删除，1：询问删除；目标不存在时由__askRemoveMissing询问"""
+        if code == 0:
+            self.delItem(row)
+            return
+
+        index = QPersistentModelIndex(self.appModel.index(row))
+        self.setHasActivePopup(True)
+        QApplication.beep()
+        msgBox = QMessageBox(
+            QMessageBox.Icon.Question, "提示", "是否从列表中移除应用？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self.parent
+        )
+        msgBox.setStyleSheet(self.dialogStyleSheet)
+        if msgBox.exec() == QMessageBox.StandardButton.Yes and index.isValid():
+            self.delItem(index.row())
+        self.setHasActivePopup(False)
@@ -1,51 +1,110 @@
-__all__ = ["AppWidget"]
+__all__ = ["AppWidget", "LaunchingOpacity", "StaleTextAlpha", "StaleToolTip", "IconReloadDelay"]
 
 import os
-from PySide6.QtWidgets import QApplication, QWidget, QFrame, QScrollArea, QMessageBox, QLayout, QVBoxLayout
-from PySide6.QtWidgets import QLabel, QFileIconProvider, QMenu
-from PySide6.QtCore import QFileInfo, QMimeData, QRect, QPoint, QSize
-from PySide6.QtGui import Qt, QIcon, QDrag
+import time
+from PySide6.QtWidgets import QApplication, QWidget, QFrame, QScrollArea, QMessageBox, QLayout, QLayoutItem
+from PySide6.QtWidgets import QMenu, QStyle, QStyleOptionFrame
+from PySide6.QtCore import QEvent, QMimeData, QRect, QSize, QTimer, Signal
+from PySide6.QtGui import Qt, QIcon, QDrag, QPainter, QPixmap
 
 from declaration import CollapsiblePanel
+from iconLoader import IconLoader
+from itemStore import ItemStore
+from launcher import Launcher
+from pathHealth import PathHealth
+from pixmapCache import pixmapCache
+from themeManager import Theme
 
+PopulateSliceMs = 4  # 启动时渐进创建应用项，每个时间片的预算(ms)
+LaunchingOpacity = 0.4  # 后台启动中的应用项图标的不透明度
+StaleTextAlpha = 128    # 路径失效的应用项名称的不透明度(0~255)
+StaleToolTip = " - 不存在或无法访问"
+IconReloadDelay = 300   # 图标尺寸停止变化多久后(ms)按新尺寸重新加载图标，期间缩放原图标
 
-# 自定义流式布局
+
+# 自定义流式布局，缓存各项的尺寸与位置，只从第一个变化的项开始重新排列
 class FlowLayout(QLayout):
     def __init__(self, parent: QWidget = None):
         super().__init__(parent)
         self.__parent = parent
-        self.__items = []
+        self.__items: list[QLayoutItem] = []
+        self.__widgets: list[QWidget | None] = []  # 各项的控件；removeWidget()传给takeAt()的项已不可访问，因此单独保存
+        self.__indexes: dict[QWidget, int] = {}  # 控件 -> 索引
+        # 布局缓存
+        self.__sizes: list[tuple[int, int] | None] = []  # 各项的sizeHint(宽, 高)，不是控件的项为None
+        self.__rects: list[tuple[int, int, int, int] | None] = []  # 已排列项的位置(x, y, 宽, 高)
+        self.__lineStarts: list[int] = []    # 已排列项所在行第一项的索引
+        self.__heights: dict[int, int] = {}  # heightForWidth的结果
+        self.__flowWidth = -1                # 上次排列时的宽度
+        self.__dirtyFrom = 0                 # 需要重新排列的第一项
+        self.__changed: set[QWidget] = set()  # sizeHint可能已改变的控件，排列时只重新读取这些控件
+        self.__allChanged = False            # 所有控件的sizeHint可能已改变
         self.setSpacing(3)
 
     def addItem(self, item) -> None:
+        widget = item.widget()
+        if widget is not None: self.__indexes[widget] = len(self.__items)
         self.__items.append(item)
+        self.__widgets.append(widget)
+        self.__sizes.append(self.__sizeOf(item))
+        self.__markDirty(len(self.__items) - 1)
 
     def delItem(self, widget) -> bool:
         """删除控件"""
-        idx = self.__findItemIndex(widget)
+        idx = self.__indexes.get(widget, -1)
         if idx == -1: return False
 
-        self.__items.pop(idx)
+        self.__removeAt(idx)
         self.update()
         return True
 
     def clearItems(self) -> None:
         """删除所有控件"""
         self.__items.clear()
+        self.__widgets.clear()
+        self.__indexes.clear()
+        self.__sizes.clear()
+        self.__markDirty(0)
         self.update()
 
     def swapItems(self, item1, item2) -> bool:
         """交换两个控件的位置"""
-        idx1 = self.__findItemIndex(item1)
-        idx2 = self.__findItemIndex(item2)
-
-        if idx1 != -1 and idx2 != -1 and idx1 != idx2:
-            # 交换列表中的位置
-            self.__items[idx1], self.__items[idx2] = self.__items[idx2], self.__items[idx1]
+        idx1 = self.__indexes.get(item1, -1)
+        idx2 = self.__indexes.get(item2, -1)
+        if idx1 == -1 or idx2 == -1 or idx1 == idx2: return False
+
+        items, widgets, sizes = self.__items, self.__widgets, self.__sizes
+        items[idx1], items[idx2] = items[idx2], items[idx1]
+        widgets[idx1], widgets[idx2] = widgets[idx2], widgets[idx1]
+        sizes[idx1], sizes[idx2] = sizes[idx2], sizes[idx1]
+        self.__indexes[item1], self.__indexes[item2] = idx2, idx1
+
+        if sizes[idx1] == sizes[idx2] is not None and max(idx1, idx2) < min(self.__dirtyFrom, len(self.__rects)):
+            # 尺寸相同，直接交换位置，无需重新排列
+            items[idx1].setGeometry(QRect(*self.__rects[idx1]))
+            items[idx2].setGeometry(QRect(*self.__rects[idx2]))
+        else:
+            self.__markDirty(min(idx1, idx2))
             self.update()  # 重新布局
-            return True
-        return False
+        return True
 
+    def moveItem(self, widget, index: int) -> bool:
+        """移动控件到index处，只更新两个索引之间的项，从较小的索引开始重新排列"""
+        idx = self.__indexes.get(widget, -1)
+        index = max(0, min(index, len(self.__items) - 1))
+        if idx == -1 or idx == index: return False
+
+        self.__items.insert(index, self.__items.pop(idx))
+        self.__widgets.insert(index, self.__widgets.pop(idx))
+        self.__sizes.insert(index, self.__sizes.pop(idx))
+        for i in range(min(idx, index), max(idx, index) + 1):
+            widget = self.__widgets[i]
+            if widget is not None: self.__indexes[widget] = i
+        self.__markDirty(min(idx, index))
+        self.update()
+        return True
+
+    def indexOfWidget(self, widget) -> int: return self.__indexes.get(widget, -1)
     def count(self): return len(self.__items)
     def expandingDirections(self): return Qt.Orientation(0)
     def hasHeightForWidth(self): return True
@@ -53,32 +112,30 @@ class FlowLayout(QLayout):
 
     def takeAt(self, i):
         if 0 <= i < len(self.__items):
-            return self.__items.pop(i)
+            item = self.__items[i]
+            self.__removeAt(i)
+            return item
         return None
 
+    def sizesChanged(self, widget: QWidget = None) -> None:
+        """
+        控件尺寸改变后调用，widget为None时表示所有控件
+        Qt的invalidate()不指明是哪个控件，每次都重新读取所有sizeHint为O(n)，因此由调用方指明
+        """
+        if widget is None: self.__allChanged = True
+        else: self.__changed.add(widget)
+        self.invalidate()
+
     def setGeometry(self, rect) -> None:
         super().setGeometry(rect)
         if not self.__items: return
 
-        x, y, line_height = 0, 0, 0
-        max_width = rect.width()  # 使用父容器的宽度作为限制
-
-        for item in self.__items:
-            widget = item.widget()
-            if not widget: continue
-
-            size = item.sizeHint()
-            space = self.spacing()
-
-            # 检查是否超出宽度，需要换行
-            if x + size.width() > max_width and x > 0:
-                x = 0
-                y += line_height + space
-                line_height = 0
-
-            item.setGeometry(QRect(QPoint(x, y), size))
-            x += size.width() + space
-            line_height = max(line_height, size.height())
+        width = rect.width()  # 使用父容器的宽度作为限制
+        if width != self.__flowWidth:
+            self.__flowWidth = width
+            self.__markDirty(0)
+        self.__refreshSizes()
+        if self.__dirtyFrom < len(self.__items): self.__flow(width)
 
     def sizeHint(self) -> QSize:
         # 返回固定宽度和计算出的高度
@@ -90,66 +147,172 @@ class FlowLayout(QLayout):
 
     def heightForWidth(self, width) -> int:
         if not self.__items: return 0
+        self.__refreshSizes()
 
-        x, y, line_height = 0, 0, 0
+        height = self.__heights.get(width)
+        if height is None:
+            height = self.__heights[width] = self.__calcHeight(width)
+        return height
 
-        for item in self.__items:
-            widget = item.widget()
-            if not widget: continue
+    def __calcHeight(self, width: int) -> int:
+        x, y, line_height = 0, 0, 0
+        space = self.spacing()
 
-            size = item.sizeHint()
-            space = self.spacing()
+        for size in self.__sizes:
+            if size is None: continue
+            w, h = size
 
-            if x + size.width() > width and x > 0:
+            if x + w > width and x > 0:
                 x = 0
                 y += line_height + space
                 line_height = 0
 
-            x += size.width() + space
-            line_height = max(line_height, size.height())
+            x += w + space
+            if h > line_height: line_height = h
 
         return y + line_height
 
-    def __findItemIndex(self, item) -> int:
-        """查找控件的索引"""
-        for i, item in enumerate(self.__items):
-            if item.widget() == item:
-                return i
-        return -1
+    def __flow(self, width: int) -> None:
+        """从第一个变化的项所在行开始排列，位置未变的项不再调用setGeometry"""
+        items, sizes, rects, lineStarts = self.__items, self.__sizes, self.__rects, self.__lineStarts
+        dirtyFrom = self.__dirtyFrom
+        start = lineStarts[dirtyFrom - 1] if 0 < dirtyFrom <= len(rects) else 0
+        x, y = 0, (rects[start][1] if start else 0)
+        oldRects = rects[start:dirtyFrom]
+        del rects[start:], lineStarts[start:]
+
+        line_height, lineStart = 0, start
+        space = self.spacing()
+        for i in range(start, len(items)):
+            size = sizes[i]
+            if size is None:
+                rects.append(None)
+                lineStarts.append(lineStart)
+                continue
+            w, h = size
 
+            # 检查是否超出宽度，需要换行
+            if x + w > width and x > 0:
+                x = 0
+                y += line_height + space
+                line_height = 0
+                lineStart = i
+
+            rect = (x, y, w, h)
+            if i >= dirtyFrom or oldRects[i - start] != rect: items[i].setGeometry(QRect(x, y, w, h))
+            rects.append(rect)
+            lineStarts.append(lineStart)
+            x += w + space
+            if h > line_height: line_height = h
+
+        self.__dirtyFrom = len(items)
+        self.__heights[width] = y + line_height
+
+    def __refreshSizes(self) -> None:
+        """重新获取尺寸可能已改变的控件的sizeHint，从第一个尺寸变化的项开始标记为需要重新排列"""
+        if self.__allChanged: indexes = range(len(self.__items))
+        elif self.__changed: indexes = [self.__indexes[w] for w in self.__changed if w in self.__indexes]
+        else: return
+        self.__allChanged = False
+        self.__changed.clear()
+        items, sizes = self.__items, self.__sizes
+        for i in indexes:
+            size = self.__sizeOf(items[i])
+            if size != sizes[i]:
+                sizes[i] = size
+                self.__markDirty(i)
+
+    @staticmethod
+    def __sizeOf(item: QLayoutItem) -> tuple[int, int] | None:
+        if item.widget() is None: return None
+        size = item.sizeHint()
+        return size.width(), size.height()
 
-class Item(QFrame):
-    def __init__(self, icon: QIcon, name: str, path: str, parent: "AppWidget"):
+    def __markDirty(self, idx: int) -> None:
+        if idx < self.__dirtyFrom: self.__dirtyFrom = idx
+        self.__heights.clear()
+
+    def __removeAt(self, idx: int) -> None:
+        self.__items.pop(idx)
+        self.__sizes.pop(idx)
+        widget = self.__widgets.pop(idx)
+        if widget is not None: self.__indexes.pop(widget, None)
+        for i in range(idx, len(self.__items)):  # 更新后续控件的索引
+            widget = self.__widgets[i]
+            if widget is not None: self.__indexes[widget] = i
+        self.__markDirty(idx)
+
+
+# 应用单项：单个控件，图标、名称与悬停边框都在paintEvent中绘制
+class Item(QWidget):
+    def __init__(self, icon: QIcon, itemId: int, name: str, path: str, parent: "AppWidget"):
         """应用单项，实例化后应及时调用setNAppIconSize()"""
         super().__init__(parent)
         self.setObjectName("item")
-        self.setToolTip(f"{name} ({path})")
-        lyt = QVBoxLayout(self)
-        lyt.setSpacing(0)
-        lyt.setContentsMargins(0, 2, 0, 2)
 
         self.appIconSize: int = None
         self.icon = icon
+        self.id = itemId
         self.name = name
         self.path = path
         self.parent = parent
 
-        self.iconLabel = QLabel(self)
-        self.iconLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        self.__clickedPos = None
-        self.__dragging = False
-
-        lyt.addWidget(self.iconLabel, 1, alignment=Qt.AlignmentFlag.AlignCenter)
-        lyt.addWidget(QLabel(name, self), alignment=Qt.AlignmentFlag.AlignHCenter)
+        self.__pixmap: QPixmap = None  # 来自pixmapCache，图标或大小变化时更新
+        self.__elidedName: str = None  # 按当前宽度与字体省略后的名称，变化时置空
+        self.__hovered = False
+        self.__launching = False  # 后台启动中，图标半透明显示
+        self.__stale = False      # 路径不存在或无法访问，图标与名称置灰
+        self.__missingBox: QMessageBox = None
+        self.__updateToolTip()
 
     def enterEvent(self, event):
         super().enterEvent(event)
-        self.setFrameShape(QFrame.Shape.StyledPanel)
+        self.__hovered = True
+        self.update()
 
     def leaveEvent(self, event):
         super().leaveEvent(event)
-        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.__hovered = False
+        self.update()
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.FontChange: self.__elidedName = None
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.__elidedName = None
+
+    def paintEvent(self, event) -> None:
+        """布局与原先的图标+名称两行一致：上下留2px，图标在名称上方的区域居中"""
+        painter = QPainter(self)
+        width, height = self.width(), self.height()
+        if self.__hovered:
+            option = QStyleOptionFrame()
+            option.initFrom(self)
+            option.lineWidth = 1
+            option.frameShape = QFrame.Shape.StyledPanel
+            self.style().drawPrimitive(QStyle.PrimitiveElement.PE_Frame, option, painter, self)
+
+        metrics = self.fontMetrics()
+        textHeight = metrics.height()
+        if self.__pixmap is not None:
+            dpr = self.__pixmap.devicePixelRatio()
+            pixmapWidth, pixmapHeight = round(self.__pixmap.width() / dpr), round(self.__pixmap.height() / dpr)
+            iconHeight = height - 4 - textHeight
+            if self.__launching: painter.setOpacity(LaunchingOpacity)
+            painter.drawPixmap((width - pixmapWidth) // 2, 2 + (iconHeight - pixmapHeight) // 2, self.__pixmap)
+            painter.setOpacity(1.0)
+
+        if self.__elidedName is None:
+            self.__elidedName = metrics.elidedText(self.name, Qt.TextElideMode.ElideRight, width)
+        if self.__stale:
+            color = self.palette().windowText().color()
+            color.setAlpha(StaleTextAlpha)
+            painter.setPen(color)
+        painter.drawText(
+            QRect(0, height - 2 - textHeight, width, textHeight), Qt.AlignmentFlag.AlignCenter, self.__elidedName
+        )
 
     def mousePressEvent(self, event) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
@@ -159,6 +322,7 @@ class Item(QFrame):
         elif event.button() == Qt.MouseButton.RightButton:
             self.parent.setHasActivePopup(True)
             menu = QMenu(self)
+            menu.setStyleSheet(self.parent.popupStyleSheet)
             menu.addAction("启动", self.startFile)
             menu.addAction("移除", lambda: self.__delSelf(0))
             menu.addAction("打开文件所在位置", lambda: self.startFile(os.path.dirname(self.path)))
@@ -169,7 +333,7 @@ class Item(QFrame):
         if self.appIconSize is None: return
         self.parent.setHasDraggingWidget(True)
         drag = QDrag(self)
-        drag.setPixmap(self.icon.pixmap(self.appIconSize, self.appIconSize))
+        drag.setPixmap(pixmapCache.pixmap(self.icon, self.appIconSize, self.devicePixelRatioF()))
         mimeData = QMimeData()
         mimeData.setText("appItem")
         drag.setMimeData(mimeData)
@@ -182,63 +346,116 @@ class Item(QFrame):
             event.accept()
         super().mouseDoubleClickEvent(event)
 
-    def setNAppIconSize(self, appIconSize: int, fontSize: int) -> None:
+    def setIcon(self, icon: QIcon) -> None:
+        """替换图标（后台加载完成时调用）"""
+        self.icon = icon
+        if self.appIconSize is not None: self.__updatePixmap()
+
+    def setNAppIconSize(self, appIconSize: int) -> None:
+        """字体大小由AppWidget统一设置"""
+        if appIconSize == self.appIconSize: return
         self.appIconSize = appIconSize
-        self.iconLabel.setPixmap(self.icon.pixmap(appIconSize, appIconSize))
+        self.__updatePixmap()
         self.setFixedSize(appIconSize * 2.5, appIconSize * 2)
-        font = self.font()
-        font.setPointSize(fontSize)
-        self.setFont(font)
 
     def startFile(self, path=None):
+        """在后台启动，结果由AppWidget处理"""
         if path is None: path = self.path
-        if os.path.exists(path):
-            os.startfile(path)
-            if self.parent.collapseOnOpen:  # 打开时折叠窗口
-                self.parent.collapseWindowsFromUser()
-        else: self.__delSelf(2)
+        self.parent.launch(self, path)
+
+    def setLaunching(self, flag: bool) -> None:
+        if flag == self.__launching: return
+        self.__launching = flag
+        if flag: self.setCursor(Qt.CursorShape.BusyCursor)
+        else: self.unsetCursor()
+        self.update()
+
+    def setTarget(self, name: str, path: str) -> None:
+        """目标被重命名后更新名称与路径"""
+        self.name, self.path = name, path
+        self.__elidedName = None
+        self.__updateToolTip()
+        self.update()
+
+    def setStale(self, flag: bool) -> None:
+        if flag == self.__stale: return
+        self.__stale = flag
+        self.__updateToolTip()
+        if self.appIconSize is not None: self.__updatePixmap()
+
+    def askRemoveMissing(self) -> None:
+        """目标不存在时以非模态对话框询问是否移除，不阻塞事件循环"""
+        if self.__missingBox is not None: return
+        self.parent.setHasActivePopup(True)
+        QApplication.beep()
+        self.__missingBox = QMessageBox(
+            QMessageBox.Icon.Question, "错误", "文件夹或应用不存在，是否从列表中移除？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self.parent
+        )
+        self.__missingBox.setStyleSheet(self.parent.dialogStyleSheet)
+        self.__missingBox.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.__missingBox.finished.connect(self.__missingAnswered)
+        self.__missingBox.open()
+
+    def __missingAnswered(self, result: int) -> None:
+        self.__missingBox = None
+        self.parent.setHasActivePopup(False)
+        if result == QMessageBox.StandardButton.Yes: self.__delSelf(0)
+
+    def __updatePixmap(self) -> None:
+        mode = QIcon.Mode.Disabled if self.__stale else QIcon.Mode.Normal
+        self.__pixmap = pixmapCache.pixmap(self.icon, self.appIconSize, self.devicePixelRatioF(), mode)
+        self.update()
+
+    def __updateToolTip(self) -> None:
+        self.setToolTip(f"{self.name} ({self.path}){StaleToolTip if self.__stale else ''}")
 
     def __delSelf(self, code: int) -> bool:
-        """:param code: 删除方式，0：直接删除，1：存在且询问删除，>2：不存在且询问删除"""
+        """:param code: 删除方式，0：直接删除，1：询问删除；目标不存在时由askRemoveMissing询问"""
         if code == 0:
             if self.parent.delItem(self):
                 self.deleteLater()
                 return True
-        if code == 1:
-            title = "提示"
-            text = "是否从列表中移除应用？"
-        else:
-            title = "错误"
-            text = "文件夹或应用不存在，是否从列表中移除？"
 
         self.parent.setHasActivePopup(True)
         QApplication.beep()
-        result = QMessageBox.question(
-            self.parent, title, text,
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        msgBox = QMessageBox(
+            QMessageBox.Icon.Question, "提示", "是否从列表中移除应用？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self.parent
         )
-        if result == QMessageBox.StandardButton.Yes:
+        msgBox.setStyleSheet(self.parent.dialogStyleSheet)
+        if msgBox.exec() == QMessageBox.StandardButton.Yes:
             if self.parent.delItem(self):
                 self.deleteLater()
         self.parent.setHasActivePopup(False)
 
 
 class AppWidget(QScrollArea):
+    populated = Signal()  # 启动时的应用项全部创建完成后发出
+
     def __init__(
             self,
             category: str,
             appIconSize: int,
-            AppMapping: dict,
+            itemStore: ItemStore,
             collapseOnOpen: bool,
+            iconLoader: IconLoader,
+            launcher: Launcher,
+            pathHealth: PathHealth,
             parent: "CollapsiblePanel"
     ):
         super().__init__(parent)
         self.setObjectName("AppWidget")
         self.category = category
         self.appIconSize = appIconSize
-        self.appMapping = AppMapping
+        self.itemStore = itemStore
         self.collapseOnOpen = collapseOnOpen
+        self.iconLoader = iconLoader
+        self.launcher = launcher
+        self.pathHealth = pathHealth
         self.parent = parent
+        self.popupStyleSheet = ""   # 菜单使用的QSS，由applyTheme设置
+        self.dialogStyleSheet = ""  # 对话框使用的QSS，由applyTheme设置
 
         self.setAcceptDrops(True)
         self.setWidgetResizable(True)
@@ -250,8 +467,18 @@ class AppWidget(QScrollArea):
         self.setWidget(self.mainWidget)
 
         self.parent = parent
-        self.items: list[Item] = []
-        self.paths = []
+        self.items: dict[int, Item] = {}  # ID -> Item
+        self.isPopulated = False  # 启动时的应用项是否已全部创建
+        self.__pending: list[tuple[int, str, str]] = []  # 尚未创建的(ID, 名称, 路径)，倒序存放
+        self.__launches: set[tuple[int, str]] = set()  # 本栏发起、尚未返回结果的(ID, 路径)
+
+        self.populateTimer = QTimer(self)  # 每次超时创建一个时间片的应用项
+        self.populateTimer.timeout.connect(self.__populateSlice)
+        self.iconReloadTimer = QTimer(self)  # 图标尺寸改变后重新加载图标
+        self.iconReloadTimer.setSingleShot(True)
+        self.iconReloadTimer.timeout.connect(self.__reloadIcons)
+        self.launcher.launchFinished.connect(self.__launchFinished)
+        self.pathHealth.healthChanged.connect(self.__healthChanged)
 
         self.__init()
 
@@ -267,11 +494,9 @@ class AppWidget(QScrollArea):
         if mime.text() == "appItem":  # 内部项拖动
             item1 = event.source()
             item2 = self.childAt(event.position().toPoint())
-            if not isinstance(item2, Item):  # 非item项，可能是内部的label
-                item2 = item2.parent()
-                if not isinstance(item2, Item):
-                    event.ignore()
-                    return False
+            if not isinstance(item2, Item):
+                event.ignore()
+                return False
             if item1 != item2:
                 self.swapItems(item1, item2)
                 event.accept()
@@ -283,44 +508,144 @@ class AppWidget(QScrollArea):
         if event.button() == Qt.MouseButton.RightButton:
             self.parent.setHasActivePopup(True)
             menu = QMenu(self)
+            menu.setStyleSheet(self.popupStyleSheet)
+            action = menu.addAction("按使用频率排序")
+            action.setCheckable(True)
+            action.setChecked(self.category in self.parent.autoOrder)
+            action.toggled.connect(lambda checked: self.parent.setAutoOrder(self.category, checked))
             menu.addAction("移除所有", self.clearItems)
             menu.exec(self.mapToGlobal(event.position().toPoint()))
             self.parent.setHasActivePopup(False)
 
     def __init(self) -> None:
-        for name, path in self.appMapping[self.category].items():
-            item = Item(QIcon(QFileIconProvider().icon(QFileInfo(path))), name, path, self)
-            self.mainLayout.addWidget(item)
-            self.items.append(item)
-            self.paths.append(path)
-        self.setNAppIconSize(self.appIconSize)
-
-    def addItem(self, name: str, path: str) -> Item:
-        item = Item(QIcon(QFileIconProvider().icon(QFileInfo(path))), name, path, self)
-        item.setNAppIconSize(self.appIconSize, self._calcFontSize(self.appIconSize))
+        """同步创建首屏的应用项，其余在事件循环中按时间片创建"""
+        self.setNAppIconSize(self.appIconSize)  # 先设置容器字体
+        records = self.itemStore.items(self.category)
+        self.__pending = [(record.id, record.name, record.path) for record in reversed(records)]
+        for _ in range(min(self.__firstScreenCount(), len(self.__pending))): self.__createItem(*self.__pending.pop())
+        if self.__pending: self.populateTimer.start(0)
+        else: self.finishPopulation()
+
+    def __firstScreenCount(self) -> int:
+        """按窗口尺寸估算首屏可见的应用项数量，此时尚未布局，宁多勿少"""
+        width, height = self.parent.n_winSize
+        spacing = self.mainLayout.spacing()
+        columns = (width // 2) // (int(self.appIconSize * 2.5) + spacing) + 1
+        rows = height // (self.appIconSize * 2 + spacing) + 1
+        return columns * rows
+
+    def __populateSlice(self) -> None:
+        """创建一个时间片内的应用项，整批加入后只布局、重绘一次"""
+        deadline = time.perf_counter() + PopulateSliceMs / 1000
+        self.__beginBatch()
+        while self.__pending and time.perf_counter() < deadline: self.__createItem(*self.__pending.pop())
+        self.__endBatch()
+        if not self.__pending: self.finishPopulation()
+
+    def finishPopulation(self) -> None:
+        """立即创建剩余的应用项"""
+        if self.isPopulated: return
+        self.populateTimer.stop()
+        self.__beginBatch()
+        while self.__pending: self.__createItem(*self.__pending.pop())
+        self.__endBatch()
+        self.isPopulated = True
+        self.populated.emit()
+
+    def __beginBatch(self) -> None:
+        """暂停布局与重绘：容器可见时，每个子控件显示都会立即触发一次完整布局"""
+        self.mainWidget.setUpdatesEnabled(False)
+        self.mainLayout.setEnabled(False)
+
+    def __endBatch(self) -> None:
+        self.mainLayout.setEnabled(True)
+        self.mainLayout.update()  # 整批只布局一次
+        self.mainWidget.setUpdatesEnabled(True)
+
+    def __createItem(self, itemId: int, name: str, path: str) -> Item:
+        item = Item(self.iconLoader.placeholder(self.category, self.appIconSize), itemId, name, path, self)
+        self.__loadIcon(item)
+        if self.pathHealth.isStale(path): item.setStale(True)
+        item.setNAppIconSize(self.appIconSize)
         self.mainLayout.addWidget(item)
-        self.items.append(item)
-        self.paths.append(path)
+        item.show()  # 立即显示；若由addWidget排队显示，批量添加结束后每项仍会单独触发一次布局
+        self.items[itemId] = item
         return item
 
+    def addItem(self, itemId: int, name: str, path: str) -> Item:
+        self.finishPopulation()  # 新项须排在启动时的项之后
+        return self.__createItem(itemId, name, path)
+
+    def addItems(self, items: list[tuple[int, str, str]]) -> None:
+        """批量添加(ID, 名称, 路径)，添加完成后再统一布局与重绘"""
+        self.finishPopulation()
+        self.__beginBatch()
+        for itemId, name, path in items: self.addItem(itemId, name, path)
+        self.__endBatch()
+
     def delItem(self, item: Item) -> bool:
-        try: self.mainLayout.delItem(item)
-        except ValueError: return False
-        self.items.remove(item)
-        self.parent.delItem(self.category, item.name)
+        if not self.mainLayout.delItem(item): return False
+        del self.items[item.id]
+        self.parent.delItem(item.id)
         return True
 
     def clearItems(self) -> None:
-        for item in self.items:
+        self.__pending.clear()
+        self.finishPopulation()
+        for item in self.items.values():
             item.deleteLater()
         self.mainLayout.clearItems()
         self.parent.clearItems(self.category)
-        self.items = []
+        self.items = {}
 
     def swapItems(self, item1: Item, item2: Item) -> bool:
-        self.parent.swapItems(self.category, item1.name, item2.name)
+        self.parent.swapItems(item1.id, item2.id)
         return self.mainLayout.swapItems(item1, item2)
 
+    def moveItems(self, moves: list[tuple[int, int]]) -> None:
+        """依次将(ID, 下标)移动到下标处，整批只布局一次"""
+        self.finishPopulation()
+        self.__beginBatch()
+        for itemId, index in moves:
+            item = self.items.get(itemId)
+            if item is not None: self.mainLayout.moveItem(item, index)
+        self.__endBatch()
+
+    def launch(self, item: Item, path: str) -> None:
+        if not self.launcher.launch(item.id, path): return  # 仍在启动中
+        self.__launches.add((item.id, path))
+        item.setLaunching(True)
+
+    def __launchFinished(self, itemId: int, path: str, status: str, message: str) -> None:
+        if (itemId, path) not in self.__launches: return  # 其他应用栏发起的启动
+        self.__launches.discard((itemId, path))
+        item = self.items.get(itemId)
+        if item is not None: item.setLaunching(self.launcher.isLaunching(itemId))
+        if status == "ok":
+            if self.collapseOnOpen: self.collapseWindowsFromUser()  # 打开时折叠窗口
+        elif status == "missing":
+            if item is not None: item.askRemoveMissing()
+        else: QApplication.beep()
+
+    def renameItem(self, itemId: int, name: str, path: str) -> None:
+        item = self.items.get(itemId)
+        if item is None:  # 尚未创建
+            self.__pending = [(itemId, name, path) if entry[0] == itemId else entry for entry in self.__pending]
+            return
+        item.setTarget(name, path)
+        item.setStale(self.pathHealth.isStale(path))
+        self.__loadIcon(item)
+
+    def reloadIcon(self, itemId: int) -> None:
+        """目标的图标可能已改变，重新加载"""
+        item = self.items.get(itemId)
+        if item is not None: self.__loadIcon(item)
+
+    def __healthChanged(self, path: str, stale: bool) -> None:
+        record = self.itemStore.findByPath(path)
+        item = None if record is None else self.items.get(record.id)  # 其他应用栏的项时为None
+        if item is not None: item.setStale(stale)
+
     @staticmethod
     def getAppName(path: str) -> str: return os.path.basename(path.rstrip('\\/')).split(".")[0]
     def collapseWindowsFromUser(self) -> None: self.parent.collapseWindowsFromUser()
@@ -333,10 +658,31 @@ class AppWidget(QScrollArea):
         if self.parent is None: return
         self.parent.setHasActivePopup(flag)
 
+    def applyTheme(self, theme: Theme) -> None:
+        """应用项不在QSS作用范围内，背景与文字使用调色板，菜单与对话框单独设置QSS"""
+        self.popupStyleSheet = theme.popupStyleSheet
+        self.dialogStyleSheet = theme.dialogStyleSheet
+        theme.applyToPanel(self)
+
     def setNAppIconSize(self, appIconSize: int) -> None:
-        """批量设置Item的AppIconSize"""
-        fontSize = self._calcFontSize(appIconSize)
-        for item in self.items: item.setNAppIconSize(appIconSize, fontSize)
+        """批量设置Item的AppIconSize，字体设置在容器上由Item继承"""
+        self.appIconSize = appIconSize
+        font = self.mainWidget.font()
+        font.setPointSize(self._calcFontSize(appIconSize))
+        self.mainWidget.setFont(font)
+        for item in self.items.values(): item.setNAppIconSize(appIconSize)
+        self.mainLayout.sizesChanged()
+        if self.items: self.iconReloadTimer.start(IconReloadDelay)
+
+    def __reloadIcons(self) -> None:
+        for item in self.items.values(): self.__loadIcon(item)
+
+    def __loadIcon(self, item: Item) -> None:
+        size = self.appIconSize
+        self.iconLoader.load(item.path, size, lambda icon: self.__iconLoaded(item, size, icon))
+
+    def __iconLoaded(self, item: Item, size: int, icon: QIcon) -> None:
+        if size == self.appIconSize: item.setIcon(icon)  # 尺寸已改变时等待新尺寸的图标
 
     @staticmethod
     def _calcFontSize(size: int) -> int:
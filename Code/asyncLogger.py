@@ -0,0 +1,99 @@
+__all__ = ["AsyncLogger", "LogLevels"]
+
+import os
+import time
+import queue
+import threading
+
+LogLevels = {"debug": 10, "info": 20, "warning": 30, "error": 40}  # 未知类型按info处理
+MaxLogSize = 1024 * 1024  # 单个日志文件上限(字节)，超过后轮转
+LogBackupCount = 3        # 保留的旧日志数量：.1为最新，.N为最旧
+
+
+# 异步日志：GUI线程只入队，写入线程批量写入并按大小轮转
+class AsyncLogger:
+    def __init__(self, logPath: str, level: str = "info", enabled: bool = True,
+                 maxBytes: int = MaxLogSize, backupCount: int = LogBackupCount):
+        """
+        :param level:       低于该级别的记录直接丢弃
+        :param enabled:     为False时不创建文件与线程，所有调用均为空操作
+        :param maxBytes:    当前文件超过该大小时轮转
+        :param backupCount: 保留的旧日志数量，为0时直接清空当前文件
+        """
+        self.logPath = logPath
+        self.level = LogLevels.get(level, LogLevels["info"])
+        self.enabled = enabled
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+
+        self.__queue: queue.SimpleQueue = queue.SimpleQueue()  # 元素为字符串、flush事件或None(停止)
+        self.__file = None
+        self.__closed = False
+        if not enabled: return
+
+        self.__queue.put(time.strftime("%Y年%m月%d日 %H:%M:%S\n", time.localtime()))
+        self.__thread = threading.Thread(target=self.__work, name="AsyncLogger", daemon=True)
+        self.__thread.start()
+
+    def write(self, message, type_: str) -> None:
+        """只格式化并入队，不触碰文件"""
+        if not self.enabled or self.__closed: return
+        if LogLevels.get(type_, LogLevels["info"]) < self.level: return
+        self.__queue.put(f"\t[{type_}]: {message}\n")
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """等待此前入队的记录写入磁盘，超时返回False"""
+        if not self.enabled or self.__closed: return True
+        event = threading.Event()
+        self.__queue.put(event)
+        return event.wait(timeout)
+
+    def close(self, exit_code: int = 0, timeout: float = 2.0) -> None:
+        if not self.enabled or self.__closed: return
+        self.write(f"程序退出，退出代码为{exit_code}", "info")
+        self.__closed = True
+        self.__queue.put(None)
+        self.__thread.join(timeout)
+
+    def __work(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self.__queue.get()]
+            while True:
+                try: batch.append(self.__queue.get_nowait())
+                except queue.Empty: break
+
+            lines, events = [], []
+            for record in batch:
+                if record is None: stop = True
+                elif isinstance(record, str): lines.append(record)
+                else: events.append(record)
+            if lines: self.__writeLines("".join(lines))
+            for event in events: event.set()
+
+        if self.__file is not None: self.__file.close()
+
+    def __writeLines(self, text: str) -> None:
+        """每批写入后立即flush，崩溃时最多丢失正在写入的一批"""
+        try:
+            if self.__file is None: self.__file = open(self.logPath, "a", encoding="utf-8")
+            if self.__file.tell() and self.__file.tell() + len(text.encode("utf-8")) > self.maxBytes: self.__rotate()
+            self.__file.write(text)
+            self.__file.flush()
+        except OSError:
+            # 日志本身无处可写，放弃本批，下一批重新打开
+            if self.__file is not None:
+                try: self.__file.close()
+                except OSError: pass
+            self.__file = None
+
+    def __rotate(self) -> None:
+        self.__file.close()
+        self.__file = None
+        if self.backupCount > 0:
+            for i in range(self.backupCount - 1, 0, -1):
+                src = f"{self.logPath}.{i}"
+                if os.path.exists(src): os.replace(src, f"{self.logPath}.{i + 1}")
+            os.replace(self.logPath, f"{self.logPath}.1")
+            self.__file = open(self.logPath, "a", encoding="utf-8")
+        else: self.__file = open(self.logPath, "w", encoding="utf-8")
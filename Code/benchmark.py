@@ -0,0 +1,202 @@
+"""
+性能测试，不依赖显示器
+用法：python benchmark.py [flowLayout startup item ...]，不带参数时运行全部
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QWidget, QFrame, QLabel, QVBoxLayout, QStyle
+from PySide6.QtCore import Qt, QRect, QPoint, QPointF, QEvent
+from PySide6.QtGui import QEnterEvent
+
+from appWidget import FlowLayout, Item
+
+
+def timeit(func, repeat: int = 5) -> float:
+    """返回最快一次的耗时(ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def rss() -> int | None:
+    """当前进程的常驻内存(字节)，无法获取时返回None"""
+    if os.name == "nt":
+        import ctypes
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("pageFaultCount", ctypes.c_ulong)] + [(name, ctypes.c_size_t) for name in (
+                "peakWorkingSetSize", "workingSetSize", "quotaPeakPagedPoolUsage", "quotaPagedPoolUsage",
+                "quotaPeakNonPagedPoolUsage", "quotaNonPagedPoolUsage", "pagefileUsage", "peakPagefileUsage"
+            )]
+        counters = Counters(cb=ctypes.sizeof(Counters))
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb): return None
+        return counters.workingSetSize
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError): return None
+
+
+def naiveFlow(layout: FlowLayout, width: int) -> None:
+    """原实现：每次都对所有项调用sizeHint与setGeometry"""
+    x, y, line_height = 0, 0, 0
+    for i in range(layout.count()):
+        item = layout.itemAt(i)
+        size = item.sizeHint()
+        if x + size.width() > width and x > 0:
+            x = 0
+            y += line_height + layout.spacing()
+            line_height = 0
+        item.setGeometry(QRect(QPoint(x, y), size))
+        x += size.width() + layout.spacing()
+        line_height = max(line_height, size.height())
+
+
+def flowLayout() -> None:
+    print("FlowLayout (ms)")
+    print(f"{'项数':>8}{'原实现全量排列':>12}{'首次排列':>10}{'重复排列':>10}{'heightForWidth':>16}"
+          f"{'末尾添加':>10}{'交换':>8}{'删除中间项':>10}{'改变宽度':>10}")
+    for count in (1000, 10000):
+        container = QWidget()
+        layout = FlowLayout(container)
+        widgets = []
+        for _ in range(count):
+            widget = QWidget(container)
+            widget.setFixedSize(62, 50)
+            layout.addWidget(widget)
+            widgets.append(widget)
+        rect = QRect(0, 0, 260, 0)
+
+        naive = timeit(lambda: naiveFlow(layout, rect.width()), 3)
+        first = timeit(lambda: layout.setGeometry(rect), 1)
+        repeat = timeit(lambda: layout.setGeometry(rect))
+        hfw = timeit(lambda: layout.heightForWidth(rect.width()))
+
+        def append():
+            widget = QWidget(container)
+            widget.setFixedSize(62, 50)
+            layout.addWidget(widget)
+            layout.setGeometry(rect)
+        added = timeit(append)
+
+        def swap():
+            layout.swapItems(widgets[10], widgets[count - 10])
+            layout.setGeometry(rect)
+        swapped = timeit(swap)
+
+        def delete():
+            layout.delItem(widgets.pop(count // 2))
+            layout.setGeometry(rect)
+        deleted = timeit(delete)
+
+        def resize():
+            rect.setWidth(rect.width() + 70)
+            layout.setGeometry(rect)
+        resized = timeit(resize, 3)
+
+        print(f"{count:>8}{naive:>19.2f}{first:>14.2f}{repeat:>14.3f}{hfw:>16.3f}"
+              f"{added:>14.3f}{swapped:>10.3f}{deleted:>15.2f}{resized:>14.2f}")
+        container.deleteLater()
+
+
+class LegacyItem(QFrame):
+    """原实现：QFrame + 布局 + 图标与名称两个QLabel，悬停时切换边框"""
+    def __init__(self, icon, name: str, parent: QWidget):
+        super().__init__(parent)
+        self.setObjectName("item")
+        lyt = QVBoxLayout(self)
+        lyt.setSpacing(0)
+        lyt.setContentsMargins(0, 2, 0, 2)
+        iconLabel = QLabel(self)
+        iconLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        iconLabel.setPixmap(icon.pixmap(32))
+        lyt.addWidget(iconLabel, 1, alignment=Qt.AlignmentFlag.AlignCenter)
+        lyt.addWidget(QLabel(name, self), alignment=Qt.AlignmentFlag.AlignHCenter)
+        self.setFixedSize(80, 64)
+
+    def enterEvent(self, event):
+        super().enterEvent(event)
+        self.setFrameShape(QFrame.Shape.StyledPanel)
+
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+
+
+def item() -> None:
+    """应用项的构建耗时、每项控件数与内存、悬停一次(进入+离开+重绘)的耗时"""
+    count, hovers = 1000, 200
+    icon = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+
+    def legacy(parent: QWidget, i: int) -> QWidget: return LegacyItem(icon, f"应用{i}", parent)
+    def painted(parent: QWidget, i: int) -> QWidget:
+        widget = Item(icon, i, f"应用{i}", "", parent)
+        widget.setNAppIconSize(32)
+        return widget
+
+    print(f"应用项 ({count}项，悬停{hovers}次)")
+    print(f"{'实现':>8}{'构建(ms)':>10}{'每项控件数':>10}{'每项内存(KB)':>12}{'每次悬停(µs)':>14}")
+    for name, make in (("原实现", legacy), ("自绘", painted)):
+        container = QWidget()
+        layout = FlowLayout(container)
+        container.resize(400, 300)
+
+        before = rss()
+        start = time.perf_counter()
+        items = [make(container, i) for i in range(count)]
+        for widget in items: layout.addWidget(widget)
+        container.show()  # 添加完成后再显示，避免逐项显示时反复布局
+        QApplication.processEvents()
+        built = (time.perf_counter() - start) * 1000
+        after = rss()
+        memory = f"{(after - before) / count / 1024:.2f}" if before is not None and after is not None else "-"
+        widgets = len(items[0].findChildren(QWidget)) + 1
+
+        start = time.perf_counter()
+        for widget in items[:hovers]:
+            QApplication.sendEvent(widget, QEnterEvent(QPointF(), QPointF(), QPointF()))
+            QApplication.processEvents()
+            QApplication.sendEvent(widget, QEvent(QEvent.Type.Leave))
+            QApplication.processEvents()
+        hover = (time.perf_counter() - start) * 1e6 / hovers
+
+        print(f"{name:>8}{built:>12.2f}{widgets:>12}{memory:>16}{hover:>16.1f}")
+        container.deleteLater()
+        QApplication.processEvents()
+
+
+def startup() -> None:
+    """主窗口构建耗时，以及延迟到首次展开的设置界面的构建耗时"""
+    import main
+    from configModel import Config
+    from settingsWidget import SettingsWidget
+    main.ScreenSize = QApplication.primaryScreen().size()
+    config = Config.load(main.ConfigPath, main.logging)
+
+    panels = []
+    def build():
+        panels.append(main.CollapsiblePanel(config))
+    panel = timeit(build, 3)
+    settings = timeit(lambda: SettingsWidget(config, main.ScreenSize, main.logging, panels[0]), 3)
+
+    print("启动 (ms)")
+    print(f"{'主窗口构建':>10}{'设置界面构建(已延迟)':>16}{'延迟前合计':>12}")
+    print(f"{panel:>15.2f}{settings:>22.2f}{panel + settings:>17.2f}")
+    for p in panels:
+        p.mappingStore.close()
+        p.iconCache.close()
+        p.deleteLater()
+
+
+Benchmarks = {"flowLayout": flowLayout, "startup": startup, "item": item}
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    for name in sys.argv[1:] or Benchmarks:
+        Benchmarks[name]()
@@ -0,0 +1,190 @@
+__all__ = ["Config", "ConfigSection", "WindowsConfig", "NormalConfig", "CollapsibleConfig"]
+
+import os
+import json
+from typing import Any, Callable
+
+
+# 校验器：值合法时返回(可能经过转换的)值，不合法时抛出ValueError
+def _bool(value) -> bool:
+    if not isinstance(value, bool): raise ValueError("应为布尔值")
+    return value
+
+
+def _int(low: int, high: int) -> Callable:
+    def check(value) -> int:
+        if isinstance(value, bool) or not isinstance(value, (int, float)): raise ValueError("应为整数")
+        if not low <= value <= high: raise ValueError(f"应在{low}~{high}之间")
+        return int(value)
+    return check
+
+
+def _float(low: float, high: float) -> Callable:
+    def check(value) -> float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)): raise ValueError("应为数字")
+        if not low <= value <= high: raise ValueError(f"应在{low}~{high}之间")
+        return float(value)
+    return check
+
+
+def _choice(*choices: str) -> Callable:
+    def check(value) -> str:
+        if value not in choices: raise ValueError(f"应为{'、'.join(choices)}之一")
+        return value
+    return check
+
+
+def _size(low: int, high: int) -> Callable:
+    item = _int(low, high)
+    def check(value) -> list[int]:
+        if not isinstance(value, list) or len(value) != 2: raise ValueError("应为[宽, 高]")
+        return [item(value[0]), item(value[1])]
+    return check
+
+
+def _placement(value) -> str | int:
+    """整数为窗口的x坐标，位于主屏幕左侧的屏幕上时为负数"""
+    if isinstance(value, str): return _choice("left", "center", "right", "top")(value)
+    return _int(-(1 << 16), 1 << 16)(value)
+
+
+def _subset(*choices: str) -> Callable:
+    def check(value) -> list[str]:
+        if not isinstance(value, list) or not all(i in choices for i in value):
+            raise ValueError(f"应为{'、'.join(choices)}组成的列表")
+        return [i for i in choices if i in value]  # 去重并固定顺序
+    return check
+
+
+def _suffixes(value) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(i, str) for i in value): raise ValueError("应为后缀列表")
+    return list(value)
+
+
+# 配置节：字段存放在__slots__中，赋值时记录脏字段
+class ConfigSection:
+    __slots__ = ("_name", "_dirty", "_saved")
+    FIELDS: dict[str, tuple[Any, Callable]] = {}  # 字段 -> (默认值, 校验器)
+
+    def __init__(self, name: str, data: dict, errors: list[str]):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_dirty", set())
+        for field, (default, check) in self.FIELDS.items():
+            value = self.__copy(default)
+            if field in data:
+                try: value = check(data[field])
+                except ValueError as e: errors.append(f"{name}.{field}{e}，已使用默认值{default!r}")
+            object.__setattr__(self, field, value)
+        object.__setattr__(self, "_saved", self.toDict())
+
+    def __setattr__(self, field: str, value) -> None:
+        """列表字段须整体赋值，原地修改不会被记录"""
+        if field not in self.FIELDS: raise AttributeError(f"配置项'{self._name}.{field}'不存在")
+        if getattr(self, field) == value: return
+        object.__setattr__(self, field, value)
+        self._dirty.add(field)
+
+    @property
+    def isDirty(self) -> bool: return bool(self._dirty)
+
+    def toDict(self) -> dict:
+        return {field: self.__copy(getattr(self, field)) for field in self.FIELDS}
+
+    def saved(self) -> dict:
+        """上次写入(或加载)时的值"""
+        return {field: self.__copy(value) for field, value in self._saved.items()}
+
+    def _markSaved(self) -> None:
+        for field in self._dirty: self._saved[field] = self.__copy(getattr(self, field))
+        self._dirty.clear()
+
+    @staticmethod
+    def __copy(value): return list(value) if isinstance(value, list) else value
+
+
+class WindowsConfig(ConfigSection):
+    __slots__ = (
+        "theme", "placement", "aniSpeed", "aniMode", "enterDelay", "leaveDelay", "isTop", "isLocked", "alwaysOnEdge",
+        "collapseOnOpen", "virtualMode", "autoOrder", "autoStartup", "identifyGroups"
+    )
+    FIELDS = {
+        "theme": ("dark", _choice("dark", "light")),
+        "placement": ("center", _placement),
+        "aniSpeed": (200, _int(0, 10000)),
+        "aniMode": ("live", _choice("live", "snapshot", "mask")),  # 窗口动画模式，见windowAnimator.AniModes
+        "enterDelay": (50, _int(0, 10000)),   # 鼠标停留多久后展开(ms)
+        "leaveDelay": (200, _int(0, 10000)),  # 鼠标离开多久后折叠(ms)
+        "isTop": (True, _bool),
+        "isLocked": (False, _bool),
+        "alwaysOnEdge": (False, _bool),
+        "collapseOnOpen": (True, _bool),  # 打开程序时折叠窗口
+        "virtualMode": (False, _bool),    # 大量应用时使用虚拟列表
+        "autoOrder": ([], _subset("folder", "exec")),  # 按使用频率与最近使用自动排序的应用栏
+        "autoStartup": (False, _bool),
+        "identifyGroups": ([".exe"], _suffixes),
+    }
+
+
+class NormalConfig(ConfigSection):
+    __slots__ = ("winSize", "titleIconSize", "appIconSize", "opacity")
+    FIELDS = {
+        "winSize": ([500, 240], _size(1, 1 << 16)),
+        "titleIconSize": (22, _int(1, 512)),
+        "appIconSize": (32, _int(1, 512)),
+        "opacity": (0.8, _float(0, 1)),
+    }
+
+
+class CollapsibleConfig(ConfigSection):
+    __slots__ = ("winSize", "opacity")
+    FIELDS = {
+        "winSize": ([200, 6], _size(1, 1 << 16)),
+        "opacity": (0.6, _float(0, 1)),
+    }
+
+
+# 配置模型：加载时逐项校验，只在有修改时原子写入
+class Config:
+    SECTIONS = {"windows": WindowsConfig, "normal": NormalConfig, "collapsible": CollapsibleConfig}
+    windows: WindowsConfig
+    normal: NormalConfig
+    collapsible: CollapsibleConfig
+
+    def __init__(self, path: str, data: dict, logging):
+        """非法或缺失的配置项使用默认值并记录日志"""
+        self.path = path
+        self.logging = logging
+
+        errors = []
+        for name, cls in self.SECTIONS.items():
+            section = data.get(name)
+            if not isinstance(section, dict):
+                if section is not None: errors.append(f"{name}应为对象，已使用默认值")
+                section = {}
+            setattr(self, name, cls(name, section, errors))
+        for error in errors: self.logging.write(f"config.json配置项{error}", "warning")
+
+    @classmethod
+    def load(cls, path: str, logging) -> "Config":
+        """文件无法读取或不是合法JSON时抛出异常"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(path, json.load(f), logging)
+
+    @property
+    def isDirty(self) -> bool: return any(getattr(self, name).isDirty for name in self.SECTIONS)
+
+    def toDict(self) -> dict: return {name: getattr(self, name).toDict() for name in self.SECTIONS}
+
+    def write(self) -> bool | None:
+        """没有修改时返回None，写入临时文件后替换，失败返回False"""
+        if not self.isDirty: return None
+        tmpPath = self.path + ".tmp"
+        try:
+            with open(tmpPath, "w", encoding="utf-8") as f:
+                json.dump(self.toDict(), f, indent=4)
+            os.replace(tmpPath, self.path)
+        except Exception as e:
+            self.logging.write(f"写入配置信息错误：{e}", "error")
+            return False
+        for name in self.SECTIONS: getattr(self, name)._markSaved()
+        return True
@@ -125,6 +125,7 @@ class ControlWidget(QWidget):
         self.parent.setHasActivePopup(True)
         QApplication.beep()
         msgBox = QMessageBox(self.parent)
+        msgBox.setStyleSheet(self.parent.dialogStyleSheet)
         msgBox.setWindowTitle("关闭窗口")
         msgBox.setText("是否关闭窗口？")
         msgBox.setIcon(QMessageBox.Icon.Question)
@@ -1,5 +1,9 @@
 from PySide6.QtWidgets import QMainWindow
 
+from pathIndex import PathIndex
+from itemStore import ItemStore
+from lnkResolver import LnkResolver
+
 
 class CollapsiblePanel(QMainWindow):
     def __init__(self):
@@ -7,6 +11,7 @@ class CollapsiblePanel(QMainWindow):
         self.isTop: bool = ...
         self.alwaysOnEdge: bool = ...
         self.collapseOnOpen: bool = ...
+        self.autoOrder: list[str] = ...
         self.isLocked: bool = ...
         self.winIsExpand: bool = ...
         self.settingsIsExpand: bool = ...
@@ -14,19 +19,29 @@ class CollapsiblePanel(QMainWindow):
         self.hasActivePopup: bool = ...
         self.firstStart: bool = ...
         self.isCollapsibleFromUser: bool = ...
+        self.n_winSize: list[int] = ...
+        self.itemStore: ItemStore = ...
+        self.pathIndex: PathIndex = ...
+        self.lnkResolver: LnkResolver = ...
 
     def switchTheme(self, theme: str) -> None: ...
     def addItem(self, type_: str, name: str, path: str) -> None: ...
-    def delItem(self, type_: str, name: str) -> None: ...
+    def addItems(self, items: list[tuple[str, str, str]]) -> None: ...
+    def delItem(self, itemId: int) -> None: ...
     def clearItems(self, type_: str) -> None: ...
-    def swapItems(self, type_: str, name1: str, name2: str) -> None: ...
+    def swapItems(self, itemId1: int, itemId2: int) -> None: ...
     def collapseWindowsFromSystem(self) -> None: ...
     def collapseWindowsFromUser(self) -> None: ...
     def expandWindowsFromSystem(self) -> None: ...
     def collapseSettings(self) -> None: ...
     def expandSettings(self) -> None: ...
     def changeIdentify(self, type_1: str, type_2: str) -> None: ...
+    def beginUpdate(self) -> None: ...
+    def endUpdate(self) -> None: ...
     def setAniSpeed(self, value: int) -> None: ...
+    def setAniMode(self, mode: str) -> None: ...
+    def setEnterDelay(self, value: int) -> None: ...
+    def setLeaveDelay(self, value: int) -> None: ...
     def setAlwaysOnEdge(self, state: bool) -> None: ...
     def setHasDraggingWidget(self, flag: bool) -> None: ...
     def setHasActivePopup(self, flag: bool) -> None: ...
@@ -34,6 +49,7 @@ class CollapsiblePanel(QMainWindow):
     def setLock(self, flag: bool) -> None: ...
     def setPlacementSpinBoxBlockSig(self, flag: bool) -> None: ...
     def setPlacementSpinBoxValue(self, value: int) -> None: ...
+    def setAutoOrder(self, type_: str, flag: bool) -> None: ...
     def setCollapseOnOpen(self, flag: bool) -> None: ...
     def setNAppIconSize(self, appIconSize: int) -> None: ...
     def setOpacity(self, arg_1: str, value: float) -> None: ...
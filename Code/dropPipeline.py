@@ -0,0 +1,130 @@
+__all__ = ["DropPipeline"]
+
+import os
+from typing import Callable
+from concurrent.futures import Future
+from PySide6.QtWidgets import QProgressDialog
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import Qt
+
+from declaration import CollapsiblePanel
+from appWidget import AppWidget
+from lnkResolver import LnkResolver
+
+ProgressThreshold = 50  # 拖入数量达到该值时显示进度
+ProgressStep = 10       # 每解析多少项报告一次进度
+
+
+class _ResolveSignals(QObject):
+    progress = Signal(int, int)  # 已完成，总数
+    finished = Signal(list, list)  # [(类型, 名称, 路径, lnk路径)]，错误信息
+
+
+class _ResolveTask(QRunnable):
+    def __init__(self, paths: list[str], identifyGroups: tuple[str], resolver: LnkResolver, signals: _ResolveSignals):
+        """解析阶段：在线程池中访问文件系统，lnk交给解析服务并行解析"""
+        super().__init__()
+        self.paths = paths
+        self.resolver = resolver
+        self.futures: dict[str, Future] = {}
+        self.identifyGroups = identifyGroups
+        self.signals = signals
+
+    def run(self) -> None:
+        entries, errors = [], []
+        total = len(self.paths)
+        for path in self.paths:  # 先提交所有lnk，并行解析
+            if path.lower().endswith(".lnk"): self.futures[path] = self.resolver.resolve(path)
+        for i, path in enumerate(self.paths, 1):
+            try:  # 单项失败不影响本批次的其他项
+                entry = self.__resolve(path, errors)
+                if entry is not None: entries.append(entry)
+            except Exception as e: errors.append(f"解析路径:'{path}'失败，错误信息：{e}")
+            if i % ProgressStep == 0 or i == total: self.signals.progress.emit(i, total)
+        self.signals.finished.emit(entries, errors)
+
+    def __resolve(self, path: str, errors: list[str]) -> tuple[str, str, str, str] | None:
+        name = AppWidget.getAppName(path)
+        if path.lower().endswith(".lnk"):
+            try:
+                targetPath = self.futures[path].result()  # 解析服务从提交时开始计时，超时视为解析失败
+            except TimeoutError:
+                errors.append(f"提取路径:‘{path}'的lnk文件的目标位置超时")
+                return "folder", name, path, ""
+            except Exception as e:
+                errors.append(f"提取路径:‘{path}'的lnk文件的目标位置失败，错误信息：{e}")
+                return "folder", name, path, ""  # 添加快捷方式到 folder
+            if os.path.isdir(targetPath): return "folder", name, targetPath, path
+            return "exec", name, targetPath, path
+        if os.path.isdir(path): return "folder", name, path, ""
+        if path.lower().endswith(self.identifyGroups): return "exec", name, path, ""
+        return None
+
+
+class _DropBatch(QObject):
+    def __init__(self, total: int, commit: Callable, parent: "CollapsiblePanel"):
+        """一次拖放的状态，拖入较多时显示进度；信号连接到本对象的方法，保证在GUI线程执行"""
+        super().__init__(parent)
+        self.commit = commit
+        self.signals = _ResolveSignals(self)
+        self.signals.progress.connect(self.__onProgress)
+        self.signals.finished.connect(self.__onFinished)
+        self.dialog: QProgressDialog = None
+        if total >= ProgressThreshold:
+            self.dialog = QProgressDialog("正在添加...", None, 0, total, parent)
+            self.dialog.setWindowTitle("添加应用")
+            self.dialog.setStyleSheet(parent.dialogStyleSheet)
+            self.dialog.setWindowModality(Qt.WindowModality.NonModal)
+            self.dialog.setMinimumDuration(300)
+            self.dialog.setAutoClose(False)
+
+    def close(self) -> None:
+        if self.dialog is not None: self.dialog.deleteLater()
+        self.deleteLater()
+
+    def __onProgress(self, done: int, total: int) -> None:
+        if self.dialog is not None: self.dialog.setValue(done)
+
+    def __onFinished(self, entries: list, errors: list[str]) -> None: self.commit(self, entries, errors)
+
+
+# 拖放流程：分类(GUI线程) -> 解析(线程池) -> 提交(GUI线程，一次布局、一次保存)
+class DropPipeline(QObject):
+    def __init__(self, logging, parent: "CollapsiblePanel"):
+        super().__init__(parent)
+        self.logging = logging
+        self.parent = parent
+        self.__batches: set[_DropBatch] = set()
+        self.__pool = QThreadPool(self)
+        self.__pool.setMaxThreadCount(2)
+
+    def start(self, urls: list, identifyGroups: list[str]) -> None:
+        """分类阶段：去掉空路径、已存在与本批次内重复的路径"""
+        paths, keys = [], set()
+        for url in urls:
+            path = url.toLocalFile()
+            if not path or path in self.parent.pathIndex: continue  # 已存在
+            key = self.parent.pathIndex.normalize(path)
+            if key in keys: continue
+            keys.add(key)
+            paths.append(path)
+        if not paths: return
+
+        batch = _DropBatch(len(paths), self.__commit, self.parent)
+        self.__batches.add(batch)
+        if batch.dialog is not None: self.parent.setHasActivePopup(True)
+        self.__pool.start(_ResolveTask(paths, tuple(identifyGroups), self.parent.lnkResolver, batch.signals))
+
+    def __commit(self, batch: _DropBatch, entries: list, errors: list[str]) -> None:
+        """提交阶段：记录lnk解析结果，一次性添加所有新项"""
+        for error in errors: self.logging.write(error, "warning")
+
+        items = []
+        for type_, name, path, lnkPath in entries:
+            if lnkPath: self.parent.pathIndex.addAlias(lnkPath, path)
+            items.append((type_, name, path))
+        self.parent.addItems(items)
+
+        if batch.dialog is not None: self.parent.setHasActivePopup(False)
+        batch.close()
+        self.__batches.discard(batch)
@@ -0,0 +1,150 @@
+__all__ = ["IconCache"]
+
+import os
+import json
+import threading
+from collections import OrderedDict
+
+MaxCacheSize = 16 * 1024 * 1024  # 缓存数据上限(字节)，超过后按LRU淘汰
+
+
+# 图标磁盘缓存：一个数据包文件 + 一个索引文件
+class IconCache:
+    def __init__(self, packPath: str, indexPath: str, logging, maxSize: int = MaxCacheSize):
+        """
+        :param packPath:  数据包路径，PNG数据依次追加写入
+        :param indexPath: 索引路径，记录 键 -> [mtime, 偏移, 长度]，按最近使用顺序排列
+        :param maxSize:   有效数据上限(字节)
+        """
+        self.packPath = packPath
+        self.indexPath = indexPath
+        self.logging = logging
+        self.maxSize = maxSize
+        self.hits = 0    # 命中次数
+        self.misses = 0  # 未命中次数
+
+        self.__lock = threading.Lock()  # 线程池中的任务会并发读写
+        self.__index: OrderedDict[str, list[int]] = OrderedDict()
+        self.__liveSize = 0  # 索引中有效数据的大小
+        self.__packSize = 0  # 数据包大小，超过有效数据的两倍时重写
+        self.__dirty = False
+
+        self.__load()
+
+    @staticmethod
+    def makeKey(path: str, size: int) -> str: return f"{size}|{os.path.normcase(os.path.normpath(path))}"
+
+    def get(self, path: str, mtime: int, size: int) -> bytes | None:
+        """读取缓存，mtime不一致时视为过期并淘汰"""
+        key = self.makeKey(path, size)
+        with self.__lock:
+            entry = self.__index.get(key)
+            if entry is None or entry[0] != mtime:
+                if entry is not None: self.__remove(key)  # 过期
+                self.misses += 1
+                return None
+            try:
+                self.__pack.seek(entry[1])
+                data = self.__pack.read(entry[2])
+            except (OSError, ValueError):  # ValueError：已关闭
+                data = b""
+            if len(data) != entry[2]:  # 数据包损坏
+                self.__remove(key)
+                self.misses += 1
+                return None
+            self.__index.move_to_end(key)
+            self.__dirty = True
+            self.hits += 1
+            return data
+
+    def put(self, path: str, mtime: int, size: int, data: bytes) -> None:
+        key = self.makeKey(path, size)
+        with self.__lock:
+            if key in self.__index: self.__remove(key)
+            try:
+                offset = self.__pack.seek(0, os.SEEK_END)
+                self.__pack.write(data)
+            except (OSError, ValueError) as e:
+                self.logging.write(f"写入图标缓存失败，错误信息：{e}", "warning")
+                return
+            self.__index[key] = [mtime, offset, len(data)]
+            self.__liveSize += len(data)
+            self.__packSize = offset + len(data)
+            self.__dirty = True
+            while self.__liveSize > self.maxSize and len(self.__index) > 1:  # LRU淘汰
+                self.__remove(next(iter(self.__index)))
+            if self.__packSize > self.__liveSize * 2:  # 无效数据过多，运行期间同样重写，避免数据包无限增长
+                try: self.__compact()
+                except OSError as e: self.logging.write(f"重写图标缓存失败，错误信息：{e}", "warning")
+
+    def invalidate(self, path: str) -> None:
+        """淘汰某路径所有尺寸的缓存"""
+        suffix = self.makeKey(path, 0).split("|", 1)[1]
+        with self.__lock:
+            for key in [k for k in self.__index if k.split("|", 1)[1] == suffix]:
+                self.__remove(key)
+
+    def discard(self, path: str, size: int) -> None:
+        """淘汰无法解码的缓存项"""
+        with self.__lock:
+            key = self.makeKey(path, size)
+            if key in self.__index: self.__remove(key)
+
+    def save(self, compact: bool = False) -> None:
+        """写入索引，compact为True且无效数据过多时重写数据包；运行期间put()在超过阈值时已自动重写"""
+        with self.__lock:
+            if self.__pack.closed: return  # 已关闭，退出前仍在排队的加载结束时可能调用
+            try:
+                self.__pack.flush()
+                if compact and self.__packSize > self.__liveSize * 2: self.__compact()
+                if self.__dirty: self.__writeIndex()
+            except OSError as e:
+                self.logging.write(f"保存图标缓存索引失败，错误信息：{e}", "warning")
+
+    def close(self) -> None:
+        self.save(compact=True)
+        self.__pack.close()
+
+    def __load(self) -> None:
+        try:
+            with open(self.indexPath, "r", encoding="utf-8") as f:
+                entries = json.load(f)["entries"]
+        except FileNotFoundError: entries = []
+        except Exception as e:
+            self.logging.write(f"图标缓存索引损坏，已重建，错误信息：{e}", "warning")
+            entries = []
+
+        self.__pack = open(self.packPath, "a+b")
+        self.__packSize = self.__pack.seek(0, os.SEEK_END)
+        for key, mtime, offset, length in entries:
+            if offset + length > self.__packSize: continue  # 数据包被截断
+            self.__index[key] = [mtime, offset, length]
+            self.__liveSize += length
+
+    def __remove(self, key: str) -> None:
+        self.__liveSize -= self.__index.pop(key)[2]
+        self.__dirty = True
+
+    def __writeIndex(self) -> None:
+        tmpPath = self.indexPath + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump({"entries": [[k, *v] for k, v in self.__index.items()]}, f)
+        os.replace(tmpPath, self.indexPath)
+        self.__dirty = False
+
+    def __compact(self) -> None:
+        """只保留有效数据，重写数据包并立即写入索引；替换失败时继续使用原数据包"""
+        tmpPath = self.packPath + ".tmp"
+        offsets = []
+        with open(tmpPath, "wb") as f:
+            for entry in self.__index.values():
+                self.__pack.seek(entry[1])
+                offsets.append(f.tell())
+                f.write(self.__pack.read(entry[2]))
+            packSize = f.tell()
+        self.__pack.close()
+        try: os.replace(tmpPath, self.packPath)
+        finally: self.__pack = open(self.packPath, "a+b")
+        for entry, offset in zip(self.__index.values(), offsets): entry[1] = offset
+        self.__packSize = packSize
+        self.__writeIndex()
@@ -0,0 +1,139 @@
+__all__ = ["IconLoader"]
+
+import os
+import time
+from typing import Callable
+from PySide6.QtWidgets import QFileIconProvider
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, QFileInfo, QBuffer, QIODevice, Signal
+from PySide6.QtGui import QIcon, QImage, QPixmap
+
+from iconCache import IconCache
+
+SlowIconTime = 100  # 单个图标加载超过该时间(ms)则记录日志
+BatchIdleTime = 500  # 加载队列空闲超过该时间(ms)才视为本批次结束，分批提交的请求合并为一批
+PlaceholderPath = "<placeholder>"  # 占位图标在磁盘缓存中使用的路径前缀，后接类型
+
+
+class _IconSignals(QObject):
+    finished = Signal(str, int, QImage, float)  # 路径，像素大小，图像，耗时(ms)
+
+
+class _IconTask(QRunnable):
+    def __init__(self, path: str, size: int, cache: IconCache, signals: _IconSignals):
+        """
+        在线程池中解析单个路径的图标，优先读取磁盘缓存，只把光栅化后的QImage交回GUI线程
+        Windows下QFileIconProvider返回惰性的图标引擎，耗时的SHGetFileInfo在首次取位图时才调用，因此光栅化也在线程中完成
+        QIcon.pixmap()在线程中创建QPixmap：Windows平台支持ThreadedPixmaps，非GUI线程可以使用QPixmap，
+        但QPixmap不能跨线程传递，因此转换为QImage后再交回
+        """
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.cache = cache
+        self.signals = signals
+
+    def run(self) -> None:
+        start = time.perf_counter()
+        image, mtime = QImage(), 0
+        try:
+            # 文件夹的mtime随内容变化，不作为过期依据
+            mtime = 0 if os.path.isdir(self.path) else os.stat(self.path).st_mtime_ns
+        except OSError: pass
+
+        data = self.cache.get(self.path, mtime, self.size)
+        if data is not None and not image.loadFromData(data, "PNG"):
+            self.cache.discard(self.path, self.size)
+        if image.isNull():
+            try: image = QFileIconProvider().icon(QFileInfo(self.path)).pixmap(self.size, self.size).toImage()
+            except Exception: pass
+            data = _encodePng(image)
+            if data is not None: self.cache.put(self.path, mtime, self.size, data)
+        self.signals.finished.emit(self.path, self.size, image, (time.perf_counter() - start) * 1000)
+
+
+def _encodePng(image: QImage) -> bytes | None:
+    if image.isNull(): return None
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    return buffer.data().data() if image.save(buffer, "PNG") else None
+
+
+# 后台图标加载器
+class IconLoader(QObject):
+    iconLoaded = Signal(str, QIcon, float)  # 路径，图标，耗时(ms)
+
+    def __init__(self, cache: IconCache, logging, maxThreadCount: int = 4, parent: QObject = None):
+        super().__init__(parent)
+        self.cache = cache
+        self.logging = logging
+        self.timings: dict[str, float] = {}  # 各路径图标的加载耗时(ms)
+        self.__pending: dict[tuple[str, int], list[Callable[[QIcon], None]]] = {}  # 加载中的(路径, 像素大小)与回调
+        self.__placeholders: dict[tuple[str, int], QIcon] = {}  # (类型, 像素大小) -> 占位图标
+        self.__batchStart: float = None
+        self.__batchEnd: float = None
+        self.__batchCount = 0
+        self.__batchSlowest: tuple[str, float] = ("", 0.0)
+
+        self.__pool = QThreadPool(self)
+        self.__pool.setMaxThreadCount(maxThreadCount)
+        self.__signals = _IconSignals(self)
+        self.__signals.finished.connect(self.__onFinished)
+        self.__batchTimer = QTimer(self)
+        self.__batchTimer.setSingleShot(True)
+        self.__batchTimer.timeout.connect(self.__finishBatch)
+
+    def load(self, path: str, size: int, callback: Callable[[QIcon], None]) -> None:
+        """异步加载size像素的图标，加载完成后在GUI线程调用callback(icon)；图标只有这一种尺寸，尺寸改变后须重新加载"""
+        if (path, size) in self.__pending:  # 同一路径的同一尺寸只解析一次
+            self.__pending[(path, size)].append(callback)
+            return
+        if self.__batchStart is None: self.__batchStart = time.perf_counter()
+        self.__batchTimer.stop()
+        self.__pending[(path, size)] = [callback]
+        self.__pool.start(_IconTask(path, size, self.cache, self.__signals))
+
+    def placeholder(self, category: str, size: int) -> QIcon:
+        """占位图标，只按类型获取，不访问文件；保存在磁盘缓存中，热启动时不再调用QFileIconProvider"""
+        key = (category, size)
+        if key not in self.__placeholders:
+            path, image = PlaceholderPath + category, QImage()
+            data = self.cache.get(path, 0, size)
+            if data is None or not image.loadFromData(data, "PNG"):
+                if category == "folder": iconType = QFileIconProvider.IconType.Folder
+                else: iconType = QFileIconProvider.IconType.File
+                image = QFileIconProvider().icon(iconType).pixmap(size, size).toImage()
+                data = _encodePng(image)
+                if data is not None: self.cache.put(path, 0, size, data)
+            self.__placeholders[key] = QIcon() if image.isNull() else QIcon(QPixmap.fromImage(image))
+        return self.__placeholders[key]
+
+    def __onFinished(self, path: str, size: int, image: QImage, elapsed: float) -> None:
+        icon = QIcon() if image.isNull() else QIcon(QPixmap.fromImage(image))
+        self.timings[path] = elapsed
+        self.__batchCount += 1
+        if elapsed >= self.__batchSlowest[1]: self.__batchSlowest = (path, elapsed)
+        if elapsed > SlowIconTime:
+            self.logging.write(f"加载图标'{path}'耗时{elapsed:.1f}ms", "warning")
+
+        for callback in self.__pending.pop((path, size), []):
+            try: callback(icon)
+            except RuntimeError: pass  # 对应的Item已被删除
+        self.iconLoaded.emit(path, icon, elapsed)
+
+        if not self.__pending and self.__batchStart is not None:  # 队列已空，空闲一段时间后结束本批次
+            self.__batchEnd = time.perf_counter()
+            self.__batchTimer.start(BatchIdleTime)
+
+    def __finishBatch(self) -> None:
+        """记录本批次耗时并保存缓存索引"""
+        if self.__pending or self.__batchStart is None: return
+        total = (self.__batchEnd - self.__batchStart) * 1000
+        slowest, slowestTime = self.__batchSlowest
+        self.logging.write(
+            f"图标加载完成，共{self.__batchCount}个，总耗时{total:.1f}ms，最慢'{slowest}' {slowestTime:.1f}ms，"
+            f"缓存命中{self.cache.hits}次，未命中{self.cache.misses}次", "info"
+        )
+        self.cache.save()
+        self.__batchStart = None
+        self.__batchCount = 0
+        self.__batchSlowest = ("", 0.0)
@@ -0,0 +1,119 @@
+__all__ = ["ItemStore", "ItemRecord"]
+
+from pathIndex import PathIndex
+
+
+class ItemRecord:
+    __slots__ = ("id", "type", "name", "path")
+
+    def __init__(self, id_: int, type_: str, name: str, path: str):
+        self.id = id_
+        self.type = type_
+        self.name = name
+        self.path = path
+
+
+# 应用项存储：稳定ID + 各类型的顺序表，名称可以重复
+class ItemStore:
+    def __init__(self, types: tuple[str, ...] = ("folder", "exec")):
+        self.pathIndex = PathIndex()  # 规范化路径 -> ID
+        self.nextId = 1
+        self.__records: dict[int, ItemRecord] = {}
+        self.__orders: dict[str, list[int]] = {type_: [] for type_ in types}
+        self.__positions: dict[int, int] = {}  # ID -> 在顺序表中的下标
+
+    def __len__(self) -> int: return len(self.__records)
+    def __contains__(self, id_: int) -> bool: return id_ in self.__records
+    def get(self, id_: int) -> ItemRecord | None: return self.__records.get(id_)
+    def types(self) -> list[str]: return list(self.__orders)
+
+    def findByPath(self, path: str) -> ItemRecord | None:
+        id_ = self.pathIndex.find(path)
+        return None if id_ is None else self.__records.get(id_)
+
+    def items(self, type_: str) -> list[ItemRecord]:
+        """按显示顺序返回某类型的所有项"""
+        return [self.__records[id_] for id_ in self.__orders.get(type_, ())]
+
+    def add(self, type_: str, name: str, path: str, id_: int = None) -> ItemRecord:
+        """添加到末尾，id_为None时分配新ID"""
+        if id_ is None: id_ = self.nextId
+        self.nextId = max(self.nextId, id_ + 1)
+        record = self.__records[id_] = ItemRecord(id_, type_, name, path)
+        order = self.__orders.setdefault(type_, [])
+        self.__positions[id_] = len(order)
+        order.append(id_)
+        self.pathIndex.add(id_, path)
+        return record
+
+    def remove(self, id_: int) -> ItemRecord | None:
+        record = self.__records.pop(id_, None)
+        if record is None: return None
+        order = self.__orders[record.type]
+        pos = self.__positions.pop(id_)
+        del order[pos]
+        for i in range(pos, len(order)): self.__positions[order[i]] = i
+        self.pathIndex.remove(record.path)
+        return record
+
+    def clear(self, type_: str) -> None:
+        for id_ in self.__orders.get(type_, ()):
+            self.pathIndex.remove(self.__records.pop(id_).path)
+            del self.__positions[id_]
+        self.__orders[type_] = []
+
+    def swap(self, id1: int, id2: int) -> bool:
+        """交换两项的位置，O(1)"""
+        record1, record2 = self.__records.get(id1), self.__records.get(id2)
+        if record1 is None or record2 is None or record1.type != record2.type: return False
+        order = self.__orders[record1.type]
+        pos1, pos2 = self.__positions[id1], self.__positions[id2]
+        order[pos1], order[pos2] = id2, id1
+        self.__positions[id1], self.__positions[id2] = pos2, pos1
+        return True
+
+    def move(self, id_: int, index: int) -> bool:
+        """移动到index处，只更新两个下标之间的项"""
+        record = self.__records.get(id_)
+        if record is None: return False
+        order = self.__orders[record.type]
+        pos, index = self.__positions[id_], max(0, min(index, len(order) - 1))
+        if pos == index: return False
+        del order[pos]
+        order.insert(index, id_)
+        for i in range(min(pos, index), max(pos, index) + 1): self.__positions[order[i]] = i
+        return True
+
+    def rename(self, id_: int, name: str, path: str) -> bool:
+        """目标被重命名或移动后更新名称与路径，位置不变"""
+        record = self.__records.get(id_)
+        if record is None: return False
+        self.pathIndex.remove(record.path)
+        record.name, record.path = name, path
+        self.pathIndex.add(id_, path)
+        return True
+
+    def findByName(self, type_: str, name: str) -> ItemRecord | None:
+        """按名称查找第一项，只用于迁移旧格式"""
+        for record in self.items(type_):
+            if record.name == name: return record
+        return None
+
+    def toSnapshot(self) -> dict:
+        snapshot: dict = {"nextId": self.nextId}
+        for type_, order in self.__orders.items():
+            snapshot[type_] = [[id_, self.__records[id_].name, self.__records[id_].path] for id_ in order]
+        return snapshot
+
+    @classmethod
+    def fromSnapshot(cls, snapshot: dict) -> "ItemStore":
+        """兼容旧格式 {类型: {名称: 路径}}"""
+        store = cls()
+        nextId = snapshot.pop("nextId", 1)
+        for type_, items in snapshot.items():
+            if isinstance(items, dict):
+                for name, path in items.items(): store.add(type_, name, path)
+            else:
+                for id_, name, path in items: store.add(type_, name, path, id_)
+        store.nextId = max(store.nextId, nextId)
+        return store
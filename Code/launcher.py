@@ -0,0 +1,100 @@
+__all__ = ["Launcher", "LaunchStats"]
+
+import os
+import time
+import threading
+from bisect import bisect_left
+from PySide6.QtCore import QObject, Signal
+
+from pathHealth import PathHealth
+
+LaunchBuckets = (10, 50, 100, 500, 1000, 5000)  # 耗时直方图各桶的上界(ms)，超过最后一个计入溢出桶
+SlowLaunchTime = 1000  # 单次启动超过该时间(ms)则记录日志
+
+
+# 启动耗时直方图：解析(检查路径是否存在)与启动(os.startfile)分别统计，失败按原因计数
+class LaunchStats:
+    def __init__(self, buckets: tuple[int, ...] = LaunchBuckets):
+        self.buckets = buckets
+        self.resolve = [0] * (len(buckets) + 1)
+        self.spawn = [0] * (len(buckets) + 1)
+        self.failures: dict[str, int] = {}  # 原因 -> 次数
+
+    @property
+    def total(self) -> int: return sum(self.resolve)
+
+    def record(self, status: str, resolveTime: float, spawnTime: float) -> None:
+        """:param status: "ok"、"missing"或"failed"，目标不存在时没有启动阶段"""
+        self.resolve[bisect_left(self.buckets, resolveTime)] += 1
+        if status != "missing": self.spawn[bisect_left(self.buckets, spawnTime)] += 1
+        if status != "ok": self.failures[status] = self.failures.get(status, 0) + 1
+
+    def summary(self) -> str:
+        labels = [f"≤{bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+        resolve = "，".join(f"{label} {count}" for label, count in zip(labels, self.resolve) if count)
+        spawn = "，".join(f"{label} {count}" for label, count in zip(labels, self.spawn) if count)
+        failures = "，".join(f"{status} {count}" for status, count in self.failures.items())
+        return f"启动{self.total}次；解析：{resolve or '无'}；启动：{spawn or '无'}；失败：{failures or '无'}"
+
+
+class _LaunchSignals(QObject):
+    finished = Signal(object, str, str, str, float, float, bool)  # 键，路径，结果，错误信息，解析、启动耗时(ms)，是否检查了路径
+
+
+# 启动服务：每次启动一个守护线程检查路径并启动，结果通过信号回到GUI线程
+class Launcher(QObject):
+    launchFinished = Signal(object, str, str, str)  # 键，路径，结果("ok"/"missing"/"failed")，错误信息
+
+    def __init__(self, pathHealth: PathHealth, logging, parent: QObject = None):
+        """
+        每次启动使用独立的守护线程，卡在不可用的网络路径上的启动不会阻塞其他启动、界面与程序退出
+        启动由用户操作触发，数量很少，不需要线程池
+        """
+        super().__init__(parent)
+        self.pathHealth = pathHealth  # 有效期内确认存在的路径可省去启动前的检查
+        self.logging = logging
+        self.stats = LaunchStats()
+        self.__inFlight: set[tuple] = set()  # 启动中的(键, 路径)，只在GUI线程访问
+        self.__signals = _LaunchSignals(self)
+        self.__signals.finished.connect(self.__onFinished)
+
+    def launch(self, key, path: str) -> bool:
+        """
+        :param key: 调用方用来对应结果的键，如应用项ID
+        :return: 同一键的同一路径仍在启动中时返回False
+        """
+        if (key, path) in self.__inFlight: return False
+        self.__inFlight.add((key, path))
+        # 只有确认存在的结果可以跳过检查；不存在或无法访问的结果可能已过时(如网络驱动器已重新连接)，须重新检查
+        known = self.pathHealth.lookup(path) is True
+        threading.Thread(target=self.__launch, args=(key, path, known), name="Launcher", daemon=True).start()
+        return True
+
+    def isLaunching(self, key) -> bool: return any(k == key for k, _ in self.__inFlight)
+
+    def __launch(self, key, path: str, known: bool) -> None:
+        start = time.perf_counter()
+        status, message, checked = "ok", "", not known
+        exists = known or os.path.exists(path)  # 网络路径不可用时可能阻塞数秒
+        resolved = time.perf_counter()
+        if not exists: status = "missing"
+        else:
+            try: os.startfile(path)
+            except Exception as e: status, message = "failed", str(e)
+        end = time.perf_counter()
+        self.__signals.finished.emit(
+            key, path, status, message, (resolved - start) * 1000, (end - resolved) * 1000, checked
+        )
+
+    def __onFinished(
+            self, key, path: str, status: str, message: str, resolveTime: float, spawnTime: float, checked: bool
+    ) -> None:
+        self.__inFlight.discard((key, path))
+        if checked: self.pathHealth.record(path, status != "missing")
+        self.stats.record(status, resolveTime, spawnTime)
+        if status == "failed": self.logging.write(f"启动'{path}'失败，错误信息：{message}", "warning")
+        elif status == "missing": self.logging.write(f"启动'{path}'失败，文件夹或应用不存在", "warning")
+        if resolveTime + spawnTime > SlowLaunchTime:
+            self.logging.write(f"启动'{path}'耗时{resolveTime + spawnTime:.1f}ms"
+                               f"(解析{resolveTime:.1f}ms，启动{spawnTime:.1f}ms)", "warning")
+        self.launchFinished.emit(key, path, status, message)
@@ -0,0 +1,27 @@
+__all__ = ["lazyImport"]
+
+import sys
+import importlib
+
+
+# 延迟导入的模块代理，首次访问属性时才真正导入
+class _LazyModule:
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def __getattr__(self, attr: str):
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            object.__setattr__(self, "_module", module)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str: return f"<lazy module '{self._name}'{'' if self._module is None else ' (loaded)'}>"
+
+
+def lazyImport(name: str):
+    """已导入时直接返回模块，否则返回代理"""
+    return sys.modules.get(name) or _LazyModule(name)
@@ -0,0 +1,115 @@
+__all__ = ["LnkResolver", "LnkTimeout"]
+
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+from lazyImport import lazyImport
+
+pylnk3 = lazyImport("pylnk3")  # 首次解析快捷方式时导入
+
+LnkTimeout = 3.0  # 单个lnk文件的解析超时(秒)，从提交时开始计时
+
+
+# 快捷方式解析服务：后台线程解析，结果按(lnk路径, mtime)缓存
+class LnkResolver:
+    def __init__(self, maxWorkers: int = 4):
+        """
+        使用守护线程，卡住的解析不会阻塞程序退出
+        解析超时的线程被放弃并补充新线程，始终保持maxWorkers个可用线程；被放弃的线程在解析结束后退出
+        """
+        self.maxWorkers = maxWorkers
+        self.hits = 0    # 缓存命中次数
+        self.misses = 0  # 未命中次数
+        self.__lock = threading.Lock()
+        self.__queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.__cache: dict[str, tuple[int, str | None, str]] = {}  # 键 -> (mtime, 目标路径, 错误信息)
+        self.__pending: dict[str, tuple[Future, float]] = {}  # 解析中的键 -> (Future, 截止时间)，同一文件只解析一次
+        self.__running: dict[int, float] = {}  # 工作线程编号 -> 当前解析的开始时间
+        self.__abandoned: set[int] = set()     # 解析超时而被放弃的线程编号
+        self.__nextWorker = 0
+        self.__watching = False  # 超时检查线程是否在运行
+
+        with self.__lock:
+            for _ in range(maxWorkers): self.__startWorker()
+
+    def resolve(self, path: str) -> Future:
+        """返回Future，结果为目标路径；解析失败时为异常，提交后LnkTimeout秒仍未完成时为TimeoutError"""
+        key = os.path.normcase(os.path.normpath(path))
+        with self.__lock:
+            entry = self.__pending.get(key)
+            if entry is not None: return entry[0]
+            future = Future()
+            self.__pending[key] = (future, time.monotonic() + LnkTimeout)
+            if not self.__watching:
+                self.__watching = True
+                threading.Thread(target=self.__watch, name="LnkResolverWatch", daemon=True).start()
+        self.__queue.put((key, path, future))
+        return future
+
+    def __startWorker(self) -> None:
+        """持有锁时调用"""
+        n = self.__nextWorker
+        self.__nextWorker += 1
+        threading.Thread(target=self.__work, args=(n,), name=f"LnkResolver-{n}", daemon=True).start()
+
+    def __work(self, n: int) -> None:
+        while n not in self.__abandoned:
+            key, path, future = self.__queue.get()
+            if future.done(): continue  # 排队期间已超时
+            with self.__lock: self.__running[n] = time.monotonic()
+            try:
+                target, error = self.__parse(key, path)
+                if target is None: self.__settle(key, future, exception=ValueError(error))
+                else: self.__settle(key, future, target)
+            except Exception as e: self.__settle(key, future, exception=e)
+            finally:
+                with self.__lock: self.__running.pop(n, None)
+        with self.__lock: self.__abandoned.discard(n)
+
+    def __settle(self, key: str, future: Future, result: str = None, exception: Exception = None) -> None:
+        """设置结果并移出解析中；已超时的Future不再设置，但结果仍会缓存"""
+        with self.__lock:
+            if self.__pending.get(key, (None,))[0] is future: del self.__pending[key]
+            if future.done(): return
+            if exception is None: future.set_result(result)
+            else: future.set_exception(exception)
+
+    def __watch(self) -> None:
+        """使超过截止时间的Future失败，并替换解析超时的线程；没有等待结果的文件与正常解析中的线程时退出"""
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                for key, (future, deadline) in list(self.__pending.items()):
+                    if now < deadline: continue
+                    del self.__pending[key]
+                    if not future.done(): future.set_exception(TimeoutError(f"解析超过{LnkTimeout}秒"))
+                deadlines = [deadline for _, deadline in self.__pending.values()]
+                for n, started in self.__running.items():
+                    if n in self.__abandoned: continue
+                    if now - started < LnkTimeout:
+                        deadlines.append(started + LnkTimeout)
+                        continue
+                    self.__abandoned.add(n)
+                    self.__startWorker()
+                if not deadlines:
+                    self.__watching = False
+                    return
+                wait = min(deadlines) - now
+            time.sleep(max(0.05, wait))
+
+    def __parse(self, key: str, path: str) -> tuple[str | None, str]:
+        mtime = os.stat(path).st_mtime_ns
+        with self.__lock:
+            cached = self.__cache.get(key)
+            if cached is not None and cached[0] == mtime:
+                self.hits += 1
+                return cached[1], cached[2]
+            self.misses += 1
+
+        try: target, error = pylnk3.parse(path).path, ""
+        except Exception as e: target, error = None, str(e)  # 失败结果同样缓存，避免重复解析损坏的文件
+        with self.__lock: self.__cache[key] = (mtime, target, error)
+        return target, error
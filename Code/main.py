@@ -1,9 +1,8 @@
 import os
 import sys
-import time
-import ctypes.wintypes as wintypes
 
 RecordLog = True  # 记录日志
+LogLevel = "info"  # 低于该级别的日志不记录：debug/info/warning/error
 
 if getattr(sys, 'frozen', False):
     path = os.path.dirname(sys.executable)
@@ -13,75 +12,105 @@ else:
 
 path = os.path.dirname(path)
 LogPath = os.path.join(path, "Cache\\CollapsiblePanel.log")  # 日志路径
+StartupProfilePath = os.path.join(path, "Cache\\startup_profile.log")  # 启动分析记录路径
 
+from asyncLogger import AsyncLogger
+from startupProfiler import StartupProfiler
+from lazyImport import lazyImport
 
-class Logging:
-    def __init__(self):
-        if not RecordLog: return
-        try:
-            self.file = open(LogPath, "a", encoding="utf-8")
-            self.file.write(time.strftime("%Y年%m月%d日 %H:%M:%S\n", time.localtime(time.time())))
-        except Exception as e:
-            self.file = open(LogPath, "w", encoding="utf-8")  # 创建新文件
-            self.file.write(time.strftime("%Y年%m月%d日 %H:%M:%S\n", time.localtime(time.time())))
-            self.write(e, "error")
-
-    def write(self, message: str, type_: str):
-        if not RecordLog: return
-        self.file.write(f"\t[{type_}]: {message}\n")
-
-    def close(self, exit_code: int = 0) -> None:
-        if not RecordLog: return
-        self.write(f"程序退出，退出代码为{exit_code}", "info")
-        self.file.close()
-
+profiler = StartupProfiler(StartupProfilePath)  # 设置环境变量COLLAPSIBLE_PANEL_PROFILE=1启用
+wintypes = lazyImport("ctypes.wintypes")  # 只在Windows下处理本地消息时使用
 
-logging = Logging()
+logging = AsyncLogger(LogPath, LogLevel, RecordLog)  # 写入在后台线程完成，按大小轮转
 
 ConfigPath = os.path.join(path, "Assets\\data\\config.json")           # 配置路径
 IconPathRoot = os.path.join(path, "Assets\\icons")                     # 图标根路径
 QssPathRoot = os.path.join(path, "Assets\\styles")                     # qss根路径
 AppMappingPath = os.path.join(path, "Assets\\data\\app_mapping.json")  # app映射表路径
+AppJournalPath = os.path.join(path, "Assets\\data\\app_mapping.journal")  # app映射表变更日志路径
+IconPackPath = os.path.join(path, "Cache\\icons.pack")                  # 图标缓存数据包路径
+IconIndexPath = os.path.join(path, "Cache\\icons.json")                 # 图标缓存索引路径
+AppUsagePath = os.path.join(path, "Assets\\data\\app_usage.dat")        # 使用统计路径
 
-import json
-import pylnk3
-from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QGridLayout
+from typing import TYPE_CHECKING
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QLayout, QVBoxLayout, QGridLayout
 from PySide6.QtCore import Qt, QRect, QSize, QTimer, QPropertyAnimation, QEasingCurve
 
 from appWidget import AppWidget
+from appView import AppView
+from iconCache import IconCache
+from iconLoader import IconLoader
+from launcher import Launcher
+from pathHealth import PathHealth
+from targetWatcher import TargetWatcher
+from mappingStore import MappingStore
+from usageStore import UsageStore
+from dropPipeline import DropPipeline
+from lnkResolver import LnkResolver
+from configModel import Config
 from controlWidget import ControlWidget
-from settingsWidget import SettingsWidget
+from windowAnimator import WindowAnimator
+from themeManager import ThemeManager
+
+if TYPE_CHECKING: from settingsWidget import SettingsWidget  # 首次展开设置界面时才导入
+
+profiler.mark("imports")
 
 ScreenSize: QSize = None  # 屏幕尺寸
 
 
+# 设置界面创建前代替其中的位置输入框，记录拖动窗口时同步的值
+class PlacementSpinBoxState:
+    __slots__ = ("blocked", "value")
+
+    def __init__(self):
+        self.blocked = False
+        self.value: int = None
+
+    def blockSignals(self, flag: bool) -> bool:
+        blocked, self.blocked = self.blocked, flag
+        return blocked
+
+    def setValue(self, value: int) -> None: self.value = value
+
+    def applyTo(self, spinBox) -> None:
+        """设置界面创建后转交记录的状态，不触发valueChanged"""
+        if self.value is not None:
+            spinBox.blockSignals(True)
+            spinBox.setValue(self.value)
+        spinBox.blockSignals(self.blocked)
+
+
 # 主窗口
 class CollapsiblePanel(QMainWindow):
-    def __init__(self, config: dict):
+    def __init__(self, config: Config):
         super().__init__()
-        # 系统参数
-        try:
-            win_config: dict = config["windows"]
-            self.theme = win_config.get("theme", "dark")
-            if self.theme not in ["dark", "light"]: self.theme = "dark"  # 默认dark
-            self.placement: str | int = win_config.get("placement", "center")
-            self.aniSpeed: int = win_config.get("aniSpeed", 200)
-            self.isTop = win_config.get("isTop", True)
-            self.isLocked = win_config.get("isLocked", False)
-            self.alwaysOnEdge = win_config.get("alwaysOnEdge", False)
-            self.collapseOnOpen = win_config.get("collapseOnOpen", True)  # 打开程序时折叠窗口
-            self.identifyGroups = win_config.get("identifyGroups", [".exe"])
-            # 正常状态窗口参数
-            n_config: dict = config["normal"]
-            self.n_winSize = n_config.get("winSize", [500, 240])
-            self.n_titleIconSize = n_config.get("titleIconSize", 22)
-            self.n_appIconSize = n_config.get("appIconSize", 32)
-            self.n_opacity = n_config.get("opacity", 0.8)
-            # 折叠状态窗口参数
-            c_config = config["collapsible"]
-            self.c_winSize = c_config.get("winSize", [200, 6])
-            self.c_opacity = c_config.get("opacity", 0.6)
-        except Exception as e: raise f"config.json配置'{e}'错误"
+        # 系统参数，已在加载配置时校验
+        self.config = config
+        win_config = config.windows
+        self.theme = win_config.theme
+        self.placement: str | int = win_config.placement
+        self.aniSpeed: int = win_config.aniSpeed
+        self.aniMode: str = win_config.aniMode
+        self.enterDelay: int = win_config.enterDelay  # 鼠标停留多久后展开(ms)
+        self.leaveDelay: int = win_config.leaveDelay  # 鼠标离开多久后折叠(ms)
+        self.isTop = win_config.isTop
+        self.isLocked = win_config.isLocked
+        self.alwaysOnEdge = win_config.alwaysOnEdge
+        self.collapseOnOpen = win_config.collapseOnOpen  # 打开程序时折叠窗口
+        self.identifyGroups = list(win_config.identifyGroups)
+        self.virtualMode = win_config.virtualMode  # 大量应用时使用虚拟列表
+        self.autoOrder = list(win_config.autoOrder)  # 按使用频率与最近使用自动排序的应用栏
+        # 正常状态窗口参数
+        n_config = config.normal
+        self.n_winSize = list(n_config.winSize)
+        self.n_titleIconSize = n_config.titleIconSize
+        self.n_appIconSize = n_config.appIconSize
+        self.n_opacity = n_config.opacity
+        # 折叠状态窗口参数
+        c_config = config.collapsible
+        self.c_winSize = list(c_config.winSize)
+        self.c_opacity = c_config.opacity
         # 变量
         self.winIsExpand = True             # 窗口展开中
         self.settingsIsExpand = False       # 设置界面展开中
@@ -93,13 +122,25 @@ class CollapsiblePanel(QMainWindow):
         self.offset: int = (self.n_winSize[0] - self.c_winSize[0]) // 2  # 正常窗口和折叠窗口的偏移大小
         self.geometriesCache = {"collapsed": QRect(0, 0, 0, 0), "expanded": QRect(0, 0, 0, 0)}  # 各状态geometry的缓存
         # app映射表
-        try:
-            with open(AppMappingPath, "r", encoding="utf-8") as f:
-                self.appMapping = json.load(f)
-        except FileNotFoundError:
-            with open(AppMappingPath, "w", encoding="utf-8") as f:
-                self.appMapping = {"folder": {}, "exec": {}}
-                json.dump(self.appMapping, f)
+        self.mappingStore = MappingStore(AppMappingPath, AppJournalPath, logging)
+        self.itemStore = self.mappingStore.load()
+        profiler.mark("mapping")
+        self.pathIndex = self.itemStore.pathIndex  # 两个应用栏共用的路径索引
+        self.usageStore = UsageStore(AppUsagePath, logging)  # 使用统计，由成功的启动更新
+        self.usageStore.prune({record.id for type_ in self.itemStore.types() for record in self.itemStore.items(type_)})
+        self.lnkResolver = LnkResolver()  # 快捷方式解析服务，拖放与批量导入共用
+        self.dropPipeline = DropPipeline(logging, self)
+        # 主题，启动时解析全部主题
+        self.themeManager = ThemeManager(QssPathRoot, ("dark", "light"), logging, self)
+        self.dialogStyleSheet = ""  # 以主窗口为父窗口的对话框使用的QSS，由__applyTheme设置
+        # 后台图标加载器
+        self.iconCache = IconCache(IconPackPath, IconIndexPath, logging)
+        self.iconLoader = IconLoader(self.iconCache, logging, parent=self)
+        # 后台路径检查与启动服务，检查路径与启动都在后台线程
+        self.pathHealth = PathHealth(self.__mappedPaths, logging, parent=self)
+        self.launcher = Launcher(self.pathHealth, logging, parent=self)
+        # 目标监视，目标被删除、恢复、修改或重命名时增量更新应用项
+        self.targetWatcher = TargetWatcher(logging, self)
         # 主控件
         self.mainWidget = QWidget(self)
         self.mainLayout = QVBoxLayout(self.mainWidget)
@@ -113,14 +154,22 @@ class CollapsiblePanel(QMainWindow):
         # 功能栏
         self.controlWidget = ControlWidget(IconPathRoot, self.n_titleIconSize, self.theme, ScreenSize, self)
         # 设置界面
-        self.settingsWidget = SettingsWidget(ConfigPath, config, ScreenSize, logging, self)
+        self.settingsWidget: "SettingsWidget" = None  # 首次展开时创建
+        self.placementSpinBox = PlacementSpinBoxState()  # 创建后指向设置界面的位置输入框
         # 文件滚动栏
-        self.folderWidget = AppWidget("folder", self.n_appIconSize, self.appMapping, self.collapseOnOpen, self)
+        AppWidgetType = AppView if self.virtualMode else AppWidget
+        self.folderWidget = AppWidgetType(
+            "folder", self.n_appIconSize, self.itemStore, self.collapseOnOpen, self.iconLoader, self.launcher,
+            self.pathHealth, self
+        )
         # 可执行文件滚动栏
-        self.execWidget = AppWidget("exec", self.n_appIconSize, self.appMapping, self.collapseOnOpen, self)
+        self.execWidget = AppWidgetType(
+            "exec", self.n_appIconSize, self.itemStore, self.collapseOnOpen, self.iconLoader, self.launcher,
+            self.pathHealth, self
+        )
         # 动画
-        self.windowsAni = QPropertyAnimation(self, b"geometry")
-        self.settingsAni = QPropertyAnimation(self.settingsWidget, b"maximumHeight")
+        self.windowAnimator = WindowAnimator(self, self.activeWidget, self.aniSpeed, self.aniMode, logging)
+        self.settingsAni: QPropertyAnimation = None
         # 计时器
         if not self.isLocked:
             self.startupAniTimer = QTimer()  # 启动动画计时器
@@ -129,12 +178,20 @@ class CollapsiblePanel(QMainWindow):
             self.startupAniTimer.start(1000)
         else: self.startupAniTimer = None
 
-        self.saveAppMappingTimer = QTimer()  # 保存软件样式表计时器
-        self.saveAppMappingTimer.timeout.connect(self.__saveAppMapping)
-        self.saveAppMappingTimer.setSingleShot(True)
-        self.saveAppMappingTimer.start(5000)
+        self.dwellTimer = QTimer()  # 鼠标进出后的停留计时，期间反向进出会取消
+        self.dwellTimer.timeout.connect(self.__dwellTimeout)
+        self.dwellTimer.setSingleShot(True)
+        self.__dwellExpand = False  # 停留结束后要切换到的状态
+
+        self.geometryUpdateTimer = QTimer()  # 合并几何设置，每帧最多应用一次
+        self.geometryUpdateTimer.timeout.connect(self.__applyUpdates)
+        self.geometryUpdateTimer.setSingleShot(True)
+        self.__pendingUpdates: set[str] = set()
+        self.__updateDepth = 0
+        self.__appliedWinWidth = self.n_winSize[0]  # 上次应用的正常窗口宽度，用于整数位置时的偏移
         # 构建
         self.__init()
+        profiler.mark("widgets")
 
     def nativeEvent(self, eventType, message):
         if os.name == "nt":
@@ -144,6 +201,8 @@ class CollapsiblePanel(QMainWindow):
                     logging.write("系统关机，已自动保存数据", "info")
                     self.close()
                     return True, 1
+                if msg.message == 0x0016 and msg.wParam:  # 会话即将结束，进程随时可能被终止
+                    logging.flush()
         return super().nativeEvent(eventType, message)
 
     def dragEnterEvent(self, event) -> None:
@@ -156,31 +215,8 @@ class CollapsiblePanel(QMainWindow):
         else: event.ignore()
 
     def dropEvent(self, event) -> bool:
-        """处理放下事件"""
-        mime = event.mimeData()
-        for url in mime.urls():
-            path = url.toLocalFile()
-            if not path: continue
-            if path in self.folderWidget.paths + self.execWidget.paths: continue  # 已存在
-
-            if path.lower().endswith(".lnk"):
-                try:
-                    targetPath = pylnk3.parse(path).path
-                except Exception as e:
-                    logging.write(f"提取路径:‘{path}'的lnk文件的目标位置失败，错误信息：{e}", "warning")
-                    # 添加快捷方式到 folder
-                    self.addItem("folder", self.folderWidget.getAppName(path), path)
-                    return
-                if targetPath in self.folderWidget.paths: continue
-                if os.path.isdir(targetPath):
-                    self.addItem("folder", self.folderWidget.getAppName(path), targetPath)
-                else:
-                    self.addItem("exec", self.execWidget.getAppName(path), targetPath)
-                continue
-            elif os.path.isdir(path):
-                self.addItem("folder", self.folderWidget.getAppName(path), path)
-            elif path.lower().endswith(tuple(self.identifyGroups)):
-                self.addItem("exec", self.execWidget.getAppName(path), path)
+        """处理放下事件，文件系统与lnk解析在线程池中完成后一次性添加"""
+        self.dropPipeline.start(event.mimeData().urls(), self.identifyGroups)
 
     def enterEvent(self, event) -> None:
         super().enterEvent(event)
@@ -189,28 +225,35 @@ class CollapsiblePanel(QMainWindow):
             self.startupAniTimer = None
             return
 
-        if self.winIsExpand or self.__isProhibitAni(): return
-        self.expandWindowsFromSystem()
+        self.__requestWindowsState(True)
+
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        profiler.mark("firstPaint")
 
     def leaveEvent(self, event) -> None:
         super().leaveEvent(event)
 
-        # 锁定、拖拽状态与有弹窗或本就折叠状态时不折叠
-        if not self.winIsExpand or self.__isProhibitAni(): return
-        self.collapseWindowsFromSystem()
+        self.__requestWindowsState(False)
 
     def close(self) -> None:
         super().close()
         if self.placement == "top":
-            self.settingsWidget.newConfig["windows"]["placement"] = self.pos().x()
-
-        self.settingsWidget.writeConfig()
-        self.__saveAppMapping()
+            self.config.windows.placement = self.pos().x()
+
+        self.config.write()
+        self.mappingStore.close()
+        self.usageStore.close()
+        self.iconCache.close()
+        if self.launcher.stats.total: logging.write(self.launcher.stats.summary(), "info")
+        profiler.write()
+        logging.flush()
         QApplication.quit()
 
     def __init(self) -> None:
         self.setAcceptDrops(True)
 
+        self.layout().setSizeConstraint(QLayout.SizeConstraint.SetNoConstraint)  # 折叠动画中操作区仍可见，不能限制最小尺寸
         self.mainLayout.setContentsMargins(0, 0, 0, 0)
         self.mainLayout.setSpacing(0)
         self.activeLayout.setContentsMargins(5, 5, 5, 5)
@@ -223,20 +266,20 @@ class CollapsiblePanel(QMainWindow):
         self.mainLayout.addWidget(self.activeWidget, 1)
 
         self.activeLayout.addWidget(self.controlWidget, 0, 0, 1, 2, alignment=Qt.AlignmentFlag.AlignTop)
-        self.activeLayout.addWidget(self.settingsWidget, 1, 0, 1, 2)
         self.activeLayout.addWidget(self.folderWidget, 2, 0, 1, 1)
         self.activeLayout.addWidget(self.execWidget, 2, 1, 1, 1)
 
         self.activeLayout.setRowStretch(2, 1)
 
         self.monitorWidget.hide()
-        self.settingsWidget.hide()
 
         self.__init_monitorWidget()
         self.__init_ani()
 
+        self.beginUpdate()
         self.setWindowsSize("normal", 0, self.n_winSize[0])
         self.setWindowsSize("normal", 1, self.n_winSize[1])
+        self.endUpdate()
 
         self.setWindowFlags(Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint)
         self.setWindowsTop(self.isTop)
@@ -256,60 +299,139 @@ class CollapsiblePanel(QMainWindow):
         self.monitorWidget.setFixedSize(self.c_winSize[0], self.c_winSize[1])
 
     def __init_ani(self) -> None:
-        self.windowsAni.setDuration(self.aniSpeed)
-        self.windowsAni.setEasingCurve(QEasingCurve.Type.OutCurve)
-
-        self.settingsAni.setDuration(self.aniSpeed)
-        self.settingsAni.setEasingCurve(QEasingCurve.Type.OutCurve)
+        self.windowAnimator.settled.connect(self.__windowsSettled)
+        self.themeManager.themeReloaded.connect(self.__themeReloaded)
+        # 快照模式下，以下变化会使缓存的操作区快照作废
+        self.iconLoader.iconLoaded.connect(self.windowAnimator.invalidateSnapshot)
+        self.folderWidget.verticalScrollBar().valueChanged.connect(self.windowAnimator.invalidateSnapshot)
+        self.execWidget.verticalScrollBar().valueChanged.connect(self.windowAnimator.invalidateSnapshot)
+        self.folderWidget.populated.connect(self.__itemsPopulated)
+        self.execWidget.populated.connect(self.__itemsPopulated)
+        self.__itemsPopulated()  # 应用项较少时创建期间已全部完成
+        self.pathHealth.start()  # 首次扫描延迟到启动完成之后
+        self.pathHealth.healthChanged.connect(self.__pathHealthChanged)
+        self.targetWatcher.targetChanged.connect(self.__targetChanged)
+        self.targetWatcher.addTargets(self.__mappedPaths())
+        self.launcher.launchFinished.connect(self.__launchFinished)
+
+    def __itemsPopulated(self) -> None:
+        """两侧启动时的应用项都创建完成后记录耗时"""
+        self.windowAnimator.invalidateSnapshot()
+        if not (self.folderWidget.isPopulated and self.execWidget.isPopulated): return
+        profiler.mark("populated")
+        self.__writeProfile()
+
+    def __mappedPaths(self) -> list[str]:
+        return [record.path for type_ in self.itemStore.types() for record in self.itemStore.items(type_)]
+
+    def __pathHealthChanged(self, path: str, stale: bool) -> None:
+        if not stale: self.targetWatcher.refresh(path)  # 所在目录可能曾被删除，已不在监视中
+
+    def __targetChanged(self, kind: str, path: str, newPath: str) -> None:
+        """目标变化后只更新对应的应用项"""
+        record = self.itemStore.findByPath(path)
+        if record is None: return
+        widget = self.folderWidget if record.type == "folder" else self.execWidget
+        if kind == "renamed" and newPath not in self.pathIndex:
+            # 名称与原文件名一致时随之更新，否则保留(如来自快捷方式的名称)
+            name = AppWidget.getAppName(newPath) if record.name == AppWidget.getAppName(path) else record.name
+            self.mappingStore.apply([("rename", record.id, name, newPath)])
+            self.pathHealth.record(newPath, True)
+            self.iconCache.invalidate(path)
+            widget.renameItem(record.id, name, newPath)
+        elif kind in ("deleted", "renamed"): self.pathHealth.record(path, False)
+        else:  # 恢复或修改，图标可能已改变
+            self.pathHealth.record(path, True)
+            self.iconCache.invalidate(path)
+            widget.reloadIcon(record.id)
+        self.windowAnimator.invalidateSnapshot()
+
+    def __launchFinished(self, itemId: int, path: str, status: str, message: str) -> None:
+        """成功启动应用项本身时计入使用统计，打开所在位置不计入"""
+        record = self.itemStore.get(itemId)
+        if status != "ok" or record is None or record.path != path: return
+        self.usageStore.record(itemId)
+        if record.type in self.autoOrder: self.__applyUsageOrder(record.type)
+
+    def __applyUsageOrder(self, type_: str) -> None:
+        """按使用统计排序，只移动位置不对的项；启动后通常只有被启动的项前移"""
+        order = [record.id for record in self.itemStore.items(type_)]
+        moves = []
+        for index, itemId in enumerate(self.usageStore.rank(order)):
+            if order[index] == itemId: continue
+            order.remove(itemId)
+            order.insert(index, itemId)
+            moves.append(("move", itemId, index))
+        if not moves: return
+        self.mappingStore.apply(moves)
+        (self.folderWidget if type_ == "folder" else self.execWidget).moveItems([op[1:] for op in moves])
+        self.windowAnimator.invalidateSnapshot()
+
+    @staticmethod
+    def __writeProfile() -> None:
+        """首次折叠与应用项创建完成的先后不定，两者都记录后再写入"""
+        if profiler.has("firstCollapse") and profiler.has("populated"): profiler.write()
 
     def switchTheme(self, theme: str) -> None:
         if self.firstStart: self.firstStart = False
         elif theme == self.theme: return
 
-        with open(f"{QssPathRoot}\\{theme}.qss", "r", encoding="utf-8") as f:
-            self.setStyleSheet(f.read())
+        self.__applyTheme(theme)
         self.controlWidget.switchTheme(theme)
         self.theme = theme
-
-    def addItem(self, type_: str, name: str, path: str) -> None:
-        if type_ == "folder": self.folderWidget.addItem(name, path)
-        elif type_ == "exec": self.execWidget.addItem(name, path)
-
-        self.appMapping[type_][name] = path
-        self.saveAppMappingTimer.start()
-
-    def delItem(self, type_: str, name: str) -> None:
-        if type_ not in ["folder", "exec"]: return
-        del self.appMapping[type_][name]
-        self.saveAppMappingTimer.start()
+        self.windowAnimator.invalidateSnapshot()
+
+    def addItem(self, type_: str, name: str, path: str) -> None: self.addItems([(type_, name, path)])
+
+    def addItems(self, items: list[tuple[str, str, str]]) -> None:
+        """批量添加(类型, 名称, 路径)，跳过已存在的路径，只重新布局一次并只写入一次日志"""
+        grouped, ops, keys = {"folder": [], "exec": []}, [], set()
+        for type_, name, path in items:
+            if type_ not in grouped or path in self.pathIndex: continue
+            key = self.pathIndex.normalize(path)
+            if key in keys: continue
+            keys.add(key)
+            ops.append(("add", type_, name, path))
+
+        if not ops: return
+        for record in self.mappingStore.apply(ops): grouped[record.type].append((record.id, record.name, record.path))
+        if grouped["folder"]: self.folderWidget.addItems(grouped["folder"])
+        if grouped["exec"]: self.execWidget.addItems(grouped["exec"])
+        self.targetWatcher.addTargets([path for items in grouped.values() for _, _, path in items])
+        self.windowAnimator.invalidateSnapshot()
+
+    def delItem(self, itemId: int) -> None:
+        record = self.itemStore.get(itemId)
+        self.mappingStore.apply([("del", itemId)])
+        self.usageStore.remove(itemId)
+        if record is not None: self.targetWatcher.removeTarget(record.path)
+        self.windowAnimator.invalidateSnapshot()
 
     def clearItems(self, type_: str) -> None:
         if type_ not in ["folder", "exec"]: return
-        self.appMapping[type_] = {}
-        self.saveAppMappingTimer.start()
-
-    def swapItems(self, type_: str, name1: str, name2: str) -> None:
-        def swapKeys(d, key1, key2) -> dict:  # 交换键的位置
-            if key1 in d and key2 in d:
-                keys = list(d.keys())
-                idx1, idx2 = keys.index(key1), keys.index(key2)
-                keys[idx1], keys[idx2] = keys[idx2], keys[idx1]
-                return {k: d[k] for k in keys}
-            return d.copy()
-        self.appMapping[type_] = swapKeys(self.appMapping[type_], name1, name2)
-        self.saveAppMappingTimer.start()
+        records = self.itemStore.items(type_)
+        self.mappingStore.apply([("clear", type_)])
+        for record in records:
+            self.usageStore.remove(record.id)
+            self.targetWatcher.removeTarget(record.path)
+        self.windowAnimator.invalidateSnapshot()
+
+    def swapItems(self, itemId1: int, itemId2: int) -> None:
+        self.mappingStore.apply([("swap", itemId1, itemId2)])
+        self.windowAnimator.invalidateSnapshot()
 
     def collapseWindowsFromSystem(self) -> None:
-        """由系统折叠窗口"""
-        self.windowsAni.setStartValue(self.geometriesCache["expanded"])
-        self.windowsAni.setEndValue(self.geometriesCache["collapsed"])
-        self.windowsAni.setDuration(self.aniSpeed)
-        self.windowsAni.start()
+        """由系统折叠窗口，展开途中调用时从当前位置反转"""
+        self.dwellTimer.stop()
+        if self.settingsIsExpand: self.windowAnimator.invalidateSnapshot()  # 设置界面内容变化频繁，不缓存
+        if not self.windowAnimator.animateTo(
+            False, self.geometriesCache["collapsed"], self.geometriesCache["expanded"]
+        ): return
 
-        self.activeWidget.hide()
-        self.monitorWidget.show()
         self.winIsExpand = False
         self.setWindowOpacity(self.c_opacity)
+        profiler.mark("firstCollapse")
+        self.__writeProfile()
 
     def collapseWindowsFromUser(self) -> None:
         self.isCollapsibleFromUser = self.isLocked
@@ -317,24 +439,23 @@ class CollapsiblePanel(QMainWindow):
         self.collapseWindowsFromSystem()
 
     def expandWindowsFromSystem(self) -> None:
-        """由系统展开窗口"""
-        self.windowsAni.setStartValue(self.geometriesCache["collapsed"])
-        self.windowsAni.setEndValue(self.geometriesCache["expanded"])
-        self.windowsAni.setDuration(self.aniSpeed)
-        self.windowsAni.start()
-
-        # 不是设置界面，隐藏monitorWidget
-        if not self.settingsIsExpand: self.monitorWidget.hide()
+        """由系统展开窗口，折叠途中调用时从当前位置反转"""
+        self.dwellTimer.stop()
+        if not self.windowAnimator.animateTo(
+            True, self.geometriesCache["expanded"], self.geometriesCache["collapsed"]
+        ): return
+
         # 上次窗口折叠是因为用户手动点击
         if self.isCollapsibleFromUser:
             self.controlWidget.setLock(self.isCollapsibleFromUser)
             self.isCollapsibleFromUser = False
 
-        self.activeWidget.show()
         self.winIsExpand = True
         self.setWindowOpacity(self.n_opacity)
 
     def collapseSettings(self) -> None:
+        if self.settingsWidget is None: return
+
         def __finished():
             self.settingsWidget.hide()
             self.folderWidget.show()
@@ -352,6 +473,7 @@ class CollapsiblePanel(QMainWindow):
         self.settingsIsExpand = False
 
     def expandSettings(self) -> None:
+        if self.settingsWidget is None: self.__buildSettings()
         self.settingsAni.setStartValue(0)
         self.settingsAni.setEndValue(self.n_winSize[1] - self.n_titleIconSize)
 
@@ -374,47 +496,55 @@ class CollapsiblePanel(QMainWindow):
         if type_1 == "add":   self.identifyGroups.append(type_2)
         elif type_1 == "del": self.identifyGroups.remove(type_2)
 
-    def setAniSpeed(self, value: int) -> None: self.aniSpeed = value
+    def setAniSpeed(self, value: int) -> None: self.aniSpeed = self.windowAnimator.duration = value
+    def setAniMode(self, mode: str) -> None: self.aniMode = self.windowAnimator.mode = mode
+    def setEnterDelay(self, value: int) -> None: self.enterDelay = value
+    def setLeaveDelay(self, value: int) -> None: self.leaveDelay = value
     def setAlwaysOnEdge(self, state: bool) -> None: self.alwaysOnEdge = state
     def setHasDraggingWidget(self, flag: bool) -> None: self.hasDraggingWidget = flag
     def setHasActivePopup(self, flag: bool) -> None: self.hasActivePopup = flag
-    def setNTitleIconSize(self, titleIconSize: int) -> None: self.controlWidget.setNTitleIconSize(titleIconSize)
     def setLock(self, flag: bool) -> None: self.isLocked = flag
-    def setPlacementSpinBoxBlockSig(self, flag: bool) -> None: self.settingsWidget.placementSetEdit.blockSignals(flag)
-    def setPlacementSpinBoxValue(self, value: int) -> None: self.settingsWidget.placementSetEdit.setValue(value)
+    def setPlacementSpinBoxBlockSig(self, flag: bool) -> None: self.placementSpinBox.blockSignals(flag)
+    def setPlacementSpinBoxValue(self, value: int) -> None: self.placementSpinBox.setValue(value)
+
+    def setAutoOrder(self, type_: str, flag: bool) -> None:
+        """开启时立即按使用统计排序一次"""
+        if flag == (type_ in self.autoOrder): return
+        if flag: self.autoOrder.append(type_)
+        else: self.autoOrder.remove(type_)
+        self.config.windows.autoOrder = [i for i in ("folder", "exec") if i in self.autoOrder]
+        if flag: self.__applyUsageOrder(type_)
 
     def setCollapseOnOpen(self, flag: bool) -> None:
         self.folderWidget.collapseOnOpen = flag
         self.execWidget.collapseOnOpen = flag
         # self.collapseOnOpen = flag
 
+    def beginUpdate(self) -> None:
+        """开始批量设置，与endUpdate成对调用，期间的设置在endUpdate时一次应用"""
+        self.__updateDepth += 1
+
+    def endUpdate(self) -> None:
+        self.__updateDepth -= 1
+        if self.__updateDepth == 0 and self.__pendingUpdates: self.__applyUpdates()
+
+    def setNTitleIconSize(self, titleIconSize: int) -> None:
+        self.n_titleIconSize = titleIconSize
+        self.__requestUpdate("titleIconSize")
+
     def setNAppIconSize(self, appIconSize: int) -> None:
-        self.folderWidget.setNAppIconSize(appIconSize)
-        self.execWidget.setNAppIconSize(appIconSize)
-        # self.n_appIconSize = appIconSize
+        self.n_appIconSize = appIconSize
+        self.__requestUpdate("appIconSize")
 
     def setOpacity(self, arg_1: str, value: float) -> None:
-        if arg_1 == "normal":
-            self.n_opacity = value
-            self.setWindowOpacity(self.n_opacity)
-        elif arg_1 == "collapsible":
-            self.c_opacity = value
-            self.monitorWidget.setWindowOpacity(self.c_opacity)
+        if arg_1 == "normal": self.n_opacity = value
+        elif arg_1 == "collapsible": self.c_opacity = value
+        self.__requestUpdate(f"{arg_1}Opacity")
 
     def setPlacement(self, placement: str | int) -> None:
-        """设置方向，y轴总是为0，参数：top, left, center, right"""
-        if self.winIsExpand: winSize = self.n_winSize
-        else: winSize = self.c_winSize
-
-        if isinstance(placement, str):
-            if placement == "top": self.move(self.pos().x(), 0)
-            elif placement == "left": self.move(0, 0)
-            elif placement == "center": self.move(ScreenSize.width() / 2 - winSize[0] / 2, 0)
-            elif placement == "right": self.move(ScreenSize.width() - winSize[0], 0)
-        else: self.move(placement, 0)
-
+        """设置方向，y轴总是为0，参数：top, left, center, right或x坐标"""
         self.placement = placement
-        self.updateGeometriesState()
+        self.__requestUpdate("placement")
 
     def setWindowsSize(self, arg_1: str, arg_2: int, value: int) -> None:
         """
@@ -423,26 +553,10 @@ class CollapsiblePanel(QMainWindow):
         :param arg_2: 0: width / 1: height
         :param value: 值
         """
-        lastValue: int
-        if arg_1 == "normal":
-            lastValue = self.n_winSize[arg_2]
-            self.n_winSize[arg_2] = value
-            if self.winIsExpand:
-                self.resize(self.n_winSize[0], self.n_winSize[1])
-        elif arg_1 == "collapsible":
-            lastValue = self.n_winSize[arg_2]
-            self.c_winSize[arg_2] = value
-            self.monitorWidget.setFixedSize(self.c_winSize[0], self.c_winSize[1])
-        else: raise "arg_1为未知参数"
-
-        self.offset: int = (self.n_winSize[0] - self.c_winSize[0]) // 2
-        if isinstance(self.placement, int):
-            if self.firstStart: self.setPlacement(self.placement)  # 初始启动，直接设置初始位置
-            else: self.move(self.pos().x() - (value - lastValue), 0)  # 偏移窗口
-        elif isinstance(self.placement, str):
-            self.setPlacement(self.placement)
-
-        self.updateGeometriesState()
+        if arg_1 == "normal": self.n_winSize[arg_2] = value
+        elif arg_1 == "collapsible": self.c_winSize[arg_2] = value
+        else: raise ValueError("arg_1为未知参数")
+        self.__requestUpdate(f"{arg_1}Size")
 
     def setWindowsTop(self, state: bool = None) -> None:
         """设置置顶，如果state是None，则取反"""
@@ -456,19 +570,114 @@ class CollapsiblePanel(QMainWindow):
 
     def updateGeometriesState(self) -> None:
         """更新各状态的geometry"""
-        expanded_x = self.pos().x() - (0 if self.winIsExpand else self.offset)
-        collapsed_x = self.pos().x() + (self.offset if self.winIsExpand else 0)
+        isExpanded = self.__hasExpandedGeometry()
+        expanded_x = self.pos().x() - (0 if isExpanded else self.offset)
+        collapsed_x = self.pos().x() + (self.offset if isExpanded else 0)
 
         self.geometriesCache.update({
             "expanded": QRect(expanded_x, 0, self.n_winSize[0], self.n_winSize[1]),
             "collapsed": QRect(collapsed_x, 0, self.c_winSize[0], self.c_winSize[1])
         })
 
+    def __buildSettings(self) -> None:
+        """创建设置界面，多数用户很少打开，因此不在启动时创建"""
+        from settingsWidget import SettingsWidget
+        self.settingsWidget = SettingsWidget(self.config, ScreenSize, logging, self)
+        self.settingsWidget.setMaximumHeight(self.n_winSize[1] - self.n_titleIconSize)
+        self.settingsWidget.setStyleSheet(self.themeManager.theme(self.theme).styleSheet)
+        self.settingsWidget.hide()
+        self.activeLayout.addWidget(self.settingsWidget, 1, 0, 1, 2)
+
+        self.settingsAni = QPropertyAnimation(self.settingsWidget, b"maximumHeight")
+        self.settingsAni.setEasingCurve(QEasingCurve.Type.OutCurve)
+
+        self.placementSpinBox.applyTo(self.settingsWidget.placementSetEdit)
+        self.placementSpinBox = self.settingsWidget.placementSetEdit
+
+    def __requestUpdate(self, key: str) -> None:
+        self.__pendingUpdates.add(key)
+        if self.__updateDepth or self.geometryUpdateTimer.isActive(): return
+        screen = self.screen()
+        refreshRate = screen.refreshRate() if screen is not None else 60
+        self.geometryUpdateTimer.start(max(1, round(1000 / (refreshRate or 60))))
+
+    def __applyUpdates(self) -> None:
+        """应用合并后的设置，每种设置只应用最新值"""
+        self.geometryUpdateTimer.stop()
+        pending, self.__pendingUpdates = self.__pendingUpdates, set()
+        self.windowAnimator.invalidateSnapshot()
+
+        if "normalSize" in pending and self.__hasExpandedGeometry(): self.resize(self.n_winSize[0], self.n_winSize[1])
+        if "collapsibleSize" in pending: self.monitorWidget.setFixedSize(self.c_winSize[0], self.c_winSize[1])
+        if pending & {"normalSize", "collapsibleSize", "placement"}:
+            self.offset: int = (self.n_winSize[0] - self.c_winSize[0]) // 2
+            if isinstance(self.placement, int) and not self.firstStart and "placement" not in pending:
+                self.move(self.pos().x() - (self.n_winSize[0] - self.__appliedWinWidth), 0)  # 偏移窗口
+            else: self.__applyPlacement()
+            self.__appliedWinWidth = self.n_winSize[0]
+            self.updateGeometriesState()
+        if pending & {"normalSize", "titleIconSize"} and self.settingsWidget is not None:
+            self.settingsWidget.setMaximumHeight(self.n_winSize[1] - self.n_titleIconSize)
+        if "titleIconSize" in pending: self.controlWidget.setNTitleIconSize(self.n_titleIconSize)
+        if "appIconSize" in pending:
+            self.folderWidget.setNAppIconSize(self.n_appIconSize)
+            self.execWidget.setNAppIconSize(self.n_appIconSize)
+        if "normalOpacity" in pending: self.setWindowOpacity(self.n_opacity)
+        if "collapsibleOpacity" in pending: self.monitorWidget.setWindowOpacity(self.c_opacity)
+
+    def __applyPlacement(self) -> None:
+        winSize = self.n_winSize if self.__hasExpandedGeometry() else self.c_winSize
+        placement = self.placement
+        if isinstance(placement, str):
+            if placement == "top": self.move(self.pos().x(), 0)
+            elif placement == "left": self.move(0, 0)
+            elif placement == "center": self.move(ScreenSize.width() / 2 - winSize[0] / 2, 0)
+            elif placement == "right": self.move(ScreenSize.width() - winSize[0], 0)
+        else: self.move(placement, 0)
+
+    def __applyTheme(self, name: str) -> None:
+        """QSS只作用于功能栏、监视栏与设置界面，应用项区域使用调色板，对话框在创建时设置对话框规则"""
+        theme = self.themeManager.theme(name)
+        self.setPalette(theme.palette)
+        QApplication.setPalette(theme.palette)  # 对话框不继承窗口的调色板
+        self.dialogStyleSheet = theme.dialogStyleSheet
+        for widget in (self.monitorWidget, self.controlWidget, self.settingsWidget):
+            if widget is not None: widget.setStyleSheet(theme.styleSheet)
+        self.folderWidget.applyTheme(theme)
+        self.execWidget.applyTheme(theme)
+
+    def __themeReloaded(self, name: str) -> None:
+        if name != self.theme: return
+        self.__applyTheme(name)
+        self.windowAnimator.invalidateSnapshot()
+
     def __isProhibitAni(self) -> bool: return self.isLocked or self.hasDraggingWidget or self.hasActivePopup
 
-    def __saveAppMapping(self) -> None:
-        with open(AppMappingPath, "w", encoding="utf-8") as f:
-            json.dump(self.appMapping, f, ensure_ascii=False, indent=4)
+    def __hasExpandedGeometry(self) -> bool:
+        """遮罩模式下折叠后窗口仍是展开时的大小与位置"""
+        return self.winIsExpand or self.windowAnimator.keepsGeometry
+
+    def __requestWindowsState(self, expand: bool) -> None:
+        """鼠标进出后停留enterDelay/leaveDelay再切换，掠过边缘不会触发动画"""
+        self.dwellTimer.stop()
+        # 锁定、拖拽状态与有弹窗或本就处于该状态时不切换
+        if expand == self.winIsExpand or self.__isProhibitAni(): return
+        self.__dwellExpand = expand
+        delay = self.enterDelay if expand else self.leaveDelay
+        if delay: self.dwellTimer.start(delay)
+        else: self.__dwellTimeout()
+
+    def __dwellTimeout(self) -> None:
+        if self.__dwellExpand == self.winIsExpand or self.__isProhibitAni(): return
+        if self.__dwellExpand: self.expandWindowsFromSystem()
+        else: self.collapseWindowsFromSystem()
+
+    def __windowsSettled(self, expanded: bool) -> None:
+        """动画结束后才切换监视栏可见性，操作区的可见性由windowAnimator管理"""
+        if expanded:
+            # 不是设置界面，隐藏monitorWidget
+            if not self.settingsIsExpand: self.monitorWidget.hide()
+        else: self.monitorWidget.show()
 
     def __startupAni(self) -> None:
         self.startupAniTimer = None
@@ -480,8 +689,8 @@ if __name__ == '__main__':
     ScreenSize = app.primaryScreen().size()
     # 读取配置
     try:
-        with open(ConfigPath, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = Config.load(ConfigPath, logging)
+        profiler.mark("config")
     except Exception as e:
         logging.write(f"加载config.json数据发生错误：{e}", "error")
         logging.close(1)
@@ -0,0 +1,169 @@
+__all__ = ["MappingStore"]
+
+import os
+import json
+import time
+import shutil
+import threading
+
+from itemStore import ItemStore, ItemRecord
+
+CompactThreshold = 64 * 1024  # 日志超过该大小(字节)时在后台合并为快照
+
+
+# app映射表存储：快照 + 追加写入的变更日志
+class MappingStore:
+    def __init__(self, snapshotPath: str, journalPath: str, logging, compactThreshold: int = CompactThreshold):
+        """
+        :param snapshotPath: 快照路径，即app_mapping.json，额外记录已合并的最大序号"seq"
+        :param journalPath:  日志路径，每行一条变更记录，序号不大于快照序号的记录在重放时跳过
+        """
+        self.snapshotPath = snapshotPath
+        self.journalPath = journalPath
+        self.logging = logging
+        self.compactThreshold = compactThreshold
+        self.items = ItemStore()
+
+        self.__seq = 0
+        self.__journal = None
+        self.__compactor: threading.Thread = None
+
+    def load(self) -> ItemStore:
+        """
+        读取快照并重放日志，返回项存储，之后的修改须通过apply进行
+        快照损坏时复制一份备份后抛出异常，不继续加载，避免之后的合并用不完整的数据覆盖快照
+        """
+        try:
+            with open(self.snapshotPath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            snapshotSeq = data.pop("seq", 0)
+            self.items = ItemStore.fromSnapshot(data)
+        except FileNotFoundError: snapshotSeq = 0
+        except Exception as e:
+            backupPath = f"{self.snapshotPath}.corrupt-{time.strftime('%Y%m%d%H%M%S')}"
+            try: shutil.copy2(self.snapshotPath, backupPath)
+            except OSError as copyError: backupPath = f"(备份失败：{copyError})"
+            raise ValueError(f"app映射表快照'{self.snapshotPath}'损坏，已备份到'{backupPath}'，错误信息：{e}") from e
+        self.__seq = snapshotSeq
+
+        for path in (self.__rotatedPath, self.journalPath):  # 合并中断时残留的旧日志先于当前日志重放
+            self.__replay(path, snapshotSeq)
+
+        if not os.path.exists(self.snapshotPath): self.__writeSnapshot(self.items.toSnapshot(), self.__seq)
+        self.__journal = open(self.journalPath, "a", encoding="utf-8")
+        if self.__journal.tell() > self.compactThreshold: self.__compact()
+        return self.items
+
+    def apply(self, ops: list[tuple]) -> list[ItemRecord | None]:
+        """
+        修改项存储并追加到日志，一批变更只写入一次
+        :param ops: ("add", 类型, 名称, 路径) | ("del", ID) | ("clear", 类型) | ("swap", ID1, ID2) | ("move", ID, 下标)
+                    | ("rename", ID, 名称, 路径)
+        :return: 与ops一一对应，"add"为新项，其余为None
+        """
+        lines, results = [], []
+        for op in ops:
+            op, result = self.__apply(op)
+            results.append(result)
+            self.__seq += 1
+            lines.append(json.dumps([self.__seq, *op], ensure_ascii=False) + "\n")
+        if not lines: return results
+        if self.__journal is None or self.__journal.closed:  # 已关闭，退出过程中仍可能有变更
+            self.logging.write(f"app映射表日志已关闭，{len(lines)}条变更未写入", "warning")
+            return results
+        try:
+            self.__journal.write("".join(lines))
+            self.__journal.flush()
+            os.fsync(self.__journal.fileno())
+        except OSError as e:
+            self.logging.write(f"写入app映射表日志失败，错误信息：{e}", "error")
+        if self.__journal.tell() > self.compactThreshold: self.__compact()
+        return results
+
+    def close(self) -> None:
+        """等待进行中的合并并关闭日志"""
+        if self.__compactor is not None: self.__compactor.join()
+        if self.__journal is not None: self.__journal.close()
+
+    @property
+    def __rotatedPath(self) -> str: return self.journalPath + ".old"
+
+    def __apply(self, op: list | tuple) -> tuple[tuple, ItemRecord | None]:
+        """返回写入日志的记录(新增项带上ID)与结果，兼容旧版按名称记录的日志"""
+        kind, items = op[0], self.items
+        if kind == "add":
+            if len(op) == 4:  # 未分配ID
+                record = items.add(op[1], op[2], op[3])
+                return ("add", op[1], record.id, op[2], op[3]), record
+            return tuple(op), items.add(op[1], op[3], op[4], op[2])
+        if kind == "del":
+            if len(op) == 3:  # 旧格式：("del", 类型, 名称)
+                record = items.findByName(op[1], op[2])
+                op = ("del", None if record is None else record.id)
+            items.remove(op[1])
+        elif kind == "clear": items.clear(op[1])
+        elif kind == "swap":
+            if len(op) == 4:  # 旧格式：("swap", 类型, 名称1, 名称2)
+                record1, record2 = items.findByName(op[1], op[2]), items.findByName(op[1], op[3])
+                op = ("swap", record1 and record1.id, record2 and record2.id)
+            items.swap(op[1], op[2])
+        elif kind == "move": items.move(op[1], op[2])
+        elif kind == "rename": items.rename(op[1], op[2], op[3])
+        else: raise ValueError(f"未知的变更类型'{kind}'")
+        return tuple(op), None
+
+    def __replay(self, path: str, snapshotSeq: int) -> None:
+        try:
+            with open(path, "r+b") as f:
+                valid = 0  # 完整记录的结束位置
+                for line in f:
+                    try: record = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError: record = None
+                    if record is None:  # 写入中断导致的残缺记录，只可能是最后一行，截断后才能继续追加
+                        self.logging.write(f"app映射表日志'{path}'末尾记录不完整，已忽略", "warning")
+                        f.truncate(valid)
+                        break
+                    valid += len(line)
+                    if record[0] <= snapshotSeq: continue
+                    try: self.__apply(record[1:])
+                    except Exception as e: self.logging.write(f"重放app映射表日志记录{record}失败，错误信息：{e}", "warning")
+                    self.__seq = max(self.__seq, record[0])
+        except FileNotFoundError: pass
+
+    def __compact(self) -> None:
+        """轮换日志后在后台写入快照，快照写入完成前旧日志保留，任意时刻崩溃都可恢复"""
+        if self.__compactor is not None:
+            if self.__compactor.is_alive(): return
+            self.__compactor.join()
+        try:
+            self.__journal.close()
+            if os.path.exists(self.__rotatedPath):  # 上次合并未完成，本次快照已包含其内容
+                with open(self.__rotatedPath, "a", encoding="utf-8") as old, open(self.journalPath, "r", encoding="utf-8") as cur:
+                    old.write(cur.read())
+                os.remove(self.journalPath)
+            else: os.replace(self.journalPath, self.__rotatedPath)
+        except OSError as e:
+            self.logging.write(f"轮换app映射表日志失败，错误信息：{e}", "warning")
+        self.__journal = open(self.journalPath, "a", encoding="utf-8")
+
+        snapshot, seq = self.items.toSnapshot(), self.__seq  # 在GUI线程复制，后台线程只做IO
+        self.__compactor = threading.Thread(target=self.__compactWorker, args=(snapshot, seq), name="MappingCompactor")
+        self.__compactor.start()
+
+    def __compactWorker(self, snapshot: dict, seq: int) -> None:
+        if not self.__writeSnapshot(snapshot, seq): return
+        try: os.remove(self.__rotatedPath)
+        except OSError: pass
+
+    def __writeSnapshot(self, snapshot: dict, seq: int) -> bool:
+        tmpPath = self.snapshotPath + ".tmp"
+        try:
+            with open(tmpPath, "w", encoding="utf-8") as f:
+                json.dump({"seq": seq, **snapshot}, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmpPath, self.snapshotPath)
+            return True
+        except OSError as e:
+            self.logging.write(f"写入app映射表快照失败，错误信息：{e}", "error")
+            return False
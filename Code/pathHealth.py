@@ -0,0 +1,137 @@
+__all__ = ["PathHealth"]
+
+import os
+import time
+import ctypes
+import threading
+from typing import Callable
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from pathIndex import PathIndex
+
+ProbeTimeout = 2.0     # 单次检查的超时(秒)，超时视为无法访问
+HealthTTL = 300.0      # 检查结果的有效期(秒)，不存在、无法访问的结果同样缓存
+ScanDelay = 10000      # 启动后首次扫描的延迟(ms)，避开启动时的图标加载
+ScanInterval = 300000  # 扫描间隔(ms)，只检查结果已过期的路径
+DriveRemote = 4        # GetDriveTypeW的DRIVE_REMOTE，映射的网络驱动器
+
+
+class _HealthSignals(QObject):
+    probed = Signal(str, object)  # 路径，是否存在(None：超时或所在驱动器无法访问)
+    finished = Signal(int, float)  # 检查数量，耗时(ms)
+
+
+# 路径健康检查：后台低并发地检查所有路径是否存在，结果带有效期缓存
+class PathHealth(QObject):
+    healthChanged = Signal(str, bool)  # 路径，是否失效(不存在或无法访问)；与上次结果不同时发出
+
+    def __init__(self, paths: Callable[[], list[str]], logging, maxWorkers: int = 2, parent: QObject = None):
+        """
+        :param paths:      返回需要检查的所有路径，在GUI线程调用
+        :param maxWorkers: 同时进行的检查数量；超时的检查不再占用名额，网络共享与网络驱动器超时后同一驱动器在本轮不再检查
+        """
+        super().__init__(parent)
+        self.paths = paths
+        self.logging = logging
+        self.maxWorkers = maxWorkers
+        self.timeout = ProbeTimeout
+        self.ttl = HealthTTL
+        self.__results: dict[str, tuple[bool | None, float]] = {}  # 规范化路径 -> (是否存在, 检查时间)
+        self.__scanning = False
+
+        self.__signals = _HealthSignals(self)
+        self.__signals.probed.connect(self.__onProbed)
+        self.__signals.finished.connect(self.__onFinished)
+        self.__scanTimer = QTimer(self)
+        self.__scanTimer.timeout.connect(self.scan)
+
+    def start(self) -> None:
+        self.__scanTimer.start(ScanDelay)
+
+    def lookup(self, path: str) -> bool | None:
+        """有效期内的确定结果，没有时返回None；只有True可以代替实际检查，False可能已过时"""
+        status, checkedAt = self.__results.get(PathIndex.normalize(path), (None, 0.0))
+        if time.monotonic() - checkedAt > self.ttl: return None
+        return status
+
+    def isStale(self, path: str) -> bool:
+        """最近一次结果为不存在或无法访问，不论是否过期"""
+        entry = self.__results.get(PathIndex.normalize(path))
+        return entry is not None and entry[0] is not True
+
+    def record(self, path: str, exists: bool | None) -> None:
+        """记录其他途径得到的结果，如启动时的检查"""
+        key = PathIndex.normalize(path)
+        entry = self.__results.get(key)
+        wasStale = entry is not None and entry[0] is not True
+        self.__results[key] = (exists, time.monotonic())
+        if wasStale != (exists is not True): self.healthChanged.emit(path, exists is not True)
+
+    def scan(self) -> None:
+        """检查所有结果已过期的路径，上一轮未结束时跳过"""
+        self.__scanTimer.start(ScanInterval)
+        if self.__scanning: return
+        now, seen, paths = time.monotonic(), set(), []
+        for path in self.paths():
+            key = PathIndex.normalize(path)
+            if key in seen: continue
+            seen.add(key)
+            if now - self.__results.get(key, (None, 0.0))[1] > self.ttl: paths.append(path)
+        for key in self.__results.keys() - seen: del self.__results[key]  # 已移除的路径
+        if not paths: return
+        self.__scanning = True
+        threading.Thread(target=self.__scan, args=(paths,), name="PathHealth", daemon=True).start()
+
+    def __scan(self, paths: list[str]) -> None:
+        """每个检查一个守护线程，卡在无法访问的网络路径上的线程被放弃，不会阻塞扫描与程序退出"""
+        start = time.perf_counter()
+        pending = list(reversed(paths))
+        running: dict[Future, tuple[str, str | None, float]] = {}  # -> (路径, 网络驱动器, 截止时间)
+        deadDrives: set[str] = set()  # 本轮已有检查超时的网络驱动器
+        remoteDrives: dict[str, bool] = {}
+        while pending or running:
+            while pending and len(running) < self.maxWorkers:
+                path = pending.pop()
+                drive = self.__remoteDrive(path, remoteDrives)
+                if drive in deadDrives:  # 同一网络驱动器已有检查超时
+                    self.__signals.probed.emit(path, None)
+                    continue
+                future = Future()
+                threading.Thread(target=self.__probe, args=(path, future), daemon=True).start()
+                running[future] = (path, drive, time.monotonic() + self.timeout)
+            if not running: continue
+
+            wait(running, timeout=max(0.0, min(deadline for _, _, deadline in running.values()) - time.monotonic()),
+                 return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future, (path, drive, deadline) in list(running.items()):
+                if future.done(): self.__signals.probed.emit(path, future.result())
+                elif now >= deadline:
+                    if drive is not None: deadDrives.add(drive)  # 本地驱动器只记录这一个路径，如硬盘唤醒较慢
+                    self.__signals.probed.emit(path, None)
+                else: continue
+                del running[future]
+        self.__signals.finished.emit(len(paths), (time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    def __remoteDrive(path: str, cache: dict[str, bool]) -> str | None:
+        """UNC共享或映射的网络驱动器返回规范化的驱动器，本地路径返回None"""
+        drive = os.path.splitdrive(path)[0].casefold()
+        if not drive: return None
+        if drive not in cache:
+            if drive.startswith(("\\\\", "//")): cache[drive] = True
+            else: cache[drive] = os.name == "nt" and ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DriveRemote
+        return drive if cache[drive] else None
+
+    @staticmethod
+    def __probe(path: str, future: Future) -> None:
+        try: future.set_result(os.path.exists(path))
+        except Exception: future.set_result(None)
+
+    def __onProbed(self, path: str, exists: bool | None) -> None: self.record(path, exists)
+
+    def __onFinished(self, count: int, elapsed: float) -> None:
+        self.__scanning = False
+        stale = sum(1 for status, _ in self.__results.values() if status is not True)
+        self.logging.write(f"路径检查完成，共{count}个，耗时{elapsed:.1f}ms，失效{stale}个", "info")
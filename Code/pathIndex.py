@@ -0,0 +1,33 @@
+__all__ = ["PathIndex"]
+
+import os
+
+
+# 路径索引：规范化路径 -> 项ID，用于O(1)查重
+class PathIndex:
+    def __init__(self):
+        self.__entries: dict[str, int] = {}
+        self.__aliases: dict[str, str] = {}  # 已解析的lnk路径 -> 目标路径的键
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """统一分隔符与大小写，去掉末尾分隔符"""
+        return os.path.normcase(os.path.normpath(path)).casefold()
+
+    def __contains__(self, path: str) -> bool: return self.find(path) is not None
+    def __len__(self) -> int: return len(self.__entries)
+
+    def find(self, path: str) -> int | None:
+        """返回项ID，lnk路径会按已解析的目标查找"""
+        key = self.normalize(path)
+        entry = self.__entries.get(key)
+        if entry is None and key in self.__aliases: entry = self.__entries.get(self.__aliases[key])
+        return entry
+
+    def add(self, id_: int, path: str) -> None: self.__entries[self.normalize(path)] = id_
+
+    def addAlias(self, lnkPath: str, targetPath: str) -> None:
+        """记录lnk的解析结果，再次拖入同一快捷方式时无需解析"""
+        self.__aliases[self.normalize(lnkPath)] = self.normalize(targetPath)
+
+    def remove(self, path: str) -> None: self.__entries.pop(self.normalize(path), None)
@@ -0,0 +1,44 @@
+__all__ = ["PixmapCache", "pixmapCache"]
+
+from collections import OrderedDict
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QIcon, QPixmap
+
+PixmapCacheBudget = 32 * 1024 * 1024  # 内存预算(字节)，超过后按LRU淘汰
+
+
+# 多分辨率位图缓存，键为(图标键, 大小, 设备像素比, 模式)
+class PixmapCache:
+    def __init__(self, budget: int = PixmapCacheBudget):
+        self.budget = budget
+        self.hits = 0    # 命中次数
+        self.misses = 0  # 未命中次数
+        self.__pixmaps: OrderedDict[tuple[int, int, float, QIcon.Mode], QPixmap] = OrderedDict()
+        self.__cost = 0  # 当前占用(字节)
+
+    def pixmap(self, icon: QIcon, size: int, dpr: float = 1.0, mode: QIcon.Mode = QIcon.Mode.Normal) -> QPixmap:
+        """获取图标在size逻辑像素、dpr设备像素比下的位图，未命中时才光栅化"""
+        key = (icon.cacheKey(), size, dpr, mode)
+        pixmap = self.__pixmaps.get(key)
+        if pixmap is not None:
+            self.__pixmaps.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        pixmap = icon.pixmap(QSize(size, size), dpr, mode)
+        self.__pixmaps[key] = pixmap
+        self.__cost += self.__costOf(pixmap)
+        while self.__cost > self.budget and len(self.__pixmaps) > 1:  # LRU淘汰
+            self.__cost -= self.__costOf(self.__pixmaps.popitem(last=False)[1])
+        return pixmap
+
+    def clear(self) -> None:
+        self.__pixmaps.clear()
+        self.__cost = 0
+
+    @staticmethod
+    def __costOf(pixmap: QPixmap) -> int: return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+pixmapCache = PixmapCache()  # Item、拖动图像与设置界面的示例图标共用
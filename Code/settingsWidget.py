@@ -2,15 +2,18 @@ __all__ = ["SettingsWidget"]
 
 import os
 import sys
-import copy
-import json
-import winreg
 from PySide6.QtWidgets import QApplication, QWidget, QFrame, QMessageBox, QScrollArea, QListWidget
 from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QGridLayout, QStyle, QSizePolicy, QLineEdit
 from PySide6.QtWidgets import QCheckBox, QLabel, QRadioButton, QSpinBox, QButtonGroup, QPushButton, QSpacerItem
 from PySide6.QtCore import QSize, Qt
 
 from declaration import CollapsiblePanel
+from lazyImport import lazyImport
+from configModel import Config
+from pixmapCache import pixmapCache
+from windowAnimator import AniModes
+
+winreg = lazyImport("winreg")  # 只在读写自启动项时导入
 
 
 # 自定义布局
@@ -140,16 +143,14 @@ class AddDependencyWidget(QWidget):
 
 class SettingsWidget(QScrollArea):
     def __init__(
-            self, ConfigPath: str, config: dict,
+            self, config: Config,
             screenSize: QSize, logging, parent: "CollapsiblePanel"
     ):
         super().__init__(parent)
         self.setObjectName("settingsWidget")
         self.setWidgetResizable(True)
         # 参数
-        self.config = copy.deepcopy(config)     # 原配置
-        self.newConfig = copy.deepcopy(config)  # 新配置
-        self.configPath = ConfigPath
+        self.config = config
         self.screenSize = screenSize
         self.logging = logging
         self.parent = parent
@@ -167,7 +168,7 @@ class SettingsWidget(QScrollArea):
         self.__buildLyt()
 
     def hideEvent(self, event) -> None:
-        self.writeConfig()
+        self.config.write()
         super().hideEvent(event)
 
     def __initControl(self):
@@ -180,11 +181,17 @@ class SettingsWidget(QScrollArea):
         )  # 选择
 
         self.aniSpeedSet = QSpinBox()
+        self.aniModeSet: tuple[QRadioButton] = (
+            QRadioButton("实时布局", self), QRadioButton("内容快照", self), QRadioButton("窗口遮罩", self)
+        )  # 与AniModes一一对应
+        self.enterDelaySet = QSpinBox()
+        self.leaveDelaySet = QSpinBox()
         self.isTopSet = QCheckBox("窗口是否置顶", self)
         self.autoStartupSet = QCheckBox("程序自启动", self)
         self.isLockedSet = QCheckBox("启动时锁定窗口", self)
         self.alwaysOnEdgeSet = QCheckBox("窗口永远处于边缘", self)
         self.collapseOnOpenSet = QCheckBox("打开文件夹/应用时折叠窗口", self)
+        self.virtualModeSet = QCheckBox("应用较多时使用虚拟列表（重启生效）", self)
 
         self.n_reset = QPushButton("重置", self)
         self.n_winXSet = QSpinBox()
@@ -200,7 +207,7 @@ class SettingsWidget(QScrollArea):
         self.c_winYSet = QSpinBox()
         self.c_opacitySet = QSpinBox()
 
-        self.addDependencyWidget = AddDependencyWidget(self.config["windows"]["identifyGroups"], self)
+        self.addDependencyWidget = AddDependencyWidget(self.config.windows.identifyGroups, self)
 
     def __buildControl(self):
         """构建控件"""
@@ -210,8 +217,14 @@ class SettingsWidget(QScrollArea):
         btnGroup_2 = QButtonGroup(self)  # 创建组
         for i in self.placementSetRadios: btnGroup_2.addButton(i)
 
-        # 需要先获取窗口宽度
-        self.placementSetEdit.setRange(0, self.screenSize.width() - self.config["normal"]["winSize"][0])
+        btnGroup_3 = QButtonGroup(self)  # 创建组
+        for i in self.aniModeSet: btnGroup_3.addButton(i)
+
+        # 需要先获取窗口宽度，主屏幕左侧有其他屏幕时x坐标可以为负数
+        self.placementSetEdit.setRange(
+            min(0, QApplication.primaryScreen().virtualGeometry().left()),
+            self.screenSize.width() - self.config.normal.winSize[0]
+        )
         self.placementSetEdit.setSingleStep(10)
         self.placementSetEdit.setAlignment(Qt.AlignmentFlag.AlignHCenter)
 
@@ -220,6 +233,12 @@ class SettingsWidget(QScrollArea):
         self.aniSpeedSet.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         self.aniSpeedSet.setSuffix("ms")
 
+        for spinBox in (self.enterDelaySet, self.leaveDelaySet):
+            spinBox.setRange(0, 1000)
+            spinBox.setSingleStep(50)
+            spinBox.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+            spinBox.setSuffix("ms")
+
         # normal
         self.n_winXSet.setRange(100, self.screenSize.width() // 2)
         self.n_winXSet.setSingleStep(10)
@@ -274,10 +293,10 @@ class SettingsWidget(QScrollArea):
         self.c_opacitySet.setSuffix("%")
 
     def __initConfig(self):
-        if self.config["windows"]["theme"] == "dark": self.themeSet[0].setChecked(True)
+        if self.config.windows.theme == "dark": self.themeSet[0].setChecked(True)
         else: self.themeSet[1].setChecked(True)
 
-        placement = self.config["windows"]["placement"]
+        placement = self.config.windows.placement
         if isinstance(placement, str):
             if placement == "center": self.placementSetRadios[1].setChecked(True)
             elif placement == "right": self.placementSetRadios[2].setChecked(True)
@@ -285,23 +304,27 @@ class SettingsWidget(QScrollArea):
         elif isinstance(placement, int or float):
             self.placementSetEdit.setValue(int(placement))
 
-        self.aniSpeedSet.setValue(int(self.config["windows"]["aniSpeed"]))
-        self.isTopSet.setChecked(self.config["windows"]["isTop"])
+        self.aniSpeedSet.setValue(int(self.config.windows.aniSpeed))
+        self.aniModeSet[AniModes.index(self.config.windows.aniMode)].setChecked(True)
+        self.enterDelaySet.setValue(self.config.windows.enterDelay)
+        self.leaveDelaySet.setValue(self.config.windows.leaveDelay)
+        self.isTopSet.setChecked(self.config.windows.isTop)
         self.autoStartupSet.setChecked(self.__isAutoStartup())
-        self.isLockedSet.setChecked(self.config["windows"]["isLocked"])
-        self.alwaysOnEdgeSet.setChecked(self.config["windows"]["alwaysOnEdge"])
-        self.collapseOnOpenSet.setChecked(self.config["windows"]["collapseOnOpen"])
-
-        self.n_winXSet.setValue(self.config["normal"]["winSize"][0])
-        self.n_winYSet.setValue(self.config["normal"]["winSize"][1])
-        self.n_titleIconSizeSet.setValue(self.config["normal"]["titleIconSize"])
-        self.n_appIconSizeSet.setValue(self.config["normal"]["appIconSize"])
-        self.__setDemonstrationItem(self.config["normal"]["appIconSize"])
-        self.n_opacitySet.setValue(self.config["normal"]["opacity"] * 100)
-
-        self.c_winXSet.setValue(self.config["collapsible"]["winSize"][0])
-        self.c_winYSet.setValue(self.config["collapsible"]["winSize"][1])
-        self.c_opacitySet.setValue(self.config["collapsible"]["opacity"] * 100)
+        self.isLockedSet.setChecked(self.config.windows.isLocked)
+        self.alwaysOnEdgeSet.setChecked(self.config.windows.alwaysOnEdge)
+        self.collapseOnOpenSet.setChecked(self.config.windows.collapseOnOpen)
+        self.virtualModeSet.setChecked(self.config.windows.virtualMode)
+
+        self.n_winXSet.setValue(self.config.normal.winSize[0])
+        self.n_winYSet.setValue(self.config.normal.winSize[1])
+        self.n_titleIconSizeSet.setValue(self.config.normal.titleIconSize)
+        self.n_appIconSizeSet.setValue(self.config.normal.appIconSize)
+        self.__setDemonstrationItem(self.config.normal.appIconSize)
+        self.n_opacitySet.setValue(self.config.normal.opacity * 100)
+
+        self.c_winXSet.setValue(self.config.collapsible.winSize[0])
+        self.c_winYSet.setValue(self.config.collapsible.winSize[1])
+        self.c_opacitySet.setValue(self.config.collapsible.opacity * 100)
 
     def __connectControl(self):
         if self.parent is None: return
@@ -315,12 +338,17 @@ class SettingsWidget(QScrollArea):
         self.placementSetRadios[2].clicked.connect(lambda: self.__setPlacement("right"))
 
         self.aniSpeedSet.valueChanged.connect(lambda value: self.__setAniSpeed(value))
+        for radio, mode in zip(self.aniModeSet, AniModes):
+            radio.clicked.connect(lambda checked=False, mode=mode: self.__setAniMode(mode))
+        self.enterDelaySet.valueChanged.connect(lambda value: self.__setEnterDelay(value))
+        self.leaveDelaySet.valueChanged.connect(lambda value: self.__setLeaveDelay(value))
 
         self.isTopSet.toggled.connect(lambda checked: self.__setTop(checked))
         self.autoStartupSet.toggled.connect(self.__setAutoStartup)
         self.isLockedSet.toggled.connect(lambda checked: self.__setLock(checked))
         self.alwaysOnEdgeSet.toggled.connect(lambda checked: self.__setAlwaysOnEdge(checked))
         self.collapseOnOpenSet.toggled.connect(lambda checked: self.__setCollapseOnOpen(checked))
+        self.virtualModeSet.toggled.connect(lambda checked: self.__setVirtualMode(checked))
 
         self.n_reset.clicked.connect(lambda: self.__resetConfig("normal"))
         self.n_winXSet.valueChanged.connect(lambda value: self.__setWinSize("normal", 0, value))
@@ -353,6 +381,16 @@ class SettingsWidget(QScrollArea):
         self.mainLayout.addColWidget(QLabel("动画播放速度"))
         self.mainLayout.addColWidget(self.aniSpeedSet, 2)
         self.mainLayout.addRow()
+        self.mainLayout.addColWidget(QLabel("动画模式"))
+        for radio in self.aniModeSet:
+            self.mainLayout.addColWidget(radio)
+        self.mainLayout.addRow()
+        self.mainLayout.addColWidget(QLabel("展开延迟"))
+        self.mainLayout.addColWidget(self.enterDelaySet, 2)
+        self.mainLayout.addRow()
+        self.mainLayout.addColWidget(QLabel("折叠延迟"))
+        self.mainLayout.addColWidget(self.leaveDelaySet, 2)
+        self.mainLayout.addRow()
         self.mainLayout.addColWidget(self.isTopSet, 2)
         self.mainLayout.addRow()
         self.mainLayout.addColWidget(self.autoStartupSet, 2)
@@ -362,6 +400,8 @@ class SettingsWidget(QScrollArea):
         self.mainLayout.addColWidget(self.alwaysOnEdgeSet, 2)
         self.mainLayout.addRow()
         self.mainLayout.addColWidget(self.collapseOnOpenSet, 2)
+        self.mainLayout.addRow()
+        self.mainLayout.addColWidget(self.virtualModeSet, 3)
 
         self.mainLayout.addTitle("正常窗口设置")
         self.mainLayout.addColWidget(QLabel("窗口宽度"))
@@ -396,21 +436,10 @@ class SettingsWidget(QScrollArea):
         self.mainLayout.addTitle("添加可识别项")
         self.mainLayout.addColWidget(self.addDependencyWidget, 4)
 
-    def writeConfig(self) -> bool:
-        if self.parent is None: return
-        if self.config == self.newConfig: return
-        try:
-            with open(self.configPath, "w", encoding="utf-8") as f:
-                json.dump(self.newConfig, f, indent=4)
-        except Exception as e:
-            self.logging.write(f"写入配置信息错误：{e}", "error")
-            return False
-        self.config = copy.deepcopy(self.newConfig)
-        return True
-
     def changeIdentify(self, type_1: str, type_2: str) -> None:
-        if type_1 == "add":   self.newConfig["windows"]["identifyGroups"].append(type_2)
-        elif type_1 == "del": self.newConfig["windows"]["identifyGroups"].remove(type_2)
+        groups = self.config.windows.identifyGroups
+        if type_1 == "add":   self.config.windows.identifyGroups = groups + [type_2]
+        elif type_1 == "del": self.config.windows.identifyGroups = [i for i in groups if i != type_2]
         self.parent.changeIdentify(type_1, type_2)
 
     @staticmethod
@@ -430,19 +459,31 @@ class SettingsWidget(QScrollArea):
 
     def __setTheme(self, theme: str):
         self.parent.switchTheme(theme)
-        self.newConfig["windows"]["theme"] = theme
+        self.config.windows.theme = theme
 
     def __setPlacement(self, value: int | str):
         self.parent.setPlacement(value)
-        self.newConfig["windows"]["placement"] = value
+        self.config.windows.placement = value
 
     def __setAniSpeed(self, value: int):
         self.parent.setAniSpeed(value)
-        self.newConfig["windows"]["aniSpeed"] = value
+        self.config.windows.aniSpeed = value
+
+    def __setAniMode(self, mode: str):
+        self.parent.setAniMode(mode)
+        self.config.windows.aniMode = mode
+
+    def __setEnterDelay(self, value: int):
+        self.parent.setEnterDelay(value)
+        self.config.windows.enterDelay = value
+
+    def __setLeaveDelay(self, value: int):
+        self.parent.setLeaveDelay(value)
+        self.config.windows.leaveDelay = value
 
     def __setTop(self, state: bool):
         self.parent.setWindowsTop(state)
-        self.newConfig["windows"]["isTop"] = state
+        self.config.windows.isTop = state
 
     def __setAutoStartup(self):
         def set_autostart(state: bool) -> bool:
@@ -479,41 +520,49 @@ class SettingsWidget(QScrollArea):
         if not set_autostart(state):
             self.parent.setHasActivePopup(True)
             QApplication.beep()
-            QMessageBox.information(self.parent, "提示", "设置程序自启动失败，详细请查看日志")
+            msgBox = QMessageBox(
+                QMessageBox.Icon.Information, "提示", "设置程序自启动失败，详细请查看日志",
+                QMessageBox.StandardButton.Ok, self.parent
+            )
+            msgBox.setStyleSheet(self.parent.dialogStyleSheet)
+            msgBox.exec()
             self.parent.setHasActivePopup(False)
             self.autoStartupSet.setChecked(False)
             self.autoStartupSet.setEnabled(False)
-            self.newConfig["windows"]["autoStartup"] = False
+            self.config.windows.autoStartup = False
 
     def __setLock(self, state: bool):
         self.parent.setLock(state)
-        self.newConfig["windows"]["isLocked"] = state
+        self.config.windows.isLocked = state
 
     def __setAlwaysOnEdge(self, state: bool):
         self.parent.setAlwaysOnEdge(state)
-        self.newConfig["windows"]["alwaysOnEdge"] = state
+        self.config.windows.alwaysOnEdge = state
 
     def __setCollapseOnOpen(self, state: bool):
         self.parent.setCollapseOnOpen(state)
-        self.newConfig["windows"]["collapseOnOpen"] = state
+        self.config.windows.collapseOnOpen = state
+
+    def __setVirtualMode(self, state: bool):
+        self.config.windows.virtualMode = state  # 重启后生效
 
     def __setWinSize(self, arg_1: str, arg_2: int, value: int):
         self.parent.setWindowsSize(arg_1, arg_2, value)
-        self.newConfig[arg_1]["winSize"][arg_2] = value
-        if arg_1 == "normal":
-            self.setMaximumHeight(self.n_winYSet.value() - self.n_titleIconSizeSet.value())
-            self.placementSetEdit.setMaximum(self.screenSize.width() - value)
-        else:
-            self.c_winXSet.setMaximum(self.parent.width())
+        section = getattr(self.config, arg_1)
+        winSize = list(section.winSize)
+        winSize[arg_2] = value
+        section.winSize = winSize
+        if arg_1 == "normal": self.placementSetEdit.setMaximum(self.screenSize.width() - section.winSize[0])
+        else: self.c_winXSet.setMaximum(self.parent.n_winSize[0])
 
     def __setNTitleIconSize(self, value: int):
         self.parent.setNTitleIconSize(value)
-        self.newConfig["normal"]["titleIconSize"] = value
+        self.config.normal.titleIconSize = value
 
     def __setNAppIconSize(self, value: int):
         self.__setDemonstrationItem(value)
         self.parent.setNAppIconSize(value)
-        self.newConfig["normal"]["appIconSize"] = value
+        self.config.normal.appIconSize = value
 
     def __setDemonstrationItem(self, appIconSize: int):
         def calcFontSize(size: int) -> int:
@@ -524,7 +573,9 @@ class SettingsWidget(QScrollArea):
             fontSize = max(8, min(fontSize, 72))
             return fontSize
 
-        self.itemIconLabel.setPixmap(self.itemIcon.pixmap(appIconSize, appIconSize))
+        self.itemIconLabel.setPixmap(
+            pixmapCache.pixmap(self.itemIcon, appIconSize, self.itemIconLabel.devicePixelRatioF())
+        )
         self.itemIconLabel.setFixedSize(appIconSize * 2.5, appIconSize * 2)
         font = self.itemLabel.font()
         font.setPointSize(calcFontSize(appIconSize))
@@ -533,10 +584,13 @@ class SettingsWidget(QScrollArea):
     def __setOpacity(self, arg_1: str, value: int):
         value = round(value / 100, 2)
         self.parent.setOpacity(arg_1, value)
-        self.newConfig[arg_1]["opacity"] = value
+        getattr(self.config, arg_1).opacity = value
 
     def __resetConfig(self, arg_1: str):
-        config = self.config[arg_1]
+        """恢复为上次写入时的值"""
+        section = getattr(self.config, arg_1)
+        config = section.saved()
+        self.parent.beginUpdate()  # 整节一次应用
         if arg_1 == "normal":
             self.n_winXSet.setValue(config["winSize"][0])
             self.n_winYSet.setValue(config["winSize"][1])
@@ -547,4 +601,5 @@ class SettingsWidget(QScrollArea):
             self.c_winXSet.setValue(config["winSize"][0])
             self.c_winYSet.setValue(config["winSize"][1])
             self.c_opacitySet.setValue(config["opacity"] * 100)
-        self.newConfig[arg_1] = copy.deepcopy(config)
+        for field, value in config.items(): setattr(section, field, value)
+        self.parent.endUpdate()
@@ -0,0 +1,37 @@
+__all__ = ["StartupProfiler", "ProfileEnv"]
+
+import os
+import time
+
+ProfileEnv = "COLLAPSIBLE_PANEL_PROFILE"  # 设置为1时记录启动各阶段耗时
+
+
+# 启动分析：记录各阶段相对开始的时间，写入Cache
+class StartupProfiler:
+    def __init__(self, logPath: str):
+        self.logPath = logPath
+        self.enabled = os.environ.get(ProfileEnv, "") not in ("", "0")
+        self.__start = time.perf_counter()
+        self.__marks: list[tuple[str, float]] = []
+        self.__written = False
+
+    def mark(self, phase: str) -> None:
+        """每个阶段只记录第一次"""
+        if not self.enabled or self.__written or self.has(phase): return
+        self.__marks.append((phase, (time.perf_counter() - self.__start) * 1000))
+
+    def has(self, phase: str) -> bool: return any(name == phase for name, _ in self.__marks)
+
+    def write(self) -> None:
+        """追加本次启动的记录，只写入一次"""
+        if not self.enabled or self.__written or not self.__marks: return
+        self.__written = True
+        lines = [time.strftime("%Y年%m月%d日 %H:%M:%S\n", time.localtime())]
+        last = 0.0
+        for phase, elapsed in self.__marks:
+            lines.append(f"\t{phase:<14}{elapsed:>10.2f}ms (+{elapsed - last:.2f}ms)\n")
+            last = elapsed
+        try:
+            with open(self.logPath, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except OSError: pass
@@ -0,0 +1,187 @@
+__all__ = ["TargetWatcher"]
+
+import os
+import stat
+import threading
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+
+from pathIndex import PathIndex
+
+WatchDelay = 300       # 合并目录变化事件的时间(ms)，复制、解压等操作会连续触发
+MaxWatchedDirs = 2048  # 监视的目录数量上限，超出部分的目标只由PathHealth定期检查
+
+
+def _stat(path: str) -> tuple[bool, int, int]:
+    """:return: (是否存在, 文件标识, mtime)；文件夹的mtime随内容变化，与图标无关，记为-1"""
+    try: st = os.stat(path)
+    except OSError: return False, 0, 0
+    return True, st.st_ino, -1 if stat.S_ISDIR(st.st_mode) else st.st_mtime_ns
+
+
+class _WatchSignals(QObject):
+    indexed = Signal(list, list)  # [(路径, 状态)]，存在的目录
+    checked = Signal(list, list, list)  # [(变化类型, 路径, 新路径, 新状态)]，检查的目录，其中仍存在的目录
+
+
+# 目标监视：共用一个QFileSystemWatcher监视所有目标的上级目录(去重)，合并一段时间内的变化后在后台检查
+class TargetWatcher(QObject):
+    targetChanged = Signal(str, str, str)  # 变化类型("deleted"/"restored"/"modified"/"renamed")，路径，新路径
+
+    def __init__(self, logging, parent: QObject = None):
+        super().__init__(parent)
+        self.logging = logging
+        self.__states: dict[str, tuple[str, tuple | None]] = {}  # 目标键 -> (路径, 状态)，后台记录前状态为None
+        self.__dirs: dict[str, set[str]] = {}     # 目录键 -> 其中的目标键
+        self.__dirPaths: dict[str, str] = {}      # 目录键 -> 目录路径
+        self.__watched: set[str] = set()          # 已监视的目录键
+        self.__changed: set[str] = set()          # 等待检查的目录键
+        self.__checking = False
+        self.__limitLogged = False
+
+        self.__watcher = QFileSystemWatcher(self)
+        self.__watcher.directoryChanged.connect(self.__directoryChanged)
+        self.__signals = _WatchSignals(self)
+        self.__signals.indexed.connect(self.__onIndexed)
+        self.__signals.checked.connect(self.__onChecked)
+        self.__checkTimer = QTimer(self)
+        self.__checkTimer.setSingleShot(True)
+        self.__checkTimer.timeout.connect(self.__check)
+
+    def addTargets(self, paths: list[str]) -> None:
+        """在后台记录目标的当前状态后再监视所在目录"""
+        added = []
+        for path in paths:
+            key = PathIndex.normalize(path)
+            if key in self.__states: continue
+            dirPath = os.path.dirname(path)
+            dirKey = PathIndex.normalize(dirPath)
+            self.__states[key] = (path, None)
+            self.__dirs.setdefault(dirKey, set()).add(key)
+            self.__dirPaths[dirKey] = dirPath
+            added.append(path)
+        if added: threading.Thread(target=self.__index, args=(added,), name="TargetWatcher", daemon=True).start()
+
+    def removeTarget(self, path: str) -> None:
+        """目录中没有其他目标时停止监视"""
+        entry = self.__states.pop(PathIndex.normalize(path), None)
+        if entry is None: return
+        dirKey = PathIndex.normalize(os.path.dirname(entry[0]))
+        keys = self.__dirs.get(dirKey)
+        if keys is None: return
+        keys.discard(PathIndex.normalize(path))
+        if keys: return
+        del self.__dirs[dirKey]
+        dirPath = self.__dirPaths.pop(dirKey)
+        if dirKey in self.__watched:
+            self.__watched.discard(dirKey)
+            self.__watcher.removePath(dirPath)
+
+    def refresh(self, path: str) -> None:
+        """由其他途径得知目标恢复后调用，重新记录状态；所在目录曾被删除时重新监视"""
+        key = PathIndex.normalize(path)
+        entry = self.__states.get(key)
+        if entry is None: return
+        self.__states[key] = (entry[0], None)
+        threading.Thread(target=self.__index, args=([entry[0]],), name="TargetWatcher", daemon=True).start()
+
+    def __index(self, paths: list[str]) -> None:
+        states = [(path, _stat(path)) for path in paths]
+        dirs = [dirPath for dirPath in {os.path.dirname(path) for path in paths} if os.path.isdir(dirPath)]
+        self.__signals.indexed.emit(states, dirs)
+
+    def __onIndexed(self, states: list, dirs: list[str]) -> None:
+        for path, state in states:
+            key = PathIndex.normalize(path)
+            entry = self.__states.get(key)
+            if entry is not None and entry[1] is None: self.__states[key] = (entry[0], state)
+        self.__watch(dirs)
+
+    def __watch(self, dirs: list[str]) -> None:
+        paths = []
+        for dirPath in dirs:
+            dirKey = PathIndex.normalize(dirPath)
+            if dirKey not in self.__dirs or dirKey in self.__watched: continue
+            if len(self.__watched) + len(paths) >= MaxWatchedDirs:
+                if not self.__limitLogged:
+                    self.logging.write(f"监视的目录数量达到上限{MaxWatchedDirs}，其余目标只定期检查", "warning")
+                    self.__limitLogged = True
+                break
+            self.__watched.add(dirKey)
+            paths.append(dirPath)
+        if not paths: return
+        for dirPath in self.__watcher.addPaths(paths):  # 返回未能监视的目录
+            self.__watched.discard(PathIndex.normalize(dirPath))
+
+    def __directoryChanged(self, path: str) -> None:
+        self.__changed.add(PathIndex.normalize(path))
+        self.__checkTimer.start(WatchDelay)
+
+    def __check(self) -> None:
+        """检查变化目录中的所有目标，上一次检查未结束时推迟"""
+        if self.__checking:
+            self.__checkTimer.start(WatchDelay)
+            return
+        changed, self.__changed = self.__changed, set()
+        targets, dirs = [], []
+        for dirKey in changed:
+            if dirKey not in self.__dirs: continue
+            dirs.append(self.__dirPaths[dirKey])
+            for key in self.__dirs[dirKey]:
+                path, state = self.__states[key]
+                if state is not None: targets.append((path, state))
+        if not dirs: return
+        self.__checking = True
+        threading.Thread(target=self.__checkTargets, args=(targets, dirs), name="TargetWatcher", daemon=True).start()
+
+    def __checkTargets(self, targets: list, dirs: list[str]) -> None:
+        changes, listings = [], {}
+        for path, (exists, identity, mtime) in targets:
+            state = _stat(path)
+            if exists and not state[0]:
+                newPath = self.__findRenamed(path, identity, mtime, listings)
+                if newPath is None: changes.append(("deleted", path, "", state))
+                else: changes.append(("renamed", path, newPath, _stat(newPath)))
+            elif not exists and state[0]: changes.append(("restored", path, "", state))
+            elif exists and state[2] != mtime: changes.append(("modified", path, "", state))
+        self.__signals.checked.emit(changes, dirs, [dirPath for dirPath in dirs if os.path.isdir(dirPath)])
+
+    @staticmethod
+    def __findRenamed(path: str, identity: int, mtime: int, listings: dict[str, dict[int, str]]) -> str | None:
+        """
+        在同一目录中查找文件标识相同的项，移动到其他目录时视为删除
+        标识可能被新建的文件复用，因此还要求类型相同，文件的mtime不变(重命名不改变mtime)
+        """
+        if not identity: return None  # 文件系统不提供标识
+        dirPath = os.path.dirname(path)
+        if dirPath not in listings:
+            listings[dirPath] = {}
+            try:
+                with os.scandir(dirPath) as entries:
+                    for entry in entries:
+                        try: listings[dirPath][entry.inode()] = entry.path
+                        except OSError: pass
+            except OSError: pass
+        newPath = listings[dirPath].get(identity)
+        if newPath is None: return None
+        state = _stat(newPath)
+        return newPath if state[1] == identity and state[2] == mtime else None
+
+    def __onChecked(self, changes: list, dirs: list[str], existing: list[str]) -> None:
+        self.__checking = False
+        for dirPath in set(dirs) - set(existing): self.__watched.discard(PathIndex.normalize(dirPath))  # 已被移出监视
+        self.__watch(existing)
+        for kind, path, newPath, state in changes:
+            key = PathIndex.normalize(path)
+            entry = self.__states.get(key)
+            if entry is None: continue  # 检查期间已移除
+            if kind == "renamed":  # 仍在同一目录
+                newKey = PathIndex.normalize(newPath)
+                del self.__states[key]
+                self.__states[newKey] = (newPath, state)
+                keys = self.__dirs.get(PathIndex.normalize(os.path.dirname(path)))
+                if keys is not None:
+                    keys.discard(key)
+                    keys.add(newKey)
+            else: self.__states[key] = (entry[0], state)
+            self.targetChanged.emit(kind, entry[0], newPath)
+        if self.__changed: self.__checkTimer.start(WatchDelay)
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 模块位于Code目录下
+
+
+class _Logging:
+    """代替asyncLogger，记录写入的日志"""
+    def __init__(self):
+        self.records: list[tuple[str, str]] = []
+
+    def write(self, message, level: str = "info") -> None: self.records.append((level, str(message)))
+
+    def levels(self, level: str) -> list[str]: return [message for lvl, message in self.records if lvl == level]
+
+
+@pytest.fixture
+def logging() -> _Logging: return _Logging()
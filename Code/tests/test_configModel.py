@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from configModel import Config
+
+
+@pytest.mark.parametrize("section, field, value", [
+    ("windows", "theme", "blue"),
+    ("windows", "aniSpeed", -1),
+    ("windows", "aniSpeed", "200"),
+    ("windows", "isTop", 1),
+    ("windows", "placement", "bottom"),
+    ("windows", "placement", 1 << 20),
+    ("windows", "autoOrder", ["folder", "games"]),
+    ("windows", "identifyGroups", ".exe"),
+    ("normal", "winSize", [500]),
+    ("normal", "appIconSize", 0),
+    ("normal", "opacity", 1.5),
+    ("collapsible", "opacity", True),
+])
+def test_invalid_value_falls_back_to_default(section, field, value, logging):
+    config = Config("config.json", {section: {field: value}}, logging)
+    default = type(getattr(config, section)).FIELDS[field][0]
+    assert getattr(getattr(config, section), field) == default
+    assert any(f"{section}.{field}" in message for message in logging.levels("warning"))
+
+
+def test_non_object_section_uses_defaults(logging):
+    config = Config("config.json", {"normal": [1, 2]}, logging)
+    assert config.normal.winSize == [500, 240]
+    assert logging.levels("warning")
+
+
+def test_valid_values_are_converted(logging):
+    config = Config("config.json", {
+        "windows": {"placement": -1280, "autoOrder": ["exec", "folder", "exec"]},
+        "normal": {"winSize": [640.0, 300], "opacity": 1},
+    }, logging)
+    assert config.windows.placement == -1280  # 位于主屏幕左侧的屏幕
+    assert config.windows.autoOrder == ["folder", "exec"]
+    assert config.normal.winSize == [640, 300]
+    assert isinstance(config.normal.opacity, float)
+    assert not logging.records
+
+
+def test_unknown_field_cannot_be_assigned(logging):
+    config = Config("config.json", {}, logging)
+    with pytest.raises(AttributeError):
+        config.windows.unknown = 1
+
+
+def test_write_only_when_dirty(tmp_path, logging):
+    path = str(tmp_path / "config.json")
+    config = Config(path, {}, logging)
+    assert config.write() is None
+    config.windows.theme = "light"
+    assert config.isDirty
+    assert config.write() is True
+    assert not config.isDirty
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["windows"]["theme"] == "light"
+    assert Config.load(path, logging).windows.theme == "light"
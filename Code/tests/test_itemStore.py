@@ -0,0 +1,51 @@
+import os
+
+from itemStore import ItemStore
+from pathIndex import PathIndex
+
+
+def names(store: ItemStore, type_: str) -> list[str]: return [record.name for record in store.items(type_)]
+
+
+def test_legacy_dict_snapshot_gets_ids_in_order():
+    store = ItemStore.fromSnapshot({"folder": {"docs": "/docs", "music": "/music"}, "exec": {"app": "/bin/app"}})
+    assert names(store, "folder") == ["docs", "music"]
+    assert names(store, "exec") == ["app"]
+    assert sorted(record.id for type_ in store.types() for record in store.items(type_)) == [1, 2, 3]
+    assert store.findByPath("/bin/app").name == "app"
+    assert store.nextId == 4
+
+
+def test_snapshot_round_trip_keeps_ids_and_next_id():
+    store = ItemStore()
+    a = store.add("exec", "a", "/a")
+    store.add("exec", "b", "/b")
+    store.remove(a.id)  # 删除的ID不再复用
+
+    restored = ItemStore.fromSnapshot(store.toSnapshot())
+    assert [record.id for record in restored.items("exec")] == [2]
+    assert restored.add("exec", "c", "/c").id == 3
+
+
+def test_swap_move_and_remove_keep_order_consistent():
+    store = ItemStore()
+    ids = [store.add("exec", name, f"/{name}").id for name in "abcde"]
+    assert store.swap(ids[0], ids[4])
+    assert names(store, "exec") == list("ebcda")
+    assert store.move(ids[4], 3)
+    assert names(store, "exec") == list("bcdea")
+    store.remove(ids[2])
+    assert names(store, "exec") == list("bdea")
+    assert store.swap(ids[1], ids[0])  # 删除后位置仍正确
+    assert names(store, "exec") == list("adeb")
+
+
+def test_path_index_normalises_separators_and_case():
+    index = PathIndex()
+    index.add(1, os.path.join("dir", "App.exe"))
+    assert index.find(os.path.join("dir", ".", "APP.EXE")) == 1
+    assert os.path.join("dir", "sub", "..", "app.exe") in index
+    index.addAlias(os.path.join("links", "App.lnk"), os.path.join("dir", "app.exe"))
+    assert index.find(os.path.join("LINKS", "app.lnk")) == 1
+    index.remove(os.path.join("DIR", "app.exe"))
+    assert len(index) == 0
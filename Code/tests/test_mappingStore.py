@@ -0,0 +1,99 @@
+import os
+import json
+
+import pytest
+
+from mappingStore import MappingStore
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "app_mapping.json"), str(tmp_path / "app_mapping.journal")
+
+
+def names(items, type_: str) -> list[str]: return [record.name for record in items.items(type_)]
+
+
+def test_replay_restores_changes_after_snapshot(paths, logging):
+    store = MappingStore(*paths, logging)
+    store.load()
+    a, b, c = store.apply([("add", "exec", "a", "/a"), ("add", "exec", "b", "/b"), ("add", "exec", "c", "/c")])
+    store.apply([("swap", a.id, c.id), ("del", b.id), ("rename", a.id, "a2", "/a2")])
+    store.close()
+
+    items = MappingStore(*paths, logging).load()
+    assert names(items, "exec") == ["c", "a2"]
+    assert items.findByPath("/a2").id == a.id
+    assert items.findByPath("/b") is None
+
+
+def test_replay_skips_records_already_in_snapshot(paths, logging):
+    snapshotPath, journalPath = paths
+    with open(snapshotPath, "w", encoding="utf-8") as f:
+        json.dump({"seq": 2, "nextId": 3, "folder": [], "exec": [[1, "a", "/a"], [2, "b", "/b"]]}, f)
+    with open(journalPath, "w", encoding="utf-8") as f:
+        f.write(json.dumps([1, "add", "exec", 1, "a", "/a"]) + "\n")
+        f.write(json.dumps([2, "add", "exec", 2, "b", "/b"]) + "\n")
+        f.write(json.dumps([3, "del", 1]) + "\n")
+
+    store = MappingStore(*paths, logging)
+    items = store.load()
+    assert names(items, "exec") == ["b"]
+    record, = store.apply([("add", "exec", "c", "/c")])
+    assert record.id == 3
+    store.close()
+    with open(journalPath, "r", encoding="utf-8") as f:
+        assert json.loads(f.readlines()[-1])[0] == 4  # 序号接着重放的最大序号
+
+
+def test_torn_tail_is_truncated(paths, logging):
+    store = MappingStore(*paths, logging)
+    store.load()
+    store.apply([("add", "exec", "a", "/a")])
+    store.close()
+    journalPath = paths[1]
+    with open(journalPath, "ab") as f:
+        f.write(b'[2, "add", "exec", "b", "/')  # 写入中断
+
+    store = MappingStore(*paths, logging)
+    assert names(store.load(), "exec") == ["a"]
+    assert logging.levels("warning")
+    store.apply([("add", "exec", "c", "/c")])
+    store.close()
+
+    items = MappingStore(*paths, logging).load()
+    assert names(items, "exec") == ["a", "c"]
+
+
+def test_compaction_keeps_all_changes(paths, logging):
+    store = MappingStore(*paths, logging, compactThreshold=256)
+    store.load()
+    for i in range(20): store.apply([("add", "exec", f"app{i}", f"/app{i}")])
+    store.close()
+
+    assert os.path.getsize(paths[1]) < 256 * 2
+    items = MappingStore(*paths, logging).load()
+    assert names(items, "exec") == [f"app{i}" for i in range(20)]
+
+
+def test_corrupt_snapshot_is_backed_up_and_not_overwritten(paths, logging, tmp_path):
+    snapshotPath = paths[0]
+    with open(snapshotPath, "w", encoding="utf-8") as f:
+        f.write('{"exec": [[1, "a", ')
+
+    with pytest.raises(ValueError):
+        MappingStore(*paths, logging).load()
+    backups = [name for name in os.listdir(tmp_path) if name.startswith("app_mapping.json.corrupt-")]
+    assert len(backups) == 1
+    with open(snapshotPath, "r", encoding="utf-8") as f:
+        assert f.read() == '{"exec": [[1, "a", '
+
+
+def test_apply_after_close_is_not_written(paths, logging):
+    store = MappingStore(*paths, logging)
+    store.load()
+    store.close()
+    record, = store.apply([("add", "exec", "a", "/a")])
+    assert record.name == "a"
+    assert logging.levels("warning")
+    assert names(MappingStore(*paths, logging).load(), "exec") == []
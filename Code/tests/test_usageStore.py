@@ -0,0 +1,99 @@
+import pytest
+
+from usageStore import UsageStore, _Header, _Record, _Magic, _Version
+
+HalfLife = 100.0
+
+
+@pytest.fixture
+def path(tmp_path): return str(tmp_path / "usage.bin")
+
+
+def write(path: str, *records: tuple[int, int, float, float], tail: bytes = b"") -> None:
+    with open(path, "wb") as f:
+        f.write(_Header.pack(_Magic, _Version, _Record.size))
+        for record in records: f.write(_Record.pack(*record))
+        f.write(tail)
+
+
+def slots(path: str) -> list[int]:
+    """文件中各记录的ID"""
+    with open(path, "rb") as f:
+        data = f.read()[_Header.size:]
+    return [record[0] for record in _Record.iter_unpack(data[:len(data) // _Record.size * _Record.size])]
+
+
+def test_records_persist_after_reload(path, logging):
+    store = UsageStore(path, logging, HalfLife)
+    store.record(1, now=0.0)
+    store.record(1, now=HalfLife)
+    store.record(2, now=HalfLife)
+    store.close()
+
+    store = UsageStore(path, logging, HalfLife)
+    assert store.count(1) == 2 and store.count(2) == 1
+    assert store.score(1, now=HalfLife) == pytest.approx(1.5)
+    assert store.score(1, now=HalfLife * 2) == pytest.approx(0.75)
+    store.close()
+    assert not logging.records
+
+
+def test_removed_slot_is_reused(path, logging):
+    store = UsageStore(path, logging, HalfLife)
+    for id_ in (1, 2, 3): store.record(id_, now=0.0)
+    store.remove(2)
+    store.close()
+    assert slots(path) == [1, 0, 3]
+
+    store = UsageStore(path, logging, HalfLife)
+    assert len(store) == 2
+    store.record(4, now=0.0)
+    store.close()
+    assert slots(path) == [1, 4, 3]  # 文件不增长
+
+
+def test_free_slots_are_reused_from_the_front(path, logging):
+    write(path, (0, 0, 0.0, 0.0), (1, 1, 1.0, 0.0), (0, 0, 0.0, 0.0))
+    store = UsageStore(path, logging, HalfLife)
+    store.record(2, now=0.0)
+    store.record(3, now=0.0)
+    store.record(4, now=0.0)
+    store.close()
+    assert slots(path) == [2, 1, 3, 4]
+
+
+def test_bad_header_recreates_file(path, logging):
+    with open(path, "wb") as f:
+        f.write(b"not a usage file")
+    store = UsageStore(path, logging, HalfLife)
+    assert len(store) == 0
+    store.record(1, now=0.0)
+    store.close()
+    assert logging.levels("warning")
+    assert slots(path) == [1]
+
+
+def test_truncated_tail_and_duplicates_are_dropped(path, logging):
+    write(path, (1, 2, 1.0, 0.0), (1, 5, 3.0, 0.0), (2, 1, 1.0, 0.0), tail=_Record.pack(3, 1, 1.0, 0.0)[:7])
+    store = UsageStore(path, logging, HalfLife)
+    assert store.count(1) == 2  # 保留靠前的记录
+    assert store.count(3) == 0
+    store.close()
+    assert slots(path) == [1, 0, 2]
+
+    store = UsageStore(path, logging, HalfLife)
+    store.record(3, now=0.0)
+    store.close()
+    assert slots(path) == [1, 3, 2]
+
+
+def test_rank_orders_by_decayed_score(path, logging):
+    store = UsageStore(path, logging, HalfLife)
+    store.record(1, now=0.0)
+    store.record(1, now=0.0)
+    store.record(2, now=HalfLife * 2)  # 1的分数衰减到0.5
+    store.record(3, now=HalfLife)      # 与1同为1.0
+    assert store.rank([5, 1, 4, 3, 2]) == [2, 1, 3, 5, 4]
+    store.prune({1, 2})
+    assert store.count(3) == 0
+    store.close()
@@ -0,0 +1,122 @@
+__all__ = ["ThemeManager", "Theme"]
+
+import os
+import re
+
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QAbstractScrollArea, QFrame
+
+_RulePattern = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_DeclarationPattern = re.compile(r"([\w-]+)\s*:\s*([^;]+)")
+_DialogTypes = ("QWidget", "QLabel", "QPushButton", "QProgressBar")  # 对话框中出现的控件类型
+_PanelSelector = "QWidget#AppWidget"  # 应用项区域的规则
+
+
+def _border(declarations: dict[str, str]) -> tuple[int, QColor]:
+    """解析border与border-color，返回(线宽, 颜色)；与QSS一致，未指定颜色时为黑色"""
+    width, color = 0, QColor("#000000")
+    for token in declarations.get("border", "").split():
+        if token.endswith("px") and token[:-2].isdigit(): width = int(token[:-2])
+        elif token == "none": width = 0
+        elif QColor.isValidColorName(token): color = QColor(token)
+    if "border-color" in declarations: color = QColor(declarations["border-color"])
+    return width, color
+
+
+# 解析后的主题：功能栏、设置界面等使用QSS，应用项区域使用调色板，切换时不必重新polish每个应用项
+class Theme:
+    __slots__ = ("name", "styleSheet", "popupStyleSheet", "dialogStyleSheet", "palette", "panelPalette", "panelBorder")
+
+    def __init__(self, name: str, styleSheet: str):
+        self.name = name
+        self.styleSheet = styleSheet
+
+        rules: dict[str, dict[str, str]] = {}
+        popupRules, dialogRules = [], []
+        for match in _RulePattern.finditer(styleSheet):
+            selectors = [selector.strip() for selector in match.group(1).split(",")]
+            declarations = dict(
+                (key, value.strip()) for key, value in _DeclarationPattern.findall(match.group(2))
+            )
+            for selector in selectors: rules.setdefault(selector, {}).update(declarations)
+            if all(selector.startswith("QMenu") for selector in selectors): popupRules.append(match.group(0).strip())
+            elif all(selector.split(":")[0] in _DialogTypes for selector in selectors):  # 不含带对象名的规则
+                dialogRules.append(match.group(0).strip())
+        self.popupStyleSheet = "\n".join(popupRules)    # 应用项区域弹出的菜单使用
+        self.dialogStyleSheet = "\n".join(dialogRules)  # 对话框使用，对话框的父窗口不再设置QSS
+
+        # 与QSS中通用的QWidget规则一致，应用项区域与对话框使用
+        base = rules.get("QWidget", {})
+        window = QColor(base.get("background-color", "#1D1D1D"))
+        text = QColor(base.get("color", "#FFFFFF"))
+        self.palette = QPalette(window)  # 按背景色生成亮、暗、中间色
+        for role in (QPalette.ColorRole.Window, QPalette.ColorRole.Base, QPalette.ColorRole.Button):
+            self.palette.setColor(role, window)
+        for role in (QPalette.ColorRole.WindowText, QPalette.ColorRole.Text, QPalette.ColorRole.ButtonText):
+            self.palette.setColor(role, text)
+
+        # 应用项区域自身的背景与边框，边框以WindowText绘制，区域内容仍使用上面的调色板
+        panel = rules.get(_PanelSelector, {})
+        self.panelBorder, borderColor = _border(panel)  # 边框线宽
+        self.panelPalette = QPalette(self.palette)
+        self.panelPalette.setColor(QPalette.ColorRole.Window, QColor(panel.get("background-color", window.name())))
+        self.panelPalette.setColor(QPalette.ColorRole.WindowText, borderColor)
+
+    def applyToPanel(self, area: QAbstractScrollArea) -> None:
+        """
+        应用项区域(AppWidget与AppView)：按QWidget#AppWidget规则绘制背景与边框，滚动条使用QSS
+        区域本身不设置QSS，否则会传递给每个应用项，切换主题时重新polish所有应用项
+        """
+        area.setFrameShape(QFrame.Shape.Box if self.panelBorder else QFrame.Shape.NoFrame)
+        area.setFrameShadow(QFrame.Shadow.Plain)
+        area.setLineWidth(self.panelBorder)
+        area.setPalette(self.panelPalette)
+        area.viewport().setPalette(self.palette)
+        area.verticalScrollBar().setStyleSheet(self.styleSheet)
+        area.horizontalScrollBar().setStyleSheet(self.styleSheet)
+
+
+# 主题管理：启动时解析所有主题，qss文件变化时重新解析
+class ThemeManager(QObject):
+    themeReloaded = Signal(str)  # qss文件变化并重新解析后发出，参数为主题名
+
+    def __init__(self, stylesRoot: str, themes: tuple[str, ...], logging, parent: QObject = None):
+        """主题文件无法读取时抛出异常"""
+        super().__init__(parent)
+        self.stylesRoot = stylesRoot
+        self.logging = logging
+        self.__themes: dict[str, Theme] = {}
+        self.__paths = {f"{stylesRoot}\\{name}.qss": name for name in themes}  # 路径 -> 主题名
+        self.__changed: set[str] = set()
+
+        for path, name in self.__paths.items(): self.__themes[name] = self.__load(path, name)
+
+        self.__watcher = QFileSystemWatcher(list(self.__paths), self)
+        self.__watcher.fileChanged.connect(self.__fileChanged)
+        self.__reloadTimer = QTimer(self)  # 编辑器保存时可能连续触发多次，合并后再解析
+        self.__reloadTimer.setSingleShot(True)
+        self.__reloadTimer.timeout.connect(self.__reload)
+
+    def theme(self, name: str) -> Theme: return self.__themes[name]
+
+    @staticmethod
+    def __load(path: str, name: str) -> Theme:
+        with open(path, "r", encoding="utf-8") as f:
+            return Theme(name, f.read())
+
+    def __fileChanged(self, path: str) -> None:
+        self.__changed.add(path)
+        self.__reloadTimer.start(100)
+
+    def __reload(self) -> None:
+        changed, self.__changed = self.__changed, set()
+        for path in changed:
+            # 以替换方式保存的文件会被移出监视列表
+            if path not in self.__watcher.files() and os.path.exists(path): self.__watcher.addPath(path)
+            name = self.__paths[path]
+            try: self.__themes[name] = self.__load(path, name)
+            except Exception as e:
+                self.logging.write(f"重新加载主题{name}失败，继续使用旧主题，错误信息：{e}", "warning")
+                continue
+            self.themeReloaded.emit(name)
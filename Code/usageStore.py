@@ -0,0 +1,155 @@
+__all__ = ["UsageStore"]
+
+import math
+import time
+import queue
+import struct
+import threading
+
+HalfLife = 7 * 24 * 3600.0  # 使用分数的半衰期(秒)，每过一个半衰期分数减半
+
+_Header = struct.Struct("<4sHH")  # 标识，版本，单条记录长度
+_Record = struct.Struct("<IIdd")  # ID(0为空位)，启动次数，最后一次启动时的分数，最后一次启动的时间戳
+_Magic, _Version = b"CPUS", 1
+
+
+# 使用统计：每项一条定长记录，修改只写入对应位置，写入在后台线程完成
+class UsageStore:
+    def __init__(self, path: str, logging, halfLife: float = HalfLife):
+        """
+        :param path:     数据文件路径，文件头之后依次为各项的定长记录，删除项的记录置零后复用
+        :param halfLife: 半衰期(秒)，分数 = Σ 2^(-(当前时间 - 启动时间) / halfLife)
+        """
+        self.path = path
+        self.logging = logging
+        self.halfLife = halfLife
+
+        self.__records: dict[int, tuple[int, float, float]] = {}  # ID -> (次数, 分数, 时间戳)
+        self.__slots: dict[int, int] = {}  # ID -> 记录序号
+        self.__free: list[int] = []        # 空记录序号
+        self.__slotCount = 0
+        self.__queue: queue.SimpleQueue = queue.SimpleQueue()  # 元素为(记录序号, 数据)、整个文件的数据或None(停止)
+        self.__closed = False
+
+        self.__load()
+        self.__thread = threading.Thread(target=self.__work, name="UsageStore", daemon=True)
+        self.__thread.start()
+
+    def __len__(self) -> int: return len(self.__records)
+
+    def record(self, id_: int, now: float = None) -> None:
+        """记录一次启动：分数衰减到当前时间后加1"""
+        if now is None: now = time.time()
+        count, score, last = self.__records.get(id_, (0, 0.0, now))
+        self.__records[id_] = (count + 1, score * self.__decay(now - last) + 1.0, now)
+        self.__write(id_)
+
+    def remove(self, id_: int) -> None:
+        if self.__records.pop(id_, None) is None: return
+        slot = self.__slots.pop(id_)
+        self.__free.append(slot)
+        self.__queue.put((slot, bytes(_Record.size)))
+
+    def prune(self, ids: set[int]) -> None:
+        """启动时调用，清理映射表中已不存在的项，如上次退出前删除记录未能写入"""
+        for id_ in [id_ for id_ in self.__records if id_ not in ids]: self.remove(id_)
+
+    def count(self, id_: int) -> int: return self.__records.get(id_, (0, 0.0, 0.0))[0]
+
+    def score(self, id_: int, now: float = None) -> float:
+        """衰减到当前时间的分数，从未启动时为0"""
+        count, score, last = self.__records.get(id_, (0, 0.0, 0.0))
+        if not count: return 0.0
+        return score * self.__decay((time.time() if now is None else now) - last)
+
+    def rankKey(self, id_: int) -> float:
+        """
+        排序键 log2(分数) + 时间戳 / halfLife，与当前时间无关：所有项的分数以相同比例衰减，相对顺序不变
+        从未启动时为-inf
+        """
+        count, score, last = self.__records.get(id_, (0, 0.0, 0.0))
+        if not count: return -math.inf
+        return math.log2(score) + last / self.halfLife
+
+    def rank(self, ids: list[int]) -> list[int]:
+        """按分数从高到低排序，分数相同(包括从未启动)的项保持原有顺序"""
+        return sorted(ids, key=self.rankKey, reverse=True)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """等待已提交的修改写入"""
+        if self.__closed: return
+        self.__closed = True
+        self.__queue.put(None)
+        self.__thread.join(timeout)
+
+    def __decay(self, elapsed: float) -> float: return 2.0 ** (-max(0.0, elapsed) / self.halfLife)
+
+    def __write(self, id_: int) -> None:
+        """在GUI线程打包，后台线程只做IO"""
+        slot = self.__slots.get(id_)
+        if slot is None:
+            if self.__free: slot = self.__free.pop()
+            else:
+                slot = self.__slotCount
+                self.__slotCount += 1
+            self.__slots[id_] = slot
+        self.__queue.put((slot, _Record.pack(id_, *self.__records[id_])))
+
+    def __load(self) -> None:
+        """文件不存在或格式不符时重新创建，末尾不完整的记录忽略"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError: data = b""
+        except OSError as e:
+            self.logging.write(f"读取使用统计失败，错误信息：{e}", "warning")
+            data = b""
+
+        header = _Header.pack(_Magic, _Version, _Record.size)
+        if data[:_Header.size] != header:
+            if data: self.logging.write("使用统计文件格式不符，已重新创建", "warning")
+            self.__queue.put(header)
+            return
+
+        self.__slotCount = (len(data) - _Header.size) // _Record.size
+        for slot, (id_, count, score, last) in enumerate(_Record.iter_unpack(
+                data[_Header.size:_Header.size + self.__slotCount * _Record.size])):
+            if id_ == 0 or id_ in self.__records or not count:  # 空位或重复记录
+                if id_ in self.__records: self.__queue.put((slot, bytes(_Record.size)))
+                self.__free.append(slot)
+                continue
+            self.__records[id_] = (count, score, last)
+            self.__slots[id_] = slot
+        self.__free.reverse()  # 优先复用靠前的空位
+
+    def __work(self) -> None:
+        """合并队列中的修改，同一记录只写入最后一次"""
+        f, stop = None, False
+        while not stop:
+            batch = [self.__queue.get()]
+            while True:
+                try: batch.append(self.__queue.get_nowait())
+                except queue.Empty: break
+
+            header, slots = None, {}
+            for item in batch:
+                if item is None: stop = True
+                elif isinstance(item, bytes): header, slots = item, {}  # 重新创建文件
+                else: slots[item[0]] = item[1]
+            if header is None and not slots: continue
+            try:
+                if f is None or header is not None:
+                    if f is not None: f.close()
+                    f = open(self.path, "wb" if header is not None else "r+b")
+                    if header is not None: f.write(header)
+                for slot, data in sorted(slots.items()):
+                    f.seek(_Header.size + slot * _Record.size)
+                    f.write(data)
+                f.flush()
+            except OSError as e:
+                self.logging.write(f"写入使用统计失败，错误信息：{e}", "warning")
+                if f is not None:
+                    try: f.close()
+                    except OSError: pass
+                f = None
+        if f is not None: f.close()
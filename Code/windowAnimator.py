@@ -0,0 +1,168 @@
+__all__ = ["WindowAnimator", "AniModes"]
+
+import os
+import time
+
+from PySide6.QtCore import (
+    QObject, QRect, QPropertyAnimation, QVariantAnimation, QAbstractAnimation, QEasingCurve, Signal
+)
+from PySide6.QtGui import QPainter, QPixmap, QRegion
+from PySide6.QtWidgets import QWidget
+
+from startupProfiler import ProfileEnv
+
+# live:     实时布局
+# snapshot: 播放内容快照，结束后换回实际控件
+# mask:     窗口保持展开尺寸，只改变遮罩，折叠后只有监视栏区域可见、可响应鼠标
+AniModes = ("live", "snapshot", "mask")
+
+
+# 动画期间代替操作区显示的快照，水平居中绘制，内容在屏幕上保持不动
+class _SnapshotOverlay(QWidget):
+    def __init__(self, parent: QWidget):
+        super().__init__(parent)
+        self.pixmap: QPixmap = None
+        self.hide()
+
+    def paintEvent(self, event) -> None:
+        if self.pixmap is None: return
+        painter = QPainter(self)
+        width = round(self.pixmap.width() / self.pixmap.devicePixelRatio())
+        painter.drawPixmap((self.width() - width) // 2, 0, self.pixmap)
+
+
+# 窗口展开/折叠动画状态机：expanded -> collapsing -> collapsed -> expanding -> expanded
+class WindowAnimator(QObject):
+    Expanded, Collapsing, Collapsed, Expanding = "expanded", "collapsing", "collapsed", "expanding"
+    settled = Signal(bool)  # 动画完整播放结束(中途反转不会发出)，参数为是否展开
+
+    def __init__(self, window: QWidget, content: QWidget, duration: int, mode: str, logging):
+        """
+        :param content: 操作区，折叠后隐藏；动画期间的可见性由本类管理
+        :param mode:    AniModes之一，在下一次从静止状态开始的动画生效
+        """
+        super().__init__(window)
+        self.window = window
+        self.content = content
+        self.duration = duration  # 完整动画时长(ms)
+        self.mode = mode
+        self.activeMode = mode    # 当前(或上一次)动画使用的模式，反转时不会改变
+        self.logging = logging
+        self.state = self.Expanded
+        self.profile = os.environ.get(ProfileEnv, "") not in ("", "0")  # 记录每帧间隔
+
+        self.__ani = QPropertyAnimation(window, b"geometry", self)
+        self.__ani.setEasingCurve(QEasingCurve.Type.OutCurve)
+        self.__ani.valueChanged.connect(self.__frame)
+        self.__ani.finished.connect(self.__finished)
+
+        self.__maskAni = QVariantAnimation(self)
+        self.__maskAni.setEasingCurve(QEasingCurve.Type.OutCurve)
+        self.__maskAni.valueChanged.connect(self.__maskFrame)
+        self.__maskAni.finished.connect(self.__finished)
+
+        self.__overlay = _SnapshotOverlay(window)
+        self.__snapshot: QPixmap = None  # 展开状态下的操作区快照，内容变化时作废
+        self.__frameTimes: list[float] = []
+
+    @property
+    def isRunning(self) -> bool:
+        return QAbstractAnimation.State.Running in (self.__ani.state(), self.__maskAni.state())
+
+    @property
+    def keepsGeometry(self) -> bool:
+        """折叠后窗口是否仍保持展开时的geometry"""
+        return self.activeMode == "mask"
+
+    def invalidateSnapshot(self) -> None:
+        """应用项、主题、尺寸或滚动位置变化后调用"""
+        self.__snapshot = None
+
+    def animateTo(self, expand: bool, end: QRect, opposite: QRect) -> bool:
+        """
+        从当前状态出发播放到end，播放中途调用即为反转，时长按剩余距离缩短
+        :param end:      目标状态的窗口geometry
+        :param opposite: 另一状态的窗口geometry，用于计算完整距离
+        :return: 已处于或正在前往该状态时返回False
+        """
+        if self.state in ((self.Expanded, self.Expanding) if expand else (self.Collapsed, self.Collapsing)):
+            return False
+        if self.isRunning: self.__report()
+        else: self.activeMode = self.mode
+        self.__ani.stop()
+        self.__maskAni.stop()
+        self.state = self.Expanding if expand else self.Collapsing
+        self.__frameTimes = [time.perf_counter()]
+
+        if self.activeMode == "mask":
+            # 遮罩在窗口坐标系中，从展开时的geometry换算
+            expanded = end if expand else opposite
+            end = end.translated(-expanded.topLeft())
+            opposite = opposite.translated(-expanded.topLeft())
+            if self.window.geometry() != expanded: self.window.setGeometry(expanded)
+            mask = self.window.mask()
+            start = self.window.rect() if mask.isEmpty() else mask.boundingRect()
+            if expand: self.content.show()
+            self.__start(self.__maskAni, start, end, opposite)
+            return True
+
+        if self.activeMode == "snapshot": self.__showSnapshot()
+        elif expand: self.content.show()  # 折叠被反转时仍可见，不会重新布局
+        self.__start(self.__ani, self.window.geometry(), end, opposite)
+        return True
+
+    def __start(self, ani: QVariantAnimation, start: QRect, end: QRect, opposite: QRect) -> None:
+        total = self.__distance(opposite, end)
+        ratio = self.__distance(start, end) / total if total else 1.0
+        ani.setStartValue(start)
+        ani.setEndValue(end)
+        ani.setDuration(max(1, round(self.duration * min(ratio, 1.0))))
+        ani.start()
+
+    def __showSnapshot(self) -> None:
+        """用快照代替操作区，动画期间不再对实际控件布局"""
+        if self.__overlay.isVisible(): return  # 反转时沿用
+        if self.__snapshot is None:
+            layout = self.content.layout()
+            if layout is not None: layout.activate()  # 折叠时添加的项尚未布局
+            self.__snapshot = self.content.grab()
+        self.__overlay.pixmap = self.__snapshot
+        self.__overlay.setGeometry(self.window.rect())
+        self.__overlay.show()
+        self.__overlay.raise_()
+        self.content.hide()
+
+    @staticmethod
+    def __distance(rect1: QRect, rect2: QRect) -> int:
+        return (abs(rect1.x() - rect2.x()) + abs(rect1.width() - rect2.width())
+                + abs(rect1.height() - rect2.height()))
+
+    def __frame(self, value: QRect) -> None:
+        if self.__overlay.isVisible(): self.__overlay.setGeometry(0, 0, value.width(), value.height())
+        if self.profile: self.__frameTimes.append(time.perf_counter())
+
+    def __maskFrame(self, value: QRect) -> None:
+        self.window.setMask(QRegion(value))
+        if self.profile: self.__frameTimes.append(time.perf_counter())
+
+    def __report(self) -> None:
+        times = self.__frameTimes
+        if not self.profile or len(times) < 2: return
+        intervals = [(times[i] - times[i - 1]) * 1000 for i in range(1, len(times))]
+        self.logging.write(
+            f"{self.activeMode}模式{'展开' if self.state == self.Expanding else '折叠'}动画："
+            f"{len(intervals)}帧，平均帧间隔{sum(intervals) / len(intervals):.2f}ms，最长{max(intervals):.2f}ms",
+            "info"
+        )
+
+    def __finished(self) -> None:
+        self.__report()
+        expanded = self.state == self.Expanding
+        self.state = self.Expanded if expanded else self.Collapsed
+        if expanded:
+            self.content.show()
+            if self.activeMode == "mask": self.window.clearMask()
+        else: self.content.hide()
+        self.__overlay.hide()
+        self.__overlay.pixmap = None
+        self.settled.emit(expanded)